@@ -0,0 +1,58 @@
+"""
+Benchmark of chess playouts. Performs random playouts from the initial position on ChessState, which plays on
+Chessboard, and on ChessBitboardState, which plays on ChessBitboard, and prints the number of random moves (plies)
+per second of both and the speedup of the bitboard. Both states draw moves from streams with the same seeds.
+
+Run from src/main/python: python -m benchmarks.chess_playout_benchmark
+"""
+import time
+
+from chess.algorithm_relay.chess_bitboard_state import ChessBitboardState
+from chess.algorithm_relay.chess_state import ChessState
+from chess.chessboard import Chessboard
+from uct.algorithm.enums import GamePhase
+from utils.random_utils import RandomStream
+
+MAX_PLIES = 200
+PLAYOUTS_COUNT = {ChessState: 3, ChessBitboardState: 100}
+
+
+def measure_plies_per_second(create_state, playouts_count):
+    """
+		Args:
+			create_state:  function returning a game state in the initial position
+			playouts_count:  number of playouts
+
+		Returns:
+			tuple of (plies per second, average length of a playout)
+	"""
+    plies_count = 0
+    playouts_time = 0
+    for seed in range(playouts_count):
+        state = create_state()
+        random_stream = RandomStream(seed)
+        start_time = time.perf_counter()
+        for _ in range(MAX_PLIES):
+            state.perform_random_move(random_stream)
+            plies_count += 1
+            if state.phase != GamePhase.IN_PROGRESS:
+                break
+        playouts_time += time.perf_counter() - start_time
+    return plies_count / playouts_time, plies_count / playouts_count
+
+
+def main():
+    print(f"random playouts from the initial position, at most {MAX_PLIES} plies each")
+    print(f"{'state':>20} {'playouts':>9} {'avg plies':>10} {'plies/s':>10}")
+    results = {}
+    for state_class, create_state in ((ChessState, lambda: ChessState(Chessboard())),
+                                      (ChessBitboardState, lambda: ChessBitboardState.from_chessboard(Chessboard()))):
+        playouts_count = PLAYOUTS_COUNT[state_class]
+        plies_per_second, average_plies = measure_plies_per_second(create_state, playouts_count)
+        results[state_class] = plies_per_second
+        print(f"{state_class.__name__:>20} {playouts_count:>9} {average_plies:>10.1f} {plies_per_second:>10.0f}")
+    print(f"speedup: {results[ChessBitboardState] / results[ChessState]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
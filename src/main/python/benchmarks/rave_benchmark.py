@@ -0,0 +1,94 @@
+"""
+Benchmark of RAVE. Plays mancala matches of UCT with RAVE, given fewer and fewer iterations per move, against plain UCT
+with a fixed number of iterations per move. Players swap sides every game. For each number of iterations it prints
+the score of RAVE, counting a draw as half a point, and the time both players spent on their moves. The smallest
+number of iterations with which RAVE still scores at least 50% is the number it needs to match plain UCT.
+
+Run from src/main/python: python -m benchmarks.rave_benchmark
+"""
+import copy
+import time
+
+from main_application.gui_settings import MonteCarloSettings
+from mancala.algorithm_relay.mancala_state import MancalaState
+from mancala.mancala_board import MancalaBoard
+from uct.algorithm.enums import GamePhase, get_player_win
+from uct.algorithm.mc_game_manager import MonteCarloGameManager
+
+PLAIN_ITERATIONS = 400
+RAVE_ITERATIONS = [400, 200, 100, 50]
+GAMES_COUNT = 20
+
+
+def play_game(players_settings, seed):
+    """
+    Plays a single mancala game between two algorithms.
+
+		Args:
+			players_settings:  list of MonteCarloSettings objects of players 1 and 2
+			seed:  seed of the game, players' random streams are derived from it
+
+		Returns:
+			tuple of (GamePhase, list of times in seconds spent on moves by players 1 and 2)
+	"""
+    board = MancalaBoard()
+    managers = []
+    for player_index, settings in enumerate(players_settings):
+        player_settings = copy.copy(settings)
+        player_settings.random_seed = 2 * seed + player_index
+        managers.append(MonteCarloGameManager(MancalaState(board), player_settings))
+    times = [0, 0]
+    player_index = 0
+    while board.phase == GamePhase.IN_PROGRESS:
+        start_time = time.perf_counter()
+        move = managers[player_index].calculate_next_move()
+        times[player_index] += time.perf_counter() - start_time
+        board.perform_move(move)
+        managers[1 - player_index].notify_move_performed(move)
+        player_index = 1 - player_index
+    return board.phase, times
+
+
+def play_match(settings, opponent_settings, games_count):
+    """
+    Plays a match, in which players swap sides every game.
+
+		Args:
+			settings:  MonteCarloSettings object of the scored player
+			opponent_settings:  MonteCarloSettings object of the opponent
+			games_count:  number of games
+
+		Returns:
+			tuple of (score of the player, time of the player's moves, time of the opponent's moves)
+	"""
+    score = 0
+    player_time = 0
+    opponent_time = 0
+    for game_index in range(games_count):
+        player = 1 + game_index % 2
+        players_settings = [settings, opponent_settings] if player == 1 else [opponent_settings, settings]
+        phase, times = play_game(players_settings, game_index)
+        if phase == get_player_win(player):
+            score += 1
+        elif phase == GamePhase.DRAW:
+            score += 0.5
+        player_time += times[player - 1]
+        opponent_time += times[2 - player]
+    return score, player_time, opponent_time
+
+
+def main():
+    plain_settings = MonteCarloSettings()
+    plain_settings.max_iterations = PLAIN_ITERATIONS
+    print(f"plain UCT: {PLAIN_ITERATIONS} iterations per move, {GAMES_COUNT} games per row")
+    print(f"{'RAVE iterations':>16} {'RAVE score':>11} {'RAVE time [s]':>14} {'plain time [s]':>15}")
+    for iterations in RAVE_ITERATIONS:
+        rave_settings = MonteCarloSettings()
+        rave_settings.max_iterations = iterations
+        rave_settings.use_rave = True
+        score, rave_time, plain_time = play_match(rave_settings, plain_settings, GAMES_COUNT)
+        print(f"{iterations:>16} {score / GAMES_COUNT:>11.0%} {rave_time:>14.1f} {plain_time:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
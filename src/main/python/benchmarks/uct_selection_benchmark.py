@@ -0,0 +1,82 @@
+"""
+Micro-benchmark of UCT child selection. For each branching factor it measures the average time of choosing the best
+child of a node, which the algorithm does once per tree level in every iteration, for:
+- the former implementation calling a Python UCT function for each child,
+- the current implementation on MonteCarloTree,
+- the current implementation on MonteCarloArrayTree.
+The current implementation is vectorized, except for nodes with at most MonteCarloTreeSearch.SCALAR_UCT_MAX_CHILDREN
+children, whose UCT values are calculated in a loop over lists of statistics.
+
+Run from src/main/python: python -m benchmarks.uct_selection_benchmark
+"""
+import random
+import timeit
+from math import sqrt, log
+
+from main_application.gui_settings import MonteCarloSettings
+from uct.algorithm.mc_array_tree import MonteCarloArrayTree
+from uct.algorithm.mc_node import MonteCarloNode
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
+
+BRANCHING_FACTORS = [6, 10, 40, 200]
+REPEATS = 20000
+
+
+class _BenchmarkMove:
+    def __init__(self, index):
+        self.index = index
+        self.player = 1
+        self.description = str(index)
+
+
+def per_child_uct_selection(node, exploration_parameter):
+    def uct_value(n, p_visit, exp_par):
+        visits = n.details.visits_count
+        win_score = n.details.win_score
+        if visits == 0:
+            return 10000000
+        else:
+            return (win_score / visits) + exp_par * sqrt(log(p_visit) / visits)
+
+    parent_visit = node.details.visits_count
+    return max(node.children, key=lambda n: uct_value(n, parent_visit, exploration_parameter))
+
+
+def fill_root(tree, branching_factor):
+    for i in range(branching_factor):
+        tree.root.add_child_by_move(_BenchmarkMove(i))
+    for child in tree.root.children:
+        visits = random.randint(1, 1000)
+        child.details.visits_count = visits
+        child.details.win_score = random.random() * visits
+        tree.root.details.visits_count += visits
+
+
+def measure(function):
+    return timeit.timeit(function, number=REPEATS) / REPEATS * 1e6
+
+
+def main():
+    random.seed(0)
+    settings = MonteCarloSettings()
+    print(f"{'branching':>10} {'per-child [us]':>15} {'current [us]':>13} {'current array [us]':>19}")
+    for branching_factor in BRANCHING_FACTORS:
+        tree = MonteCarloTree(root=MonteCarloNode.create_root())
+        fill_root(tree, branching_factor)
+        array_tree = MonteCarloArrayTree(None)
+        fill_root(array_tree, branching_factor)
+        search = MonteCarloTreeSearch(tree, settings)
+        array_search = MonteCarloTreeSearch(array_tree, settings)
+
+        assert search._find_best_child_with_uct(tree.root) is \
+            per_child_uct_selection(tree.root, settings.exploration_parameter)
+
+        per_child = measure(lambda: per_child_uct_selection(tree.root, settings.exploration_parameter))
+        current = measure(lambda: search._find_best_child_with_uct(tree.root))
+        current_array = measure(lambda: array_search._find_best_child_with_uct(array_tree.root))
+        print(f"{branching_factor:>10} {per_child:>15.2f} {current:>13.2f} {current_array:>19.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+
+import chess.chess_utils as ChessUtils
+from chess.algorithm_relay.chess_state import ChessState
+from chess.bitboard import ChessBitboard
+from utils.random_utils import RandomStream
+
+
+class ChessBitboardState(ChessState):
+    """
+    Class is implementing BaseGameState class methods in relation to chess game played on ChessBitboard. Moves are
+    exchanged with the rest of the application as ChessMove objects, so the state can replace ChessState.
+    Random moves are drawn from the legal moves the bitboard has already generated, so a playout generates moves
+    once per ply.
+    """
+    def __init__(self, board: ChessBitboard):
+        super().__init__(board)
+
+    @staticmethod
+    def from_chessboard(chessboard):
+        """
+		Args:
+			chessboard:  Chessboard object
+
+		Returns:
+			ChessBitboardState object with the chessboard's position
+		"""
+        return ChessBitboardState(ChessBitboard.from_chessboard(chessboard))
+
+    def get_figures_values(self):
+        """
+		Returns:
+			tuple of summed values of figures of player 1 and player 2
+		"""
+        return self.board.player1_value, self.board.player2_value
+
+    def get_all_possible_moves(self):
+        """
+		Returns:
+			All possible moves of currently moving player. List of tuples (ChessMove object, game status).
+		"""
+        s_state = ChessUtils.GAME_STATUS_NAMES[self.board.game_status]
+        return [(self.board.decode_chess_move(move), s_state) for move in self.board.legal_moves]
+
+    def perform_random_move(self, random_stream: RandomStream):
+        """
+        Function chooses on of the all possible moves of currently moving player and performs it, changing the current
+        player afterwards. Game phase is saved after the performed move.
+
+		Args:
+			random_stream:  RandomStream object of the search
+
+		Returns:
+			ChessMove object, the performed move
+		"""
+        legal_moves = self.board.legal_moves
+        move = legal_moves[random_stream.get_random_int(0, len(legal_moves))]
+        rc = self.board.decode_chess_move(move)
+        self.board.make_move(move)
+        self.switch_current_player()
+        self.phase = ChessState.cast_chess_phase_to_abstract_phase(self.board.game_status)
+        return rc
+
+    def deep_copy(self):
+        """
+		Returns:
+			Deep copy of ChessBitboardState object.
+		"""
+        rc = ChessBitboardState.__new__(ChessBitboardState)
+        rc.board = self.board.deep_copy()
+        rc.phase = self.phase
+        rc.current_player = self.current_player
+        return rc
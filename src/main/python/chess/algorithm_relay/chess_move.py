@@ -23,6 +23,26 @@ class ChessMove(BaseGameMove):
         self.position_from = position_from
         self.move_type = move_type
         self.help_dict = help_dict
+        self.figure_color = None
+        self.figure_type = None
+
+    @property
+    def description(self):
+        """
+        Description of the move, e.g. 'white pawn e2 -> e4'. Once the moved figure's color and type are known, it is
+        formatted on first access, so that moves generated for playouts never format it.
+
+		Returns:
+			string
+		"""
+        if not self._description and self.figure_type is not None:
+            self._description = f"{self.figure_color.name.lower()} {self.figure_type.name.lower()} " \
+                                f"{self.real_position_from()} -> {self.real_position_to()}"
+        return self._description
+
+    @description.setter
+    def description(self, description):
+        self._description = description
 
     def move_equal(self, move) -> bool:
         """
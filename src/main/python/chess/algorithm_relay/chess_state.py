@@ -1,13 +1,15 @@
 
 from math import pi, atan
 
+import numpy as np
+
 import chess.chess_utils as ChessUtils
-import utils.random_utils as RandomUtils
 from chess.chessboard import Chessboard
 from chess.enums import GameStatus as ChessPhase
 from chess.figures_collection import ChessFiguresCollection
 from uct.algorithm.enums import GamePhase as AbstractPhase
 from uct.game.base_game_state import BaseGameState
+from utils.random_utils import RandomStream
 
 
 class ChessState(BaseGameState):
@@ -33,8 +35,9 @@ class ChessState(BaseGameState):
 		Returns:
 			value from range [0.2; 0.8] (middle value is 0.5 - treated like a draw)        
 		"""
-        player1_value = min(39, self.board.figures.player1_value)
-        player2_value = min(39, self.board.figures.player2_value)
+        player1_value, player2_value = self.get_figures_values()
+        player1_value = min(39, player1_value)
+        player2_value = min(39, player2_value)
         if player == 1:
             diff = player1_value - player2_value
         else:
@@ -43,6 +46,30 @@ class ChessState(BaseGameState):
         diff_normalized = 0.6 * (((2 / pi) * atan(0.25 * diff) + 1) / 2) + 0.2
         return diff_normalized
 
+    @classmethod
+    def evaluate_win_scores(cls, states):
+        """
+        Vectorized get_win_score of many states, computed from an array of figures' values of both players.
+
+		Args:
+			states:  list of ChessState objects
+
+		Returns:
+			numpy array of shape (states count, 2) with scores of players 1 and 2
+		"""
+        values = np.array([state.get_figures_values() for state in states], dtype=float).reshape(-1, 2)
+        np.minimum(values, 39, out=values)
+        diff = values[:, 0] - values[:, 1]
+        player1_scores = 0.6 * (((2 / np.pi) * np.arctan(0.25 * diff) + 1) / 2) + 0.2
+        return np.column_stack((player1_scores, 1 - player1_scores))
+
+    def get_figures_values(self):
+        """
+		Returns:
+			tuple of summed values of figures of player 1 and player 2
+		"""
+        return self.board.figures.player1_value, self.board.figures.player2_value
+
     def get_all_possible_moves(self):
         """
 		Returns:
@@ -50,20 +77,31 @@ class ChessState(BaseGameState):
 		"""
         return ChessUtils.get_all_possible_moves(self.board)
 
-    def perform_random_move(self):
+    def perform_random_move(self, random_stream: RandomStream):
         """
         Function chooses on of the all possible moves of currently moving player and performs it, changing the current
         player afterwards. Game phase is saved after the performed move.
 
+		Args:
+			random_stream:  RandomStream object of the search
+
 		Returns:
-			None        
+			ChessMove object, the performed move
 		"""
-        all_possible_moves = ChessUtils.get_all_possible_moves(self.board)
-        random_number = RandomUtils.get_random_int(0, len(all_possible_moves))
-        move = all_possible_moves[random_number]
-        self.board.perform_legal_move(move[0])
+        legal_moves = ChessUtils.get_legal_moves(self.board)
+        random_number = random_stream.get_random_int(0, len(legal_moves))
+        move = legal_moves[random_number][1]
+        self.board.perform_legal_move(move)
         self.switch_current_player()
         self.phase = ChessState.cast_chess_phase_to_abstract_phase(self.board.game_status)
+        return move
+
+    def get_position_hash(self):
+        """
+		Returns:
+			Hash of the chessboard position.        
+		"""
+        return self.board.get_position_hash()
 
     def deep_copy(self):
         """
@@ -0,0 +1,539 @@
+
+from chess.enums import Color, FigureType, GameStatus, MoveType
+
+WHITE = 0
+BLACK = 1
+
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+
+NORMAL = 0
+PAWN_DOUBLE_MOVE = 1
+EN_PASSANT = 2
+PROMOTION = 3
+CASTLE_SHORT = 4
+CASTLE_LONG = 5
+
+COLORS = [Color.WHITE, Color.BLACK]
+FIGURE_TYPES = [FigureType.PAWN, FigureType.KNIGHT, FigureType.BISHOP, FigureType.ROOK, FigureType.QUEEN,
+                FigureType.KING]
+MOVE_TYPES = [MoveType.NORMAL, MoveType.PAWN_DOUBLE_MOVE, MoveType.EN_PASSANT, MoveType.PROMOTION,
+              MoveType.CASTLE_SHORT, MoveType.CASTLE_LONG]
+FIGURE_VALUES = [1, 3, 3, 5, 9, 0]
+FEN_FIGURES = "pnbrqk"
+
+WHITE_SHORT_CASTLE = 1
+WHITE_LONG_CASTLE = 2
+BLACK_SHORT_CASTLE = 4
+BLACK_LONG_CASTLE = 8
+
+INITIAL_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def _create_steps_attacks(steps):
+    rc = []
+    for square in range(64):
+        row, column = divmod(square, 8)
+        attacks = 0
+        for row_step, column_step in steps:
+            if 0 <= row + row_step <= 7 and 0 <= column + column_step <= 7:
+                attacks |= 1 << ((row + row_step) * 8 + column + column_step)
+        rc.append(attacks)
+    return rc
+
+
+def _create_rays(row_step, column_step):
+    rc = []
+    for square in range(64):
+        row, column = divmod(square, 8)
+        ray = 0
+        row, column = row + row_step, column + column_step
+        while 0 <= row <= 7 and 0 <= column <= 7:
+            ray |= 1 << (row * 8 + column)
+            row, column = row + row_step, column + column_step
+        rc.append(ray)
+    return rc
+
+
+KNIGHT_ATTACKS = _create_steps_attacks([(2, -1), (2, 1), (-2, 1), (-2, -1), (1, -2), (1, 2), (-1, 2), (-1, -2)])
+KING_ATTACKS = _create_steps_attacks([(1, 1), (1, -1), (-1, 1), (-1, -1), (1, 0), (-1, 0), (0, -1), (0, 1)])
+PAWN_ATTACKS = [_create_steps_attacks([(1, -1), (1, 1)]), _create_steps_attacks([(-1, -1), (-1, 1)])]
+
+# rays in directions of growing square indices end at their lowest blocker, the others at their highest blocker
+BISHOP_DIRECTIONS = [(_create_rays(1, 1), True), (_create_rays(1, -1), True),
+                     (_create_rays(-1, 1), False), (_create_rays(-1, -1), False)]
+ROOK_DIRECTIONS = [(_create_rays(1, 0), True), (_create_rays(0, 1), True),
+                   (_create_rays(-1, 0), False), (_create_rays(0, -1), False)]
+QUEEN_LINES = [KING_ATTACKS[square] | 0 for square in range(64)]
+for _rays, _ in BISHOP_DIRECTIONS + ROOK_DIRECTIONS:
+    for _square in range(64):
+        QUEEN_LINES[_square] |= _rays[_square]
+
+CASTLING_RIGHTS_KEPT = [15] * 64
+CASTLING_RIGHTS_KEPT[0] = 15 & ~WHITE_LONG_CASTLE
+CASTLING_RIGHTS_KEPT[7] = 15 & ~WHITE_SHORT_CASTLE
+CASTLING_RIGHTS_KEPT[4] = 15 & ~(WHITE_SHORT_CASTLE | WHITE_LONG_CASTLE)
+CASTLING_RIGHTS_KEPT[56] = 15 & ~BLACK_LONG_CASTLE
+CASTLING_RIGHTS_KEPT[63] = 15 & ~BLACK_SHORT_CASTLE
+CASTLING_RIGHTS_KEPT[60] = 15 & ~(BLACK_SHORT_CASTLE | BLACK_LONG_CASTLE)
+
+
+def slider_attacks(square, occupied, directions):
+    """
+    Finds squares attacked by a sliding figure. Every ray is cut behind its first blocker by removing the ray which
+    starts at the blocker.
+
+		Args:
+			square:  index of the figure's square
+			occupied:  bitboard of all figures
+			directions:  BISHOP_DIRECTIONS or ROOK_DIRECTIONS
+
+		Returns:
+			bitboard of attacked squares
+	"""
+    attacks = 0
+    for rays, growing in directions:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            if growing:
+                ray ^= rays[(blockers & -blockers).bit_length() - 1]
+            else:
+                ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def encode_move(square_from, square_to, move_type=NORMAL):
+    return square_from | square_to << 6 | move_type << 12
+
+
+def decode_move(move):
+    """
+		Args:
+			move:  int encoding the move
+
+		Returns:
+			tuple of (square from, square to, move type)
+	"""
+    return move & 63, (move >> 6) & 63, move >> 12
+
+
+class ChessBitboard:
+    """
+    Class is responsible for chess logic on bitboards: 64-bit integers with one bit per square, square index being
+    row * 8 + column in the coordinates of Chessboard. It follows the rules of Chessboard, e.g. promotion always
+    gives a queen and the same draws are detected, but generates moves from precomputed attack tables and rays.
+    Moves are encoded as integers: square from, square to and move type.
+    The legal moves of the moving player are generated once per position, when the game status is updated, and
+    are kept in 'legal_moves'.
+    """
+    def __init__(self, fen=INITIAL_FEN):
+        """
+        Sets up the position given in Forsyth-Edwards Notation, the initial position by default.
+        """
+        fields = fen.split()
+        self.figures = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        self.squares = [None] * 64
+        self.figures_values = [0, 0]
+        for row_index, row_description in enumerate(fields[0].split("/")):
+            row = 7 - row_index
+            column = 0
+            for char in row_description:
+                if char.isdigit():
+                    column += int(char)
+                    continue
+                color = WHITE if char.isupper() else BLACK
+                self._put_figure(color, FEN_FIGURES.index(char.lower()), row * 8 + column)
+                column += 1
+        self.color = WHITE if fields[1] == "w" else BLACK
+        self.castling_rights = 0
+        for char, right in zip("KQkq", (WHITE_SHORT_CASTLE, WHITE_LONG_CASTLE, BLACK_SHORT_CASTLE,
+                                        BLACK_LONG_CASTLE)):
+            if char in fields[2]:
+                self.castling_rights |= right
+        self.en_passant_square = -1
+        if fields[3] != "-":
+            self.en_passant_square = (int(fields[3][1]) - 1) * 8 + ord(fields[3][0]) - 97
+        self.half_moves_count = int(fields[4]) if len(fields) > 4 else 0
+        self.check = False
+        self.game_status = GameStatus.IN_PROGRESS
+        self.legal_moves = []
+        self.position_counts = {self.get_position_hash(): 1}
+        self.update_game_status()
+
+    @staticmethod
+    def from_chessboard(board):
+        """
+        Converts a Chessboard. Castling rights are taken from figures able to castle, the en passant square from
+        the opponent's pawn which can be captured en passant and the half-move clock from the board. Earlier
+        positions are not converted, only the number of occurrences of the current one.
+
+		Args:
+			board:  Chessboard object
+
+		Returns:
+			ChessBitboard object with the same position
+		"""
+        rc = ChessBitboard("8/8/8/8/8/8/8/8 w - -")
+        rc.color = WHITE if board.current_player_color == Color.WHITE else BLACK
+        for figure in board.figures.figures_list:
+            color = WHITE if figure.color == Color.WHITE else BLACK
+            square = figure.position[0] * 8 + figure.position[1]
+            rc._put_figure(color, FIGURE_TYPES.index(figure.figure_type), square)
+            if figure.figure_type == FigureType.PAWN and color != rc.color and figure.can_be_captured_en_passant:
+                rc.en_passant_square = square - 8 if color == WHITE else square + 8
+        for king_square, rook_square, right in ((4, 7, WHITE_SHORT_CASTLE), (4, 0, WHITE_LONG_CASTLE),
+                                                (60, 63, BLACK_SHORT_CASTLE), (60, 56, BLACK_LONG_CASTLE)):
+            king = board.figures.get_figure_at(divmod(king_square, 8))
+            rook = board.figures.get_figure_at(divmod(rook_square, 8))
+            if king and king.figure_type == FigureType.KING and king.is_able_to_castle and \
+                    rook and rook.figure_type == FigureType.ROOK and rook.is_able_to_castle:
+                rc.castling_rights |= right
+        rc.half_moves_count = board.half_moves_count
+        rc.position_counts = {rc.get_position_hash(): board.position_counts.get(board.get_position_hash(), 1)}
+        rc.update_game_status()
+        return rc
+
+    @property
+    def current_player_color(self):
+        return COLORS[self.color]
+
+    @property
+    def player1_value(self):
+        return self.figures_values[WHITE]
+
+    @property
+    def player2_value(self):
+        return self.figures_values[BLACK]
+
+    def deep_copy(self):
+        """
+		Returns:
+			deep copy
+		"""
+        rc = ChessBitboard.__new__(ChessBitboard)
+        rc.figures = [self.figures[WHITE][:], self.figures[BLACK][:]]
+        rc.occupancy = self.occupancy[:]
+        rc.squares = self.squares[:]
+        rc.figures_values = self.figures_values[:]
+        rc.color = self.color
+        rc.castling_rights = self.castling_rights
+        rc.en_passant_square = self.en_passant_square
+        rc.half_moves_count = self.half_moves_count
+        rc.position_counts = dict(self.position_counts)
+        rc.check = self.check
+        rc.game_status = self.game_status
+        rc.legal_moves = self.legal_moves
+        return rc
+
+    def get_position_hash(self):
+        """
+		Returns:
+			int, hash of figures on their squares, castling rights, the en passant square and the moving player
+		"""
+        return hash((tuple(self.figures[WHITE]), tuple(self.figures[BLACK]), self.color, self.castling_rights,
+                     self.en_passant_square))
+
+    def perform_legal_move(self, chess_move):
+        """
+		Args:
+			chess_move:  ChessMove object, legal in the position
+
+		Returns:
+			None
+		"""
+        self.make_move(self.encode_chess_move(chess_move))
+
+    def make_move(self, move):
+        """
+        Performs a legal move, switches the moving player, counts the new position and updates the game status.
+        Positions are counted since the last capture or pawn move.
+
+		Args:
+			move:  int encoding the move, one of 'legal_moves'
+
+		Returns:
+			None
+		"""
+        square_from, square_to, move_type = move & 63, (move >> 6) & 63, move >> 12
+        color = self.color
+        opponent = color ^ 1
+        figure_type = self.squares[square_from][1]
+        captured = self.squares[square_to]
+        self.half_moves_count += 1
+        if captured is not None:
+            self._remove_figure(opponent, captured[1], square_to)
+            self.half_moves_count = 0
+        self._remove_figure(color, figure_type, square_from)
+        if move_type == PROMOTION:
+            self._put_figure(color, QUEEN, square_to)
+        else:
+            self._put_figure(color, figure_type, square_to)
+        if figure_type == PAWN:
+            self.half_moves_count = 0
+            if move_type == EN_PASSANT:
+                self._remove_figure(opponent, PAWN, square_to - 8 if color == WHITE else square_to + 8)
+        elif move_type == CASTLE_SHORT:
+            self._remove_figure(color, ROOK, square_from + 3)
+            self._put_figure(color, ROOK, square_from + 1)
+        elif move_type == CASTLE_LONG:
+            self._remove_figure(color, ROOK, square_from - 4)
+            self._put_figure(color, ROOK, square_from - 1)
+        self.castling_rights &= CASTLING_RIGHTS_KEPT[square_from] & CASTLING_RIGHTS_KEPT[square_to]
+        if move_type == PAWN_DOUBLE_MOVE:
+            self.en_passant_square = (square_from + square_to) >> 1
+        else:
+            self.en_passant_square = -1
+        self.color = opponent
+        if self.half_moves_count == 0:
+            self.position_counts = {}
+        position_hash = self.get_position_hash()
+        self.position_counts[position_hash] = self.position_counts.get(position_hash, 0) + 1
+        self.update_game_status()
+
+    def update_game_status(self):
+        """
+        Generates legal moves of the moving player and determines if the game is still in progress or it has ended
+        with checkmate, stalemate or draw.
+
+		Returns:
+			None
+		"""
+        self.legal_moves = self.generate_legal_moves()
+        if not self.legal_moves:
+            if self.check:
+                self.game_status = GameStatus.CHECKMATE_WHITE if self.color == BLACK else GameStatus.CHECKMATE_BLACK
+            else:
+                self.game_status = GameStatus.STALEMATE
+        elif not self._are_figures_capable_of_checkmate():
+            self.game_status = GameStatus.DRAW
+        elif self.half_moves_count >= 100:
+            self.game_status = GameStatus.FIFTY_MOVE_RULE
+        elif self.position_counts.get(self.get_position_hash(), 0) >= 3:
+            self.game_status = GameStatus.THREEFOLD_REPETITION
+        else:
+            self.game_status = GameStatus.IN_PROGRESS
+
+    def generate_legal_moves(self):
+        """
+        Generates moves of the moving player's figures and keeps those which do not leave the king in check. Only
+        moves of the king, en passant captures, moves of figures on lines from the king and all moves in check can
+        uncover the king, so only they are verified on the bitboards after the move. The check flag is updated.
+
+		Returns:
+			list of ints encoding legal moves
+		"""
+        color = self.color
+        opponent = color ^ 1
+        own_figures = self.figures[color]
+        occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        king_square = own_figures[KING].bit_length() - 1
+        self.check = self.is_square_attacked(king_square, opponent, occupied)
+        moves = self._generate_pseudo_legal_moves(occupied)
+
+        enemies = self.occupancy[opponent]
+        exposed_squares = -1 if self.check else QUEEN_LINES[king_square] | own_figures[KING]
+        is_square_attacked = self.is_square_attacked
+        rc = []
+        for move in moves:
+            square_from = move & 63
+            if not (1 << square_from) & exposed_squares and move >> 12 != EN_PASSANT:
+                rc.append(move)
+                continue
+            square_to = (move >> 6) & 63
+            bit_to = 1 << square_to
+            removed = bit_to & enemies
+            occupied_after = (occupied ^ (1 << square_from)) | bit_to
+            if move >> 12 == EN_PASSANT:
+                removed = 1 << (square_to - 8 if color == WHITE else square_to + 8)
+                occupied_after ^= removed
+            attacked_square = square_to if square_from == king_square else king_square
+            if not is_square_attacked(attacked_square, opponent, occupied_after, removed):
+                rc.append(move)
+        return rc
+
+    def is_square_attacked(self, square, color, occupied, removed=0):
+        """
+		Args:
+			square:  index of the square
+			color:  WHITE or BLACK, color of the attacking figures
+			occupied:  bitboard of all figures
+			removed:  bitboard of the attacking figures which are to be ignored, e.g. captured by the move checked
+
+		Returns:
+			bool informing if any figure of the color attacks the square
+		"""
+        figures = self.figures[color]
+        kept = ~removed
+        if PAWN_ATTACKS[color ^ 1][square] & figures[PAWN] & kept or \
+                KNIGHT_ATTACKS[square] & figures[KNIGHT] & kept or KING_ATTACKS[square] & figures[KING]:
+            return True
+        diagonal_attackers = (figures[BISHOP] | figures[QUEEN]) & kept
+        if diagonal_attackers and slider_attacks(square, occupied, BISHOP_DIRECTIONS) & diagonal_attackers:
+            return True
+        straight_attackers = (figures[ROOK] | figures[QUEEN]) & kept
+        return bool(straight_attackers and slider_attacks(square, occupied, ROOK_DIRECTIONS) & straight_attackers)
+
+    def encode_chess_move(self, chess_move):
+        """
+		Args:
+			chess_move:  ChessMove object
+
+		Returns:
+			int encoding the move
+		"""
+        square_from = chess_move.position_from[0] * 8 + chess_move.position_from[1]
+        square_to = chess_move.position_to[0] * 8 + chess_move.position_to[1]
+        return encode_move(square_from, square_to, MOVE_TYPES.index(chess_move.move_type))
+
+    def decode_chess_move(self, move):
+        """
+        Creates ChessMove object of a move of the moving player, which can be performed on Chessboard. The move's
+        player and moved figure's color and type are set.
+
+		Args:
+			move:  int encoding the move
+
+		Returns:
+			ChessMove object
+		"""
+        from chess.algorithm_relay.chess_move import ChessMove
+        square_from, square_to, move_type = decode_move(move)
+        position_from = divmod(square_from, 8)
+        position_to = divmod(square_to, 8)
+        help_dict = None
+        if move_type == EN_PASSANT:
+            help_dict = {'opponent-pawn-pos': (position_from[0], position_to[1])}
+        elif move_type == CASTLE_SHORT:
+            help_dict = {'rook-end-pos': (position_from[0], 5), 'rook-start-pos': (position_from[0], 7)}
+        elif move_type == CASTLE_LONG:
+            help_dict = {'rook-end-pos': (position_from[0], 3), 'rook-start-pos': (position_from[0], 0)}
+        rc = ChessMove(position_to, position_from, MOVE_TYPES[move_type], help_dict)
+        rc.player = self.color + 1
+        color, figure_type = self.squares[square_from]
+        rc.figure_color = COLORS[color]
+        rc.figure_type = FIGURE_TYPES[figure_type]
+        return rc
+
+    def _generate_pseudo_legal_moves(self, occupied):
+        color = self.color
+        own_figures = self.figures[color]
+        own = self.occupancy[color]
+        enemies = self.occupancy[color ^ 1]
+        targets = ~own
+        moves = []
+        append = moves.append
+
+        for figure_type, attacks_table in ((KNIGHT, KNIGHT_ATTACKS), (KING, KING_ATTACKS)):
+            figures = own_figures[figure_type]
+            while figures:
+                bit = figures & -figures
+                figures ^= bit
+                square_from = bit.bit_length() - 1
+                attacks = attacks_table[square_from] & targets
+                while attacks:
+                    bit = attacks & -attacks
+                    attacks ^= bit
+                    append(square_from | (bit.bit_length() - 1) << 6)
+
+        for figures, directions in ((own_figures[BISHOP] | own_figures[QUEEN], BISHOP_DIRECTIONS),
+                                    (own_figures[ROOK] | own_figures[QUEEN], ROOK_DIRECTIONS)):
+            while figures:
+                bit = figures & -figures
+                figures ^= bit
+                square_from = bit.bit_length() - 1
+                attacks = slider_attacks(square_from, occupied, directions) & targets
+                while attacks:
+                    bit = attacks & -attacks
+                    attacks ^= bit
+                    append(square_from | (bit.bit_length() - 1) << 6)
+
+        self._generate_pawn_moves(own_figures[PAWN], occupied, enemies, append)
+        if not self.check:
+            self._generate_castling_moves(occupied, append)
+        return moves
+
+    def _generate_pawn_moves(self, pawns, occupied, enemies, append):
+        color = self.color
+        step = 8 if color == WHITE else -8
+        start_row = 1 if color == WHITE else 6
+        last_row = 7 if color == WHITE else 0
+        attacks_table = PAWN_ATTACKS[color]
+        en_passant_bit = 1 << self.en_passant_square if self.en_passant_square >= 0 else 0
+        while pawns:
+            bit = pawns & -pawns
+            pawns ^= bit
+            square_from = bit.bit_length() - 1
+            square_to = square_from + step
+            promotion = square_to >> 3 == last_row
+            if not (1 << square_to) & occupied:
+                append(square_from | square_to << 6 | (PROMOTION << 12 if promotion else 0))
+                double_square = square_to + step
+                if square_from >> 3 == start_row and not (1 << double_square) & occupied:
+                    append(square_from | double_square << 6 | PAWN_DOUBLE_MOVE << 12)
+            attacks = attacks_table[square_from]
+            captures = attacks & enemies
+            while captures:
+                capture_bit = captures & -captures
+                captures ^= capture_bit
+                append(square_from | (capture_bit.bit_length() - 1) << 6 | (PROMOTION << 12 if promotion else 0))
+            if attacks & en_passant_bit:
+                append(square_from | self.en_passant_square << 6 | EN_PASSANT << 12)
+
+    def _generate_castling_moves(self, occupied, append):
+        if self.color == WHITE:
+            king_square, short_right, long_right = 4, WHITE_SHORT_CASTLE, WHITE_LONG_CASTLE
+        else:
+            king_square, short_right, long_right = 60, BLACK_SHORT_CASTLE, BLACK_LONG_CASTLE
+        opponent = self.color ^ 1
+        if self.castling_rights & short_right and not (occupied >> (king_square + 1)) & 3 and \
+                not self.is_square_attacked(king_square + 1, opponent, occupied) and \
+                not self.is_square_attacked(king_square + 2, opponent, occupied):
+            append(king_square | (king_square + 2) << 6 | CASTLE_SHORT << 12)
+        if self.castling_rights & long_right and not (occupied >> (king_square - 3)) & 7 and \
+                not self.is_square_attacked(king_square - 1, opponent, occupied) and \
+                not self.is_square_attacked(king_square - 2, opponent, occupied):
+            append(king_square | (king_square - 2) << 6 | CASTLE_LONG << 12)
+
+    def _are_figures_capable_of_checkmate(self):
+        """
+        Rules of chess_utils.are_the_figures_left_capable_of_checkmate.
+
+		Returns:
+			bool
+		"""
+        occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        figures_count = bin(occupied).count("1")
+        if figures_count > 4:
+            return True
+        if figures_count == 2:
+            return False
+        figures_except_kings = [(square, figure) for square, figure in enumerate(self.squares)
+                                if figure is not None and figure[1] != KING]
+        if len(figures_except_kings) == 1:
+            return figures_except_kings[0][1][1] not in (KNIGHT, BISHOP)
+        (square_1, figure_1), (square_2, figure_2) = figures_except_kings
+        if figure_1[1] == BISHOP and figure_2[1] == BISHOP and figure_1[0] != figure_2[0] and \
+                (square_1 + (square_1 >> 3)) % 2 == (square_2 + (square_2 >> 3)) % 2:
+            return False
+        return True
+
+    def _put_figure(self, color, figure_type, square):
+        bit = 1 << square
+        self.figures[color][figure_type] |= bit
+        self.occupancy[color] |= bit
+        self.squares[square] = (color, figure_type)
+        self.figures_values[color] += FIGURE_VALUES[figure_type]
+
+    def _remove_figure(self, color, figure_type, square):
+        bit = 1 << square
+        self.figures[color][figure_type] ^= bit
+        self.occupancy[color] ^= bit
+        self.squares[square] = None
+        self.figures_values[color] -= FIGURE_VALUES[figure_type]
@@ -1,10 +1,10 @@
 
-import copy
-
 from chess.chessboard import Chessboard
 from chess.enums import GameStatus
 from chess.figures import *
 
+GAME_STATUS_NAMES = {game_status: str(game_status).split(".")[1].lower() for game_status in GameStatus}
+
 
 class PastMove:
     """
@@ -57,7 +57,8 @@ def do_en_passant_move(board: Chessboard, move: ChessMove, figure_moved: Figure)
 
 def do_castling(board: Chessboard, move: ChessMove, figure_moved: Figure):
     """
-    Function does long or short castling. It uses 'rook' and 'rook-end-pos' keys from move.help_dict.
+    Function does long or short castling. It uses 'rook-start-pos' and 'rook-end-pos' keys from move.help_dict.
+    The rook is looked up on the given board, so the move can be applied to any copy of the board it was created on.
 
 		Args:
 			board:  Chessboard object
@@ -69,7 +70,7 @@ def do_castling(board: Chessboard, move: ChessMove, figure_moved: Figure):
 		"""
     # figure_moved.move(move.position_to)
     board.figures.move_figure_to(figure_moved, move.position_to)
-    rook = move.help_dict['rook']
+    rook = board.figures.get_figure_at(move.help_dict['rook-start-pos'])
     board.figures.move_figure_to(rook, move.help_dict['rook-end-pos'])
     figure_moved.set_is_able_to_castle(False)
     rook.set_is_able_to_castle(False)
@@ -78,7 +79,8 @@ def do_castling(board: Chessboard, move: ChessMove, figure_moved: Figure):
 def is_fifty_move_rule(board: Chessboard):
     """
     Checks whether the fifty-move rule has occurred. This is a situation, where in the 50 past moves not happened a move
-    that would push the game forward, e.g. capture, pawn move. This situation means a draw.
+    that would push the game forward, e.g. capture, pawn move. This situation means a draw. Board's half-move clock
+    counts such moves.
 
 		Args:
 			board:  Chessboard object
@@ -86,12 +88,21 @@ def is_fifty_move_rule(board: Chessboard):
 		Returns:
 			bool    
 		"""
-    if len(board.past_moves) < 100:
-        return False
-    for past_move in board.past_moves[::-1][:100]:
-        if past_move.was_capture or past_move.figure_moved.figure_type == FigureType.PAWN:
-            return False
-    return True
+    return board.half_moves_count >= 100
+
+
+def is_threefold_repetition(board: Chessboard):
+    """
+    Checks whether the current position has occurred for the third time. Positions are counted by their Zobrist
+    hashes since the last capture or pawn move. This situation means a draw.
+
+		Args:
+			board:  Chessboard object
+
+		Returns:
+			bool
+		"""
+    return board.position_counts.get(board.position_hash, 0) >= 3
 
 
 def is_there_a_draw(board: Chessboard):
@@ -99,6 +110,7 @@ def is_there_a_draw(board: Chessboard):
     Checks whether the game ended in draw if:
     - there are no figures left that are capable of checkmate
     - fifty-move rule occurred
+    - the position occurred for the third time
 
 		Args:
 			board:  Chessboard object
@@ -112,42 +124,59 @@ def is_there_a_draw(board: Chessboard):
     if is_fifty_move_rule(board):
         board.game_status = GameStatus.FIFTY_MOVE_RULE
         return True
+    if is_threefold_repetition(board):
+        board.game_status = GameStatus.THREEFOLD_REPETITION
+        return True
     return False
 
 
-def get_all_possible_moves(board: Chessboard):
+def get_legal_moves(board: Chessboard):
     """
-    The function extracts all the possible moves from each figure of current moving player.
-    Each move gets description and player assigned.
+    Generates legal moves of the currently moving player. Each move gets player and moved figure's color and type
+    assigned. The list is cached on the board with the key of the position it was generated for, so that detection of
+    the game status and the following choice of a move share it. The returned list shall not be modified.
 
 		Args:
 			board:  Chessboard object
 
 		Returns:
-			list of all possible moves (ChessMove objects)    
+			list of tuples (Figure object, its legal ChessMove object)
 		"""
-    all_possible_moves = []
-    figures_list = board.figures.figures_list
-    copied_figures_list = copy.deepcopy(board.figures.figures_list)
-    for i, copied_figure in enumerate(copied_figures_list):
-        if figures_list[i].color != board.current_player_color:
+    legal_moves_key = board.get_legal_moves_key()
+    if board.legal_moves_key == legal_moves_key:
+        return board.legal_moves
+
+    legal_moves = []
+    player = get_player_from_color(board.current_player_color)
+    king_safety = KingSafety(board)
+    for figure in board.figures.figures_list:
+        if figure.color != board.current_player_color:
             continue
+        figure_moves = figure.check_moves(board.figures)
+        king_safety.reduce_moves(figure, figure_moves)
+        for move in figure_moves:
+            move.player = player
+            move.figure_color = figure.color
+            move.figure_type = figure.figure_type
+            legal_moves.append((figure, move))
+    board.legal_moves = legal_moves
+    board.legal_moves_key = legal_moves_key
+    return legal_moves
 
-        figure_moves = figures_list[i].check_moves(board.figures)
-        reduce_move_range_when_check(board, figures_list[i], figure_moves)
 
-        for j, move in enumerate(figure_moves):
-            move.player = get_player_from_color(board.current_player_color)
-            f_color = str(copied_figure.color).split(".")[1].lower()
-            f_type = str(copied_figure.figure_type).split(".")[1].lower()
-            move.description = f"{f_color} {f_type} {move.real_position_from()} -> {move.real_position_to()}"
-            s_state = str(board.game_status).split(".")[1].lower()
-            figure_moves[j] = (move, s_state)
+def get_all_possible_moves(board: Chessboard):
+    """
+    The function extracts all the possible moves from each figure of current moving player.
+    Each move has player assigned, its description is formatted on first access.
 
-        if figure_moves:
-            all_possible_moves.extend(figure_moves)
+		Args:
+			board:  Chessboard object
 
-    return all_possible_moves
+		Returns:
+			list of all possible moves (ChessMove objects)    
+		"""
+    s_state = GAME_STATUS_NAMES[board.game_status]
+    return [(move, s_state) for _, move in get_legal_moves(board)]
 
 
 def take_off_potential_figure(board: Chessboard, move: ChessMove):
@@ -189,11 +218,127 @@ def put_back_potential_figure(board: Chessboard, figure: Figure, figure_index):
         board.figures.add_figure(figure, figure_index)
 
 
+class KingSafety:
+    """
+    Class describes threats to the king of the moving player: figures giving check with tiles on which the check can
+    be captured or blocked, and figures pinned to the king with lines they may still move along. They are found once
+    per position by walking lines from the king, so that each pseudo-legal move is then checked in constant time.
+    The king's check mask is updated once per position as well and decides the king's own moves.
+    """
+    DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1), (1, 0), (-1, 0), (0, -1), (0, 1)]
+    KNIGHT_OFFSETS = [(2, -1), (2, 1), (-2, 1), (-2, -1), (1, -2), (1, 2), (-1, 2), (-1, -2)]
+
+    def __init__(self, board: Chessboard):
+        """
+		Args:
+			board:  Chessboard object
+		"""
+        self.board = board
+        self.color = board.current_player_color
+        figures = board.figures
+        self.king = figures.get_king(self.color)
+        self.king.update_check_mask(figures)
+        self._king_moves = None
+        self.checks = []
+        self.pins = {}
+
+        king_row, king_column = self.king.position
+        for direction in KingSafety.DIRECTIONS:
+            diagonal = direction[0] != 0 and direction[1] != 0
+            line = []
+            own_figure = None
+            position = king_row + direction[0], king_column + direction[1]
+            while Figure.is_move_valid(position):
+                line.append(position)
+                figure = figures.get_figure_at(position)
+                if figure:
+                    if figure.color == self.color:
+                        if own_figure:
+                            break
+                        own_figure = figure
+                    else:
+                        if figure.figure_type == FigureType.QUEEN or \
+                                figure.figure_type == (FigureType.BISHOP if diagonal else FigureType.ROOK):
+                            if own_figure:
+                                self.pins[own_figure] = set(line)
+                            else:
+                                self.checks.append(set(line))
+                        break
+                position = position[0] + direction[0], position[1] + direction[1]
+
+        for offset in KingSafety.KNIGHT_OFFSETS:
+            position = king_row + offset[0], king_column + offset[1]
+            self._add_check_by_figure_at(position, FigureType.KNIGHT)
+        pawn_row = Pawn.MOVE_SETUPS[self.color]["step_forward"](king_row, 1)
+        for pawn_column in (king_column - 1, king_column + 1):
+            self._add_check_by_figure_at((pawn_row, pawn_column), FigureType.PAWN)
+
+    def reduce_moves(self, figure: Figure, moves):
+        """
+        Removes moves which leave the king in check from the list of figure's possible moves.
+
+		Args:
+			figure:  Figure object of the moving player
+			moves:  list of figure's possible moves
+
+		Returns:
+			None
+		"""
+        moves[:] = [move for move in moves if self.is_move_legal(figure, move)]
+
+    def is_move_legal(self, figure: Figure, move: ChessMove):
+        """
+        Decides if a pseudo-legal move leaves the king safe. The king may move to tiles not covered by its check mask,
+        other figures may not move during double check, have to capture or block a single check and may move along
+        the line of their pin only. En passant captures remove a figure from another tile, so they are verified by
+        performing them on the board.
+
+		Args:
+			figure:  Figure object of the moving player
+			move:  ChessMove object, possible move of the figure
+
+		Returns:
+			bool
+		"""
+        if figure is self.king:
+            if self._king_moves is None:
+                self._king_moves = {(king_move.position_to, king_move.move_type)
+                                    for king_move in self.king.check_moves(self.board.figures)}
+            return (move.position_to, move.move_type) in self._king_moves
+        if len(self.checks) > 1:
+            return False
+        if move.move_type == MoveType.EN_PASSANT:
+            return self._is_king_safe_after_move(figure, move)
+        if figure in self.pins and move.position_to not in self.pins[figure]:
+            return False
+        return not self.checks or move.position_to in self.checks[0]
+
+    def _add_check_by_figure_at(self, position, figure_type):
+        if not Figure.is_move_valid(position):
+            return
+        figure = self.board.figures.get_figure_at(position)
+        if figure and figure.color != self.color and figure.figure_type == figure_type:
+            self.checks.append({position})
+
+    def _is_king_safe_after_move(self, figure: Figure, move: ChessMove):
+        figures = self.board.figures
+        check_mask = self.king.check_mask
+        previous_position = figure.position
+        potential_figure, figure_index = take_off_potential_figure(self.board, move)
+        figures.move_figure_to(figure, move.position_to)
+        self.king.update_check_mask(figures)
+        is_king_safe = not self.king.check_mask[self.king.position]
+        figures.move_figure_to(figure, previous_position)
+        put_back_potential_figure(self.board, potential_figure, figure_index)
+        self.king.check_mask = check_mask
+        return is_king_safe
+
+
 def reduce_move_range_when_check(board: Chessboard, figure: Figure, moves):
     """
     Reduces moves from the given list that cannot be executed, e.g. they uncover the king and put it at risk.
-    Foreach move in moves of figure makes the move and check if it puts king at risk. If it does, it gets erased from
-    the moves list.
+    Threats to the king are found with KingSafety, which is worth creating once when moves of many figures are
+    reduced in the same position.
 
 		Args:
 			board:  Chessboard object
@@ -203,22 +348,7 @@ def reduce_move_range_when_check(board: Chessboard, figure: Figure, moves):
 		Returns:
 			None    
 		"""
-    bad_moves = []
-    figs = board.figures
-    king = figs.get_king(board.current_player_color)
-    previous_position = figure.position
-    for i in range(len(moves)):
-        move = moves[i]
-        potential_figure, figure_index = take_off_potential_figure(board, move)
-        figs.move_figure_to(figure, move.position_to)
-        king.update_check_mask(figs)
-        if king.check_mask[king.position]:
-            bad_moves.append(i)
-        figs.move_figure_to(figure, previous_position)
-        put_back_potential_figure(board, potential_figure, figure_index)
-
-    for bad_move in bad_moves[::-1]:
-        moves.pop(bad_move)
+    KingSafety(board).reduce_moves(figure, moves)
 
 
 def is_king_selected_to_move_in_check(board: Chessboard, selected_tile):
@@ -324,7 +454,7 @@ def are_the_figures_left_capable_of_checkmate(board: Chessboard):
 
 def is_there_any_possible_move(board: Chessboard):
     """
-    Check if current moving player has any possible move left.
+    Check if current moving player has any possible move left. Legal moves are generated and cached on the board.
 
 		Args:
 			board:  Chessboard object
@@ -332,15 +462,7 @@ def is_there_any_possible_move(board: Chessboard):
 		Returns:
 			bool    
 		"""
-    for figure in board.figures.figures_list:
-        if figure.color != board.current_player_color:
-            continue
-
-        possible_moves = figure.check_moves(board.figures)
-        reduce_move_range_when_check(board, figure, possible_moves)
-        if possible_moves:
-            return True
-    return False
+    return len(get_legal_moves(board)) > 0
 
 
 def get_player_from_color(color: Color):
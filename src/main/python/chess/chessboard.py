@@ -5,6 +5,7 @@ import copy
 from chess.enums import GameStatus, TileMarkArgs, TileMarkType
 from chess.figures import *
 from chess.figures_collection import ChessFiguresCollection
+from chess import zobrist
 from utils.custom_event import CustomEvent
 
 
@@ -23,6 +24,36 @@ class Chessboard:
         self.game_status = GameStatus.IN_PROGRESS
         self.past_moves = []
         self.notify_tile_marked = CustomEvent()
+        self.position_version = 0
+        self.legal_moves = []
+        self.legal_moves_key = None
+        self.half_moves_count = 0
+        self.reset_position_history()
+
+    def reset_position_history(self):
+        """
+        Computes Zobrist hash of the current position from scratch and starts the count of positions with it. Moves
+        performed afterwards update the hash incrementally. It is called again when figures or the moving player are
+        replaced directly.
+
+		Returns:
+			None
+		"""
+        self._hashed_figures = self.figures
+        self._hashed_color = self.current_player_color
+        self.en_passant_key = zobrist.get_en_passant_key(self.figures, self.current_player_color)
+        self.position_hash = zobrist.get_position_key(self.figures, self.current_player_color)
+        self.position_counts = {self.position_hash: 1}
+
+    def synchronize_position_history(self):
+        """
+        Resets position history if figures or the moving player were replaced since the hash was computed.
+
+		Returns:
+			None
+		"""
+        if self._hashed_figures is not self.figures or self._hashed_color != self.current_player_color:
+            self.reset_position_history()
 
     @staticmethod
     def create_figures():
@@ -50,6 +81,7 @@ class Chessboard:
 		Returns:
 			deep copy        
 		"""
+        self.synchronize_position_history()
         rc = Chessboard()
         rc.current_player_color = self.current_player_color
         rc.check = self.check
@@ -58,6 +90,12 @@ class Chessboard:
         rc.possible_moves = copy.deepcopy(self.possible_moves)
         rc.figures = copy.deepcopy(self.figures)
         rc.past_moves = copy.deepcopy(self.past_moves)
+        rc.half_moves_count = self.half_moves_count
+        rc.en_passant_key = self.en_passant_key
+        rc.position_hash = self.position_hash
+        rc.position_counts = dict(self.position_counts)
+        rc._hashed_figures = rc.figures
+        rc._hashed_color = rc.current_player_color
         return rc
 
     def check_for_check(self, color_that_causes_check):
@@ -78,7 +116,9 @@ class Chessboard:
     def do_move(self, move, selected_tile):
         """
         Does chess move and changes positions of the involved figures. Determines which move type is this.
-        Updates king's position.
+        Updates king's position. Zobrist hash is updated with keys of the figures the move changes, castling rights,
+        en passant column and the moving player. Half-move clock is reset by captures and pawn moves, which also start
+        a new count of positions, as none of the previous positions can occur again.
 
 		Args:
 			move:  ChessMove class object
@@ -87,7 +127,20 @@ class Chessboard:
 		Returns:
 			None        
 		"""
-        figure_moved = self.figures.get_figure_at(selected_tile)
+        figures = self.figures
+        figure_moved = figures.get_figure_at(selected_tile)
+        if move.move_type == MoveType.EN_PASSANT:
+            captured_figure = figures.get_figure_at(move.help_dict['opponent-pawn-pos'])
+        else:
+            captured_figure = figures.get_figure_at(move.position_to)
+        is_castling = move.move_type == MoveType.CASTLE_SHORT or move.move_type == MoveType.CASTLE_LONG
+        position_hash = self.position_hash ^ self.en_passant_key ^ zobrist.get_castling_key(figures) ^ \
+            zobrist.get_figure_key(figure_moved)
+        if captured_figure:
+            position_hash ^= zobrist.get_figure_key(captured_figure)
+        if is_castling:
+            position_hash ^= zobrist.get_figure_key(figures.get_figure_at(move.help_dict['rook-start-pos']))
+
         if move.move_type == MoveType.NORMAL:
             from chess.chess_utils import do_normal_move
             do_normal_move(self, move, figure_moved)
@@ -106,6 +159,20 @@ class Chessboard:
         if figure_moved.figure_type == FigureType.KING:
             self.figures.set_king_reference(figure_moved)
 
+        self.en_passant_key = \
+            zobrist.EN_PASSANT_KEYS[move.position_to[1]] if move.move_type == MoveType.PAWN_DOUBLE_MOVE else 0
+        position_hash ^= self.en_passant_key ^ zobrist.get_castling_key(figures) ^ zobrist.BLACK_TO_MOVE_KEY ^ \
+            zobrist.get_figure_key(figures.get_figure_at(move.position_to))
+        if is_castling:
+            position_hash ^= zobrist.get_figure_key(figures.get_figure_at(move.help_dict['rook-end-pos']))
+        self.position_hash = position_hash
+        if captured_figure or figure_moved.figure_type == FigureType.PAWN:
+            self.half_moves_count = 0
+            self.position_counts = {}
+        else:
+            self.half_moves_count += 1
+        self.position_counts[position_hash] = self.position_counts.get(position_hash, 0) + 1
+
     def add_past_move(self, position, figures_count_before_move, old_position):
         """
         Adds move to the 'historical moves' list.
@@ -134,8 +201,10 @@ class Chessboard:
 			move:  ChessMove object
 
 		Returns:
-			None        
+			ChessMoveUndo object, which takes the move back when passed to 'undo_move'
 		"""
+        self.synchronize_position_history()
+        undo = ChessMoveUndo(self, move)
         Pawn.clear_en_passant_capture_ability_for_one_team(self.figures, self.current_player_color)
         figures_count_before_move = len(self.figures.figures_list)
         self.do_move(move, move.position_from)
@@ -147,7 +216,57 @@ class Chessboard:
         self.notify_tile_marked.fire(self, earg=TileMarkArgs(move.position_from, TileMarkType.MOVED))
         self.notify_tile_marked.fire(self, earg=TileMarkArgs(move.position_to, TileMarkType.MOVED))
         self.switch_current_player()
+        self._hashed_color = self.current_player_color
+        self.position_version += 1
         self.update_game_status()
+        return undo
+
+    def undo_move(self, undo):
+        """
+        Takes back the last performed move, restoring the position exactly: figures and their order, values of
+        collections, castling and en passant abilities, check, game status, past moves, Zobrist hash, half-move clock
+        and count of positions. Moves have to be taken back in reversed order of performing them.
+
+		Args:
+			undo:  ChessMoveUndo object returned by 'perform_legal_move'
+
+		Returns:
+			None
+		"""
+        move = undo.move
+        figures = self.figures
+        figures.move_figure_to(figures.get_figure_at(move.position_to), move.position_from)
+        if move.move_type == MoveType.PROMOTION:
+            figures.restore(undo.figure_moved, move.position_from)
+        elif move.move_type == MoveType.CASTLE_SHORT or move.move_type == MoveType.CASTLE_LONG:
+            figures.move_figure_at(move.help_dict['rook-end-pos'], move.help_dict['rook-start-pos'])
+        if undo.captured_figure:
+            figures.restore(undo.captured_figure, undo.captured_figure.position)
+        figures.figures_list = undo.figures_list
+        figures.player1_value, figures.player2_value = undo.figures_values
+        for figure, is_able_to_castle in undo.castling_abilities:
+            figure.set_is_able_to_castle(is_able_to_castle)
+        for pawn, can_be_captured_en_passant in undo.en_passant_abilities:
+            pawn.set_can_be_captured_en_passant(can_be_captured_en_passant)
+        figures.white_king.check_mask, figures.black_king.check_mask = undo.check_masks
+        self.check = undo.check
+        self.game_status = undo.game_status
+        self.current_player_color = undo.current_player_color
+        self._hashed_color = undo.current_player_color
+        if self.position_counts is undo.position_counts:
+            if self.position_counts[self.position_hash] == 1:
+                del self.position_counts[self.position_hash]
+            else:
+                self.position_counts[self.position_hash] -= 1
+        self.position_counts = undo.position_counts
+        self.position_hash = undo.position_hash
+        self.en_passant_key = undo.en_passant_key
+        self.half_moves_count = undo.half_moves_count
+        self.past_moves.pop()
+        self.position_version += 1
+        if undo.legal_moves is not None:
+            self.legal_moves = undo.legal_moves
+            self.legal_moves_key = self.get_legal_moves_key()
 
     def update_game_status(self):
         """
@@ -168,6 +287,28 @@ class Chessboard:
             from chess.chess_utils import is_there_a_draw
             is_there_a_draw(self)
 
+    def get_legal_moves_key(self):
+        """
+        Key of the position for the cache of legal moves. The position version is increased by every performed and
+        undone move, the figures collection and the moving player are included in case they are replaced directly.
+
+		Returns:
+			tuple identifying the current position of this board
+		"""
+        return self.position_version, self.current_player_color, self.figures
+
+    def get_position_hash(self):
+        """
+        Zobrist hash identifies the position regardless of the moves that led to it: figures on their tiles, castling
+        rights, the column of a pawn which can be captured en passant and the moving player. The history of moves,
+        and so repetitions, is not considered. The hash is updated incrementally by performed moves.
+
+		Returns:
+			int, hash of the position
+		"""
+        self.synchronize_position_history()
+        return self.position_hash
+
     def get_opposite_color(self):
         """
 		Returns:
@@ -181,3 +322,48 @@ class Chessboard:
         """
         self.current_player_color = self.get_opposite_color()
 
+
+
+class ChessMoveUndo:
+    """
+    Class keeps the part of Chessboard's state which a move changes, so that the move can be taken back without
+    copying the board. Figures are kept by reference, the figures list is kept as a shallow copy. Cached legal moves
+    of the position are kept too, so they are not generated again after the move is taken back.
+    """
+    def __init__(self, board: Chessboard, move):
+        """
+		Args:
+			board:  Chessboard object, before the move is performed
+			move:  ChessMove object
+		"""
+        figures = board.figures
+        self.move = move
+        self.figure_moved = figures.get_figure_at(move.position_from)
+        if move.move_type == MoveType.EN_PASSANT:
+            self.captured_figure = figures.get_figure_at(move.help_dict['opponent-pawn-pos'])
+        else:
+            self.captured_figure = figures.get_figure_at(move.position_to)
+        self.figures_list = list(figures.figures_list)
+        self.figures_values = figures.player1_value, figures.player2_value
+
+        self.castling_abilities = []
+        if self.figure_moved.figure_type == FigureType.KING or self.figure_moved.figure_type == FigureType.ROOK:
+            self.castling_abilities.append((self.figure_moved, self.figure_moved.is_able_to_castle))
+        if move.move_type == MoveType.CASTLE_SHORT or move.move_type == MoveType.CASTLE_LONG:
+            rook = figures.get_figure_at(move.help_dict['rook-start-pos'])
+            self.castling_abilities.append((rook, rook.is_able_to_castle))
+
+        self.en_passant_abilities = [(figure, True) for figure in figures.figures_list
+                                     if figure.figure_type == FigureType.PAWN and figure.can_be_captured_en_passant]
+        if self.figure_moved.figure_type == FigureType.PAWN and not self.figure_moved.can_be_captured_en_passant:
+            self.en_passant_abilities.append((self.figure_moved, False))
+
+        self.check_masks = figures.white_king.check_mask, figures.black_king.check_mask
+        self.legal_moves = board.legal_moves if board.legal_moves_key == board.get_legal_moves_key() else None
+        self.check = board.check
+        self.game_status = board.game_status
+        self.current_player_color = board.current_player_color
+        self.position_hash = board.position_hash
+        self.en_passant_key = board.en_passant_key
+        self.half_moves_count = board.half_moves_count
+        self.position_counts = board.position_counts
@@ -266,7 +266,7 @@ class Knight(Figure):
                 if not self.is_move_valid(move_position):
                     continue
                 figure = figures.get_figure_at(move_position)
-                if figure and figure.color == self.color:
+                if figure and figure.color == self.color and not threat_for_king:
                     continue
                 toret.append(ChessMove(move_position, self.position, MoveType.NORMAL))
             return toret
@@ -324,7 +324,6 @@ class Rook(FigureWithLinearMovement):
 		"""
         self.is_able_to_castle = val
 
-
 class Queen(FigureWithLinearMovement):
     """
     Class representing queen chess figure.
@@ -482,7 +481,7 @@ class King(Figure):
             final_rook_pos = figure_offset_2_position if \
                 move_type == MoveType.CASTLE_SHORT else figure_offset_3_position
             possible_moves.append(ChessMove(final_king_pos, self.position, move_type,
-                                            {'rook-end-pos': final_rook_pos, 'rook': figure_rook}))
+                                            {'rook-end-pos': final_rook_pos, 'rook-start-pos': rook_position}))
 
         possible_moves = []
         if self.is_able_to_castle:
@@ -520,4 +519,3 @@ class King(Figure):
 			None        
 		"""
         self.is_able_to_castle = val
-
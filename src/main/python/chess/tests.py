@@ -1,6 +1,5 @@
 import unittest
 from unittest.mock import patch
-from itertools import chain
 
 import sys
 import time
@@ -9,6 +8,11 @@ from chess.figures import *
 from chess.enums import GameStatus
 import chess.chess_utils as ChessUtils
 from chess.chessboard import Chessboard
+from chess import zobrist
+from chess.bitboard import ChessBitboard, KING
+from chess.algorithm_relay.chess_bitboard_state import ChessBitboardState
+from chess.algorithm_relay.chess_state import ChessState
+from utils.random_utils import RandomStream
 
 
 class Move:
@@ -96,6 +100,64 @@ class TestChess(unittest.TestCase):
         figure = Figure.get_figure(self.chessboard.figures, (7, 6))
         self.assertEqual(figure.figure_type, FigureType.KING)
 
+    def test_castle_move_from_copied_board_moves_own_rook(self):
+        moves = [Move((1, 5), (3, 5)), Move((6, 5), (4, 5)),
+                 Move((0, 6), (2, 7)), Move((7, 6), (5, 7)),
+                 Move((1, 6), (2, 6)), Move((6, 6), (5, 6)),
+                 Move((0, 5), (1, 6)), Move((7, 5), (6, 6)),
+                 Move((0, 4))]
+        self.make_moves_from_queue(moves)
+        copied_board = self.chessboard.deep_copy()
+        castle_move = [move for move in ChessUtils.get_all_possible_moves(copied_board)
+                       if move[0].move_type == MoveType.CASTLE_SHORT][0][0]
+        self.chessboard.perform_legal_move(castle_move)
+        rook = Figure.get_figure(self.chessboard.figures, (0, 5))
+        self.assertEqual(rook.figure_type, FigureType.ROOK)
+        self.assertIn(rook, self.chessboard.figures.figures_list)
+        self.assertIsNone(Figure.get_figure(self.chessboard.figures, (0, 7)))
+        self.assertEqual(Figure.get_figure(copied_board.figures, (0, 7)).figure_type, FigureType.ROOK)
+
+    def test_position_hash_is_equal_for_transposed_moves(self):
+        self.make_moves_from_queue([Move((0, 6), (2, 5)), Move((7, 1), (5, 2)), Move((0, 1), (2, 2))])
+        position_hash = self.chessboard.get_position_hash()
+        self.chessboard = Chessboard()
+        self.make_moves_from_queue([Move((0, 1), (2, 2)), Move((7, 1), (5, 2)), Move((0, 6), (2, 5))])
+        self.assertEqual(self.chessboard.get_position_hash(), position_hash)
+
+    def test_position_hash_differs_when_castling_is_lost(self):
+        self.make_moves_from_queue([Move((0, 6), (2, 5)), Move((7, 6), (5, 5))])
+        position_hash = self.chessboard.get_position_hash()
+        self.make_moves_from_queue([Move((0, 7), (0, 6)), Move((7, 7), (7, 6)),
+                                    Move((0, 6), (0, 7)), Move((7, 6), (7, 7))])
+        self.assertNotEqual(self.chessboard.get_position_hash(), position_hash)
+
+    def test_position_hash_is_updated_incrementally(self):
+        random_stream = RandomStream(1)
+        for _ in range(150):
+            all_possible_moves = ChessUtils.get_all_possible_moves(self.chessboard)
+            if self.chessboard.game_status != GameStatus.IN_PROGRESS:
+                break
+            move = all_possible_moves[random_stream.get_random_int(0, len(all_possible_moves))][0]
+            self.chessboard.perform_legal_move(move)
+            self.assertEqual(self.chessboard.get_position_hash(),
+                             zobrist.get_position_key(self.chessboard.figures, self.chessboard.current_player_color))
+
+    def test_threefold_repetition(self):
+        knights_shuffle = [Move((0, 6), (2, 5)), Move((7, 6), (5, 5)), Move((2, 5), (0, 6)), Move((5, 5), (7, 6))]
+        self.make_moves_from_queue(knights_shuffle)
+        self.assertEqual(self.chessboard.game_status, GameStatus.IN_PROGRESS)
+        self.make_moves_from_queue(knights_shuffle)
+        self.assertEqual(self.chessboard.game_status, GameStatus.THREEFOLD_REPETITION)
+
+    def test_pawn_move_resets_repetitions(self):
+        knights_shuffle = [Move((0, 6), (2, 5)), Move((7, 6), (5, 5)), Move((2, 5), (0, 6)), Move((5, 5), (7, 6))]
+        self.make_moves_from_queue(knights_shuffle)
+        self.assertEqual(self.chessboard.half_moves_count, 4)
+        self.assertEqual(self.chessboard.position_counts[self.chessboard.get_position_hash()], 2)
+        self.make_moves_from_queue([Move((1, 0), (2, 0))])
+        self.assertEqual(self.chessboard.half_moves_count, 0)
+        self.assertEqual(self.chessboard.position_counts, {self.chessboard.get_position_hash(): 1})
+
     def test_castle_long_execution_both_colors(self):
         moves = [Move((1, 1), (3, 1)), Move((6, 1), (4, 1)),
                  Move((1, 2), (3, 2)), Move((6, 2), (4, 2)),
@@ -119,6 +181,79 @@ class TestChess(unittest.TestCase):
         figure = Figure.get_figure(self.chessboard.figures, (7, 2))
         self.assertEqual(figure.figure_type, FigureType.KING)
 
+    def get_board_snapshot(self):
+        figures = self.chessboard.figures
+        figures_on_tiles = [(figure.figure_type, figure.color, figure.position,
+                             getattr(figure, 'is_able_to_castle', None),
+                             getattr(figure, 'can_be_captured_en_passant', None))
+                            for figure in figures.figures_list]
+        return (self.chessboard.get_position_hash(), figures_on_tiles,
+                [(id(figure), figure.position) for figure in figures.figures_list],
+                figures.player1_value, figures.player2_value, self.chessboard.check, self.chessboard.game_status,
+                self.chessboard.current_player_color, len(self.chessboard.past_moves),
+                self.chessboard.half_moves_count, dict(self.chessboard.position_counts))
+
+    def test_undo_move_restores_position(self):
+        random_stream = RandomStream(0)
+        snapshots = []
+        undos = []
+        for _ in range(120):
+            all_possible_moves = ChessUtils.get_all_possible_moves(self.chessboard)
+            if self.chessboard.game_status != GameStatus.IN_PROGRESS:
+                break
+            move = all_possible_moves[random_stream.get_random_int(0, len(all_possible_moves))][0]
+            snapshots.append(self.get_board_snapshot())
+            undos.append(self.chessboard.perform_legal_move(move))
+        while undos:
+            self.chessboard.undo_move(undos.pop())
+            self.assertEqual(self.get_board_snapshot(), snapshots.pop())
+
+    def test_undo_castle_long_and_en_passant(self):
+        moves = [Move((1, 1), (3, 1)), Move((6, 1), (4, 1)),
+                 Move((1, 2), (3, 2)), Move((6, 2), (4, 2)),
+                 Move((1, 3), (3, 3)), Move((6, 7), (4, 7)),
+                 Move((0, 1), (2, 0)), Move((4, 7), (3, 7)),
+                 Move((0, 2), (1, 1)), Move((6, 0), (5, 0)),
+                 Move((0, 3), (1, 3)), Move((6, 6), (5, 6))]
+        self.make_moves_from_queue(moves)
+        snapshot = self.get_board_snapshot()
+
+        castle_move = [move for move, _ in ChessUtils.get_all_possible_moves(self.chessboard)
+                       if move.move_type == MoveType.CASTLE_LONG][0]
+        self.chessboard.undo_move(self.chessboard.perform_legal_move(castle_move))
+        self.assertEqual(self.get_board_snapshot(), snapshot)
+        self.assertTrue(self.chessboard.figures.get_figure_at((0, 0)).is_able_to_castle)
+
+        double_move = [move for move, _ in ChessUtils.get_all_possible_moves(self.chessboard)
+                       if move.move_type == MoveType.PAWN_DOUBLE_MOVE and move.position_from == (1, 6)][0]
+        double_move_undo = self.chessboard.perform_legal_move(double_move)
+        en_passant_move = [move for move, _ in ChessUtils.get_all_possible_moves(self.chessboard)
+                           if move.move_type == MoveType.EN_PASSANT][0]
+        self.chessboard.undo_move(self.chessboard.perform_legal_move(en_passant_move))
+        self.assertTrue(self.chessboard.figures.get_figure_at((3, 6)).can_be_captured_en_passant)
+        self.chessboard.undo_move(double_move_undo)
+        self.assertEqual(self.get_board_snapshot(), snapshot)
+        self.assertFalse(self.chessboard.figures.get_figure_at((1, 6)).can_be_captured_en_passant)
+
+    def test_legal_moves_of_status_update_are_reused(self):
+        move = ChessUtils.get_all_possible_moves(self.chessboard)[0][0]
+        self.chessboard.perform_legal_move(move)
+        with patch('chess.chess_utils.KingSafety') as king_safety:
+            self.assertEqual(len(ChessUtils.get_all_possible_moves(self.chessboard)), 20)
+            king_safety.assert_not_called()
+
+    def test_legal_moves_are_generated_again_when_figures_are_replaced(self):
+        self.assertEqual(len(ChessUtils.get_all_possible_moves(self.chessboard)), 20)
+        self.chessboard.figures = ChessFiguresCollection([King(Color.WHITE, (0, 0)), King(Color.BLACK, (7, 7))])
+        self.assertEqual(len(ChessUtils.get_all_possible_moves(self.chessboard)), 3)
+
+    def test_descriptions_are_not_formatted_by_random_moves(self):
+        state = ChessState(self.chessboard)
+        random_stream = RandomStream(0)
+        moves = [state.perform_random_move(random_stream) for _ in range(10)]
+        self.assertTrue(all(move._description == "" for move in moves))
+        self.assertRegex(moves[0].description, r"^white \w+ [a-h][1-8] -> [a-h][1-8]$")
+
     def test_king_cant_step_back_when_check(self):
         moves = [Move((1, 4), (3, 4)), Move((6, 3), (4, 3)),
                  Move((3, 4), (4, 3)), Move((7, 3), (4, 3)),
@@ -203,6 +338,23 @@ class TestChess(unittest.TestCase):
         self.make_moves_from_queue(moves)
         self.assertNotIn((2, 3), [move.position_to for move in self.chessboard.possible_moves])
 
+    def test_king_cant_capture_figure_protected_by_knight(self):
+        figures = [King(Color.WHITE, (0, 4)), Bishop(Color.BLACK, (1, 4)),
+                   Knight(Color.BLACK, (3, 5)), King(Color.BLACK, (7, 7))]
+        self.chessboard.figures = ChessFiguresCollection(figures)
+        self.make_moves_from_queue([Move((0, 4))])
+        self.assertEqual(sorted(move.position_to for move in self.possible_moves), [(1, 3), (1, 5)])
+
+    def test_pinned_figure_moves_along_the_pin_only(self):
+        figures = [King(Color.WHITE, (0, 0)), Queen(Color.WHITE, (2, 2)), Knight(Color.WHITE, (0, 3)),
+                   Bishop(Color.BLACK, (5, 5)), Rook(Color.BLACK, (0, 7)), King(Color.BLACK, (7, 7))]
+        self.chessboard.figures = ChessFiguresCollection(figures)
+        self.make_moves_from_queue([Move((2, 2))])
+        self.assertEqual(sorted(move.position_to for move in self.possible_moves),
+                         [(1, 1), (3, 3), (4, 4), (5, 5)])
+        self.make_moves_from_queue([Move((0, 3))])
+        self.assertEqual(self.possible_moves, [])
+
     # def test_promotion(self):
     #     figures = [King(Color.WHITE, (1, 0)), Pawn(Color.WHITE, (6, 4)), King(Color.BLACK, (6, 7)),
     #                Pawn(Color.BLACK, (1, 3))]
@@ -418,43 +570,20 @@ class TestChess(unittest.TestCase):
         self.make_moves_from_queue(moves)
         self.assertEqual(self.chessboard.game_status, GameStatus.IN_PROGRESS)
 
-        moves_white = [
-            Move((0, 1), (0, 2)), Move((0, 2), (0, 3)), Move((0, 3), (0, 4)),
-            Move((0, 4), (0, 5)), Move((0, 5), (0, 6)), Move((0, 6), (0, 7)), Move((0, 7), (1, 7)),
-            Move((1, 7), (1, 6)), Move((1, 6), (1, 5)), Move((1, 5), (1, 4)), Move((1, 4), (1, 3)),
-            Move((1, 3), (1, 2)), Move((1, 2), (1, 1)), Move((1, 1), (1, 0)), Move((1, 0), (0, 0)),
-            Move((0, 0), (0, 1)), Move((0, 1), (0, 2)), Move((0, 2), (0, 3)), Move((0, 3), (0, 4)),
-            Move((0, 4), (0, 5)), Move((0, 5), (0, 6)), Move((0, 6), (0, 7)), Move((0, 7), (1, 7)),
-            Move((1, 7), (1, 6)), Move((1, 6), (1, 5)), Move((1, 5), (1, 4)), Move((1, 4), (1, 3)),
-            Move((1, 3), (1, 2)), Move((1, 2), (1, 1)), Move((1, 1), (1, 0)), Move((1, 0), (0, 0)),
-            Move((0, 0), (0, 1)), Move((0, 1), (0, 2)), Move((0, 2), (0, 3)), Move((0, 3), (0, 4)),
-            Move((0, 4), (0, 5)), Move((0, 5), (0, 6)), Move((0, 6), (0, 7)), Move((0, 7), (1, 7)),
-            Move((1, 7), (1, 6)), Move((1, 6), (1, 5)), Move((1, 5), (1, 4)), Move((1, 4), (1, 3)),
-            Move((1, 3), (1, 2)), Move((1, 2), (1, 1)), Move((1, 1), (1, 0)), Move((1, 0), (0, 0)),
-            Move((0, 0), (0, 1))]
-        moves_black = [
-            Move((6, 2), (6, 3)), Move((6, 3), (6, 4)),
-            Move((6, 4), (6, 5)), Move((6, 5), (6, 6)), Move((6, 6), (6, 7)), Move((6, 7), (7, 7)),
-            Move((7, 7), (7, 6)), Move((7, 6), (7, 5)), Move((7, 5), (7, 4)), Move((7, 4), (7, 3)),
-            Move((7, 3), (7, 2)), Move((7, 2), (7, 1)), Move((7, 1), (7, 0)), Move((7, 0), (6, 0)),
-            Move((6, 0), (6, 1)), Move((6, 1), (6, 2)), Move((6, 2), (6, 3)), Move((6, 3), (6, 4)),
-            Move((6, 4), (6, 5)), Move((6, 5), (6, 6)), Move((6, 6), (6, 7)), Move((6, 7), (7, 7)),
-            Move((7, 7), (7, 6)), Move((7, 6), (7, 5)), Move((7, 5), (7, 4)), Move((7, 4), (7, 3)),
-            Move((7, 3), (7, 2)), Move((7, 2), (7, 1)), Move((7, 1), (7, 0)), Move((7, 0), (6, 0)),
-            Move((6, 0), (6, 1)), Move((6, 1), (6, 2)), Move((6, 2), (6, 3)), Move((6, 3), (6, 4)),
-            Move((6, 4), (6, 5)), Move((6, 5), (6, 6)), Move((6, 6), (6, 7)), Move((6, 7), (7, 7)),
-            Move((7, 7), (7, 6)), Move((7, 6), (7, 5)), Move((7, 5), (7, 4)), Move((7, 4), (7, 3)),
-            Move((7, 3), (7, 2)), Move((7, 2), (7, 1)), Move((7, 1), (7, 0)), Move((7, 0), (6, 0)),
-            Move((6, 0), (6, 1)), Move((6, 1), (6, 2))]
-        moves = list(chain.from_iterable(zip(moves_white, moves_black)))
-        self.make_moves_from_queue(moves)
-        self.assertEqual(self.chessboard.game_status, GameStatus.IN_PROGRESS)
-
-        moves = [Move((0, 1), (0, 2)), Move((6, 2), (6, 3))]
+        # tours of different lengths, so that no position repeats before the fifty-move rule
+        white_tour = [(0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7), (1, 7),
+                      (1, 6), (1, 5), (1, 4), (1, 3), (1, 2), (1, 1), (1, 0), (0, 0)]
+        black_tour = [(6, 2), (6, 3), (6, 4), (6, 5), (6, 6), (6, 7), (7, 7), (7, 6),
+                      (7, 5), (7, 4), (7, 3), (7, 2), (7, 1), (6, 0), (6, 1)]
+        moves = []
+        for i in range(1, 50):
+            moves.append(Move(white_tour[(i - 1) % len(white_tour)], white_tour[i % len(white_tour)]))
+            moves.append(Move(black_tour[(i - 1) % len(black_tour)], black_tour[i % len(black_tour)]))
         self.make_moves_from_queue(moves)
         self.assertEqual(self.chessboard.game_status, GameStatus.IN_PROGRESS)
+        self.assertEqual(self.chessboard.half_moves_count, 99)
 
-        moves = [Move((0, 2), (0, 3))]
+        moves = [Move(white_tour[49 % len(white_tour)], white_tour[50 % len(white_tour)])]
         self.make_moves_from_queue(moves)
         self.assertEqual(self.chessboard.game_status, GameStatus.FIFTY_MOVE_RULE)
 
@@ -469,5 +598,146 @@ class TestChess(unittest.TestCase):
         self.assertNotIn((5, 3), [move.position_to for move in self.chessboard.possible_moves])
 
 
+class TestChessboardPerft(unittest.TestCase):
+    FIGURE_CLASSES = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+    CASTLING_ROOKS = {(0, 7): "K", (0, 0): "Q", (7, 7): "k", (7, 0): "q"}
+
+    def create_chessboard(self, fen):
+        placement, color, castling = fen.split()[:3]
+        figures = []
+        for row_index, row_description in enumerate(placement.split("/")):
+            column = 0
+            for char in row_description:
+                if char.isdigit():
+                    column += int(char)
+                    continue
+                figure_color = Color.WHITE if char.isupper() else Color.BLACK
+                figures.append(self.FIGURE_CLASSES[char.lower()](figure_color, (7 - row_index, column)))
+                column += 1
+        chessboard = Chessboard()
+        chessboard.figures = ChessFiguresCollection(figures)
+        chessboard.current_player_color = Color.WHITE if color == "w" else Color.BLACK
+        for figure in figures:
+            if figure.figure_type == FigureType.KING:
+                figure.set_is_able_to_castle(any(char in castling for char in
+                                                 ("KQ" if figure.color == Color.WHITE else "kq")))
+            elif figure.figure_type == FigureType.ROOK:
+                figure.set_is_able_to_castle(self.CASTLING_ROOKS.get(figure.position, "-") in castling)
+        chessboard.check_for_check(chessboard.current_player_color)
+        chessboard.update_game_status()
+        return chessboard
+
+    def perft(self, chessboard, depth):
+        moves = [move for move, _ in ChessUtils.get_all_possible_moves(chessboard)]
+        if depth == 1:
+            return len(moves)
+        nodes_count = 0
+        for move in moves:
+            undo = chessboard.perform_legal_move(move)
+            nodes_count += self.perft(chessboard, depth - 1)
+            chessboard.undo_move(undo)
+        return nodes_count
+
+    def test_perft_initial_position(self):
+        chessboard = Chessboard()
+        self.assertEqual([self.perft(chessboard, depth) for depth in (1, 2, 3)], [20, 400, 8902])
+
+    def test_perft_castling_and_en_passant_position(self):
+        chessboard = self.create_chessboard("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -")
+        self.assertEqual([self.perft(chessboard, depth) for depth in (1, 2)], [48, 2039])
+
+    def test_perft_pinned_pawns_endgame(self):
+        chessboard = self.create_chessboard("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -")
+        self.assertEqual([self.perft(chessboard, depth) for depth in (1, 2, 3)], [14, 191, 2812])
+
+    def test_perft_checks_and_promotions_position(self):
+        # promotion is always to a queen, so counts are lower than the standard 6, 264
+        chessboard = self.create_chessboard("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq -")
+        self.assertEqual([self.perft(chessboard, depth) for depth in (1, 2)], [6, 228])
+
+
+class TestChessBitboard(unittest.TestCase):
+    def perft(self, board, depth):
+        if depth == 1:
+            return len(board.legal_moves)
+        nodes_count = 0
+        for move in board.legal_moves:
+            board_copy = board.deep_copy()
+            board_copy.make_move(move)
+            nodes_count += self.perft(board_copy, depth - 1)
+        return nodes_count
+
+    def test_perft_initial_position(self):
+        board = ChessBitboard()
+        self.assertEqual([self.perft(board, depth) for depth in (1, 2, 3)], [20, 400, 8902])
+
+    def test_perft_castling_and_en_passant_position(self):
+        board = ChessBitboard("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        self.assertEqual([self.perft(board, depth) for depth in (1, 2)], [48, 2039])
+
+    def test_perft_pinned_pawns_endgame(self):
+        board = ChessBitboard("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1")
+        self.assertEqual([self.perft(board, depth) for depth in (1, 2, 3)], [14, 191, 2812])
+
+    def test_legal_moves_are_equal_to_chessboard_moves(self):
+        for seed in range(2):
+            chessboard = Chessboard()
+            board = ChessBitboard.from_chessboard(chessboard)
+            random_stream = RandomStream(seed)
+            for _ in range(80):
+                chessboard_moves = [move for move, _ in ChessUtils.get_all_possible_moves(chessboard)]
+                expected = sorted((move.position_from, move.position_to, move.move_type.value)
+                                  for move in chessboard_moves)
+                actual = sorted((move.position_from, move.position_to, move.move_type.value)
+                                for move in map(board.decode_chess_move, board.legal_moves))
+                self.assertEqual(actual, expected)
+                self.assertEqual(board.game_status, chessboard.game_status)
+                if chessboard.game_status != GameStatus.IN_PROGRESS:
+                    break
+                move = chessboard_moves[random_stream.get_random_int(0, len(chessboard_moves))]
+                chessboard.perform_legal_move(move)
+                board.perform_legal_move(move)
+            self.assertEqual(board.get_position_hash(), ChessBitboard.from_chessboard(chessboard).get_position_hash())
+
+    def test_random_moves_of_state_can_be_performed_on_chessboard(self):
+        chessboard = Chessboard()
+        state = ChessBitboardState.from_chessboard(chessboard)
+        random_stream = RandomStream(0)
+        for _ in range(30):
+            move = state.perform_random_move(random_stream)
+            chessboard.perform_legal_move(move)
+            self.assertEqual(ChessUtils.get_player_from_color(chessboard.current_player_color), state.current_player)
+        self.assertEqual(state.get_figures_values(),
+                         (chessboard.figures.player1_value, chessboard.figures.player2_value))
+        self.assertEqual(state.get_position_hash(), ChessBitboard.from_chessboard(chessboard).get_position_hash())
+
+    def test_checkmate_ends_game(self):
+        board = ChessBitboard("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+        self.assertEqual(board.game_status, GameStatus.CHECKMATE_BLACK)
+
+    def test_is_draw_when_king_bishop(self):
+        board = ChessBitboard("k7/8/8/8/8/8/8/K1B5 w - - 0 1")
+        self.assertEqual(board.game_status, GameStatus.DRAW)
+
+    def test_fifty_move_rule(self):
+        board = ChessBitboard("k7/8/8/8/8/8/8/KR6 w - - 99 80")
+        self.assertEqual(board.game_status, GameStatus.IN_PROGRESS)
+        board.make_move(next(move for move in board.legal_moves if board.squares[move & 63][1] == KING))
+        self.assertEqual(board.game_status, GameStatus.FIFTY_MOVE_RULE)
+
+    def test_threefold_repetition(self):
+        chessboard = Chessboard()
+        board = ChessBitboard.from_chessboard(chessboard)
+        knights_shuffle = [((0, 6), (2, 5)), ((7, 6), (5, 5)), ((2, 5), (0, 6)), ((5, 5), (7, 6))]
+        for position_from, position_to in knights_shuffle * 2:
+            self.assertEqual(board.game_status, GameStatus.IN_PROGRESS)
+            move = next(move for move, _ in ChessUtils.get_all_possible_moves(chessboard)
+                        if move.position_from == position_from and move.position_to == position_to)
+            chessboard.perform_legal_move(move)
+            board.perform_legal_move(move)
+        self.assertEqual(board.game_status, GameStatus.THREEFOLD_REPETITION)
+        self.assertEqual(chessboard.game_status, GameStatus.THREEFOLD_REPETITION)
+
+
 if __name__ == '__main__':
     unittest.main()
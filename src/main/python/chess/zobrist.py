@@ -0,0 +1,80 @@
+
+import random
+
+from chess.enums import Color, FigureType
+
+_random = random.Random(20190601)
+FIGURE_KEYS = {(figure_type, color): [_random.getrandbits(64) for _ in range(64)]
+               for figure_type in FigureType for color in Color}
+CASTLING_KEYS = [_random.getrandbits(64) for _ in range(16)]
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+
+# king's and rook's initial positions for each castling right: white short, white long, black short, black long
+CASTLING_POSITIONS = [((0, 4), (0, 7)), ((0, 4), (0, 0)), ((7, 4), (7, 7)), ((7, 4), (7, 0))]
+
+
+def get_figure_key(figure):
+    """
+		Args:
+			figure:  Figure object
+
+		Returns:
+			Zobrist key of the figure on its tile
+		"""
+    return FIGURE_KEYS[figure.figure_type, figure.color][figure.position[0] * 8 + figure.position[1]]
+
+
+def get_castling_key(figures):
+    """
+    Castling right is kept while both the king and the rook stand on their initial positions able to castle.
+
+		Args:
+			figures:  ChessFiguresCollection object
+
+		Returns:
+			Zobrist key of castling rights of both players
+		"""
+    castling_rights = 0
+    for index, (king_position, rook_position) in enumerate(CASTLING_POSITIONS):
+        king = figures.get_figure_at(king_position)
+        rook = figures.get_figure_at(rook_position)
+        if king and king.figure_type == FigureType.KING and king.is_able_to_castle and \
+                rook and rook.figure_type == FigureType.ROOK and rook.is_able_to_castle:
+            castling_rights |= 1 << index
+    return CASTLING_KEYS[castling_rights]
+
+
+def get_en_passant_key(figures, color):
+    """
+		Args:
+			figures:  ChessFiguresCollection object
+			color:  color of the moving player
+
+		Returns:
+			Zobrist key of the column of the opponent's pawn which can be captured en passant, 0 if there is none
+		"""
+    for figure in figures.figures_list:
+        if figure.figure_type == FigureType.PAWN and figure.color != color and figure.can_be_captured_en_passant:
+            return EN_PASSANT_KEYS[figure.position[1]]
+    return 0
+
+
+def get_position_key(figures, color):
+    """
+    Computes the Zobrist key of the whole position. Chessboard updates it incrementally with the keys of figures
+    changed by a move.
+
+		Args:
+			figures:  ChessFiguresCollection object
+			color:  color of the moving player
+
+		Returns:
+			int, 64-bit key of figures on their tiles, castling rights, the en passant column and the moving player
+		"""
+    key = get_castling_key(figures) ^ get_en_passant_key(figures, color)
+    if color == Color.BLACK:
+        key ^= BLACK_TO_MOVE_KEY
+    for figure in figures.figures_list:
+        key ^= get_figure_key(figure)
+    return key
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 from PyQt5 import QtWidgets
@@ -36,6 +37,7 @@ if __name__ == '__main__':
     """
     Application entry point.
     """
+    multiprocessing.freeze_support()
     redefine_exceptions()
     context = UCTVisualisationAppContext()
     exit_code = context.run()
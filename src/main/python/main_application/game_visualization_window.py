@@ -1,6 +1,7 @@
-from PyQt5.QtWidgets import QMainWindow, QGridLayout, QMessageBox
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QMainWindow, QGridLayout, QMessageBox, QWidget, QHBoxLayout
 
-from main_application.GUI_utils import show_dialog
+from main_application.GUI_utils import show_dialog, get_button
 from main_application.game_window import GameWindow
 from main_application.gui_settings import DisplaySettings
 from main_application.iteration_progress_widget import IterationProgressWidget
@@ -11,8 +12,8 @@ from visualisation_drawing.canvas_widget import MonteCarloTreeCanvasWidget
 class GameVisualizationWindow(GameWindow):
     """
     Class that expands game window by UCT visualization.
-    It adds visualization canvas, node information panel, tree-save buttons, center tree buttons and iteration progress
-    bar.
+    It adds visualization canvas, node information panel, tree-save buttons, center tree buttons, iteration progress
+    bar and "Move now" button, which ends the calculation of PC's move early.
     """
     def __init__(self, parent: QMainWindow, manager: MonteCarloWindowManager, display_settings: DisplaySettings,
                  main_layout: QGridLayout):
@@ -22,8 +23,19 @@ class GameVisualizationWindow(GameWindow):
         self.iteration_progress_widget = IterationProgressWidget()
         main_layout.addWidget(self.iteration_progress_widget, 0, 0, 1, 2)
         main_layout.addWidget(self.tree_widget, 1, 1)
-        self.initial_iteration = True
-        self.manager.mc_manager.iteration_performed += self._handle_iteration_performed
+        self.search_buttons_layout = QHBoxLayout()
+        self.move_now_button = get_button("Move now")
+        self.move_now_button.clicked.connect(self._handle_move_now_button)
+        self.move_now_button.setEnabled(False)
+        self.search_buttons_layout.addWidget(self.move_now_button)
+        search_buttons_widget = QWidget()
+        search_buttons_widget.setLayout(self.search_buttons_layout)
+        self.game_layout.addWidget(search_buttons_widget, 4, 0, alignment=QtCore.Qt.AlignCenter)
+        self.manager.snapshots_enabled = display_settings.animate
+        self.manager.on_search_started += self._handle_search_started
+        self.manager.on_iteration_performed += self._handle_iteration_performed
+        self.manager.on_tree_snapshot += self._handle_tree_snapshot
+        self.manager.on_search_finished += self._handle_search_finished
         self.manager.on_update_tree += self._handle_fill_node_info
 
     def _handle_start_over_button(self):
@@ -35,20 +47,28 @@ class GameVisualizationWindow(GameWindow):
             self.on_close_request.fire(self, earg=game_window_properties)
             self.close()
 
+    def _handle_move_now_button(self):
+        self.manager.move_now()
+
+    def _handle_search_started(self, sender, earg):
+        self.move_now_button.setEnabled(True)
+        self.tree_widget.layout.reset_node_panel_info()
+
     def _handle_iteration_performed(self, sender, earg):
         self.iteration_progress_widget.layout.progress_bar.setValue(earg * 100)
-        if self.display_settings.animate:
-            self.manager.mc_manager.tree.reset_vis_data()
-            self.tree_widget.layout.canvas.use_tree_data(self.manager.mc_manager.tree)
-            self.tree_widget.layout.fill_tree_details_panel_info(self.manager.mc_manager.tree.data.vertices_count)
-        if self.initial_iteration:
-            self.tree_widget.layout.reset_node_panel_info()
-            self.initial_iteration = False
-        if earg == 1:
-            self.manager.mc_manager.tree.reset_vis_data()
-            self.tree_widget.layout.canvas.use_tree_data(self.manager.mc_manager.tree)
-            self.tree_widget.layout.fill_tree_details_panel_info(self.manager.mc_manager.tree.data.vertices_count)
-            self.initial_iteration = True
+
+    def _handle_tree_snapshot(self, sender, tree):
+        self._show_tree(tree)
+
+    def _handle_search_finished(self, sender, move):
+        self.move_now_button.setEnabled(False)
+        self.iteration_progress_widget.layout.progress_bar.setValue(100)
+        self._show_tree(self.manager.mc_manager.tree.get_visualisation_tree())
+
+    def _show_tree(self, tree):
+        tree.reset_vis_data()
+        self.tree_widget.layout.canvas.use_tree_data(tree)
+        self.tree_widget.layout.fill_tree_details_panel_info(tree.data.vertices_count)
 
     def _handle_fill_node_info(self, sender, move_info):
         node = move_info.get('node', None)
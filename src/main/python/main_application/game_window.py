@@ -84,6 +84,19 @@ class GameWindow(QMainWindow):
 		"""
         self.update_game_status_label(move_info['phase'])
 
+    def closeEvent(self, event):
+        """
+        Overrides base class. Releases resources of the algorithm before the window is closed.
+
+		Args:
+			event:  QCloseEvent, information about window-closing event
+
+		Returns:
+			None
+		"""
+        self.manager.close()
+        super().closeEvent(event)
+
     def showEvent(self, event):
         """
         Overrides base class. Shows window and centers it in relation to parent window.
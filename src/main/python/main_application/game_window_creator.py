@@ -4,6 +4,7 @@ import os
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QMainWindow
 
+from chess.algorithm_relay.chess_bitboard_state import ChessBitboardState
 from chess.algorithm_relay.chess_state import ChessState
 from chess.chess_canvas import ChessCanvas
 from main_application.enums import Game, GameMode
@@ -35,7 +36,10 @@ def create_proper_window(parent: QMainWindow, game: Game, game_mode: GameMode,
 		"""
     if game == Game.Chess:
         canvas = ChessCanvas()
-        start_state = ChessState(canvas.chess_manager.board)
+        if mc_settings.use_bitboard_chess:
+            start_state = ChessBitboardState.from_chessboard(canvas.chess_manager.board)
+        else:
+            start_state = ChessState(canvas.chess_manager.board)
     else:
         canvas = MancalaCanvas()
         start_state = MancalaState(canvas.board)
@@ -1,4 +1,7 @@
 
+from uct.algorithm.enums import ParallelisationMode, SimulationMode
+
+
 class MonteCarloSettings:
     """
     Class is responsible for Monte Carlo algorithm settings.
@@ -10,6 +13,25 @@ class MonteCarloSettings:
         self.limit_iterations = True
         self.limit_moves = True
         self.exploration_parameter = 1.41
+        self.use_array_tree = False
+        self.use_transpositions = False
+        self.lazy_expansion = False
+        self.parallelisation = ParallelisationMode.NONE
+        self.workers_count = 1
+        self.playouts_per_leaf = 1
+        self.max_tree_nodes = 0
+        self.max_tree_memory = 0
+        self.pondering = False
+        self.smart_stop = False
+        self.use_solver = False
+        self.use_rave = False
+        self.rave_equivalence = 300
+        self.simulation_mode = SimulationMode.PLAYOUT
+        self.evaluation_batch_size = 16
+        self.random_seed = None
+        self.profile_search = False
+        self.profile_log_path = None
+        self.use_bitboard_chess = False
 
     def validate(self):
         """
@@ -18,6 +40,16 @@ class MonteCarloSettings:
         - max time per move in range [1000 ms; 120k ms]
         - moves per iteration in range [10; 100k]
         - exploration parameter in range [0; 20]
+        - workers count in range [1; 64] when the search is parallelised
+        - playouts per leaf in range [1; 1000]
+        - transpositions are not combined with the array tree
+        - tree nodes limit in range [0; 100M], 0 means no limit
+        - tree memory limit in range [0; 64k MB], 0 means no limit
+        - pondering is not combined with root parallelisation
+        - RAVE equivalence parameter in range [1; 100k] when RAVE is used
+        - static evaluation is not combined with parallelisation
+        - evaluation batch size in range [1; 1024] when static evaluation is used
+        - random seed is not negative, None means a new seed for every game
 		Returns:
 			Message or empty string        
 		"""
@@ -30,6 +62,28 @@ class MonteCarloSettings:
             return "Invalid time limit. Should be between 1s and 120s."
         elif self.exploration_parameter < 0 or self.exploration_parameter > 20:
             return "Invalid exploration parameter. Should be between 0 and 20."
+        elif self.parallelisation != ParallelisationMode.NONE and (self.workers_count < 1 or self.workers_count > 64):
+            return "Invalid workers count. Should be between 1 and 64."
+        elif self.playouts_per_leaf < 1 or self.playouts_per_leaf > 1000:
+            return "Invalid playouts per leaf. Should be between 1 and 1000."
+        elif self.use_transpositions and self.use_array_tree:
+            return "Transpositions are not supported by the array tree."
+        elif self.max_tree_nodes < 0 or self.max_tree_nodes > 100000000:
+            return "Invalid tree nodes limit. Should be between 0 and 100000000."
+        elif self.max_tree_memory < 0 or self.max_tree_memory > 65536:
+            return "Invalid tree memory limit. Should be between 0 and 65536 MB."
+        elif self.pondering and self.parallelisation == ParallelisationMode.ROOT:
+            return "Pondering is not supported with root parallelisation."
+        elif self.use_rave and (self.rave_equivalence < 1 or self.rave_equivalence > 100000):
+            return "Invalid RAVE equivalence parameter. Should be between 1 and 100000."
+        elif self.simulation_mode == SimulationMode.STATIC_EVALUATION and \
+                self.parallelisation != ParallelisationMode.NONE:
+            return "Static evaluation is not supported with parallelisation."
+        elif self.simulation_mode == SimulationMode.STATIC_EVALUATION and \
+                (self.evaluation_batch_size < 1 or self.evaluation_batch_size > 1024):
+            return "Invalid evaluation batch size. Should be between 1 and 1024."
+        elif self.random_seed is not None and self.random_seed < 0:
+            return "Invalid random seed. Should not be negative."
         return ""
 
     def get_internal_time(self):
@@ -0,0 +1,87 @@
+
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from uct.algorithm.mc_game_manager import MonteCarloGameManager
+
+
+class MonteCarloSearchWorker(QThread):
+    """
+    Class calculates the algorithm's move in a background thread, so that the GUI stays responsive.
+    The search reports its progress and, optionally, snapshots of the tree through signals, which are delivered to
+    the GUI thread. The calculation can be finished early with the best move found so far or cancelled.
+    A pondering worker searches the tree on the opponent's time instead, until it is cancelled.
+    """
+    PROGRESS_INTERVAL_MS = 16
+    SNAPSHOT_INTERVAL_MS = 250
+
+    progress_changed = pyqtSignal(float)
+    tree_snapshot_ready = pyqtSignal(object)
+    search_finished = pyqtSignal(object)
+
+    def __init__(self, mc_manager: MonteCarloGameManager, snapshots_enabled=False, pondering=False):
+        super().__init__()
+        self.mc_manager = mc_manager
+        self.snapshots_enabled = snapshots_enabled
+        self.pondering = pondering
+        self.stop_requested = False
+        self.cancelled = False
+        self._progress = 0
+        self._last_snapshot_time = 0
+
+    def run(self):
+        """
+        Calculates the move, or ponders. Overrides the base class. It is executed in the worker thread,
+        search_finished signal is emitted with the calculated move, or with None if the calculation was cancelled or
+        the worker was pondering.
+
+		Returns:
+			None
+		"""
+        self.mc_manager.set_yield_callback(self._handle_yield, self.PROGRESS_INTERVAL_MS)
+        self.mc_manager.iteration_performed += self._handle_iteration_performed
+        try:
+            if self.pondering:
+                self.mc_manager.ponder()
+                move = None
+            else:
+                move = self.mc_manager.calculate_next_move()
+        finally:
+            self.mc_manager.iteration_performed -= self._handle_iteration_performed
+            self.mc_manager.set_yield_callback(None)
+        self.search_finished.emit(None if self.cancelled else move)
+
+    def move_now(self):
+        """
+        Asks the search to finish immediately with the best move found so far.
+
+		Returns:
+			None
+		"""
+        self.stop_requested = True
+        self.mc_manager.request_stop()
+
+    def cancel(self):
+        """
+        Asks the search to finish immediately and discards its result.
+
+		Returns:
+			None
+		"""
+        self.cancelled = True
+        self.move_now()
+
+    def _handle_iteration_performed(self, sender, earg):
+        self._progress = earg
+
+    def _handle_yield(self):
+        if self.stop_requested:
+            self.mc_manager.request_stop()
+        self.progress_changed.emit(self._progress)
+        if not self.snapshots_enabled:
+            return
+        now = time.perf_counter()
+        if (now - self._last_snapshot_time) * 1000 >= self.SNAPSHOT_INTERVAL_MS:
+            self._last_snapshot_time = now
+            self.tree_snapshot_ready.emit(self.mc_manager.tree.create_snapshot())
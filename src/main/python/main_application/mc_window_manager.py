@@ -1,11 +1,9 @@
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QApplication
-
 from chess.algorithm_relay.chess_state import ChessState
 from main_application.enums import GameMode, Game
 from main_application.game_canvas import GameCanvas
 from main_application.gui_settings import MonteCarloSettings
+from main_application.mc_search_worker import MonteCarloSearchWorker
 from uct.algorithm.enums import GamePhase
 from uct.algorithm.mc_game_manager import MonteCarloGameManager
 from uct.game.base_game_state import BaseGameState
@@ -22,22 +20,83 @@ class MonteCarloWindowManager:
         self.game_mode = game_mode
         self.mc_manager = MonteCarloGameManager(start_state, settings)
         self.on_update_tree = CustomEvent()
+        self.on_search_started = CustomEvent()
+        self.on_iteration_performed = CustomEvent()
+        self.on_tree_snapshot = CustomEvent()
+        self.on_search_finished = CustomEvent()
         self.game = game
+        self.search_worker = None
+        self.ponder_worker = None
+        self.snapshots_enabled = False
 
         self.canvas.player_move_performed += self._handle_player_move_performed
         self.on_update_tree += self._handle_machine_move_performed
 
     def perform_algorithm_move(self):
         """
-        Calculates next PC's move and performs it. It notifies other methods to update information in window, such as:
+        Starts calculation of next PC's move in a background worker. The move is performed once it is calculated.
+        Player cannot click on canvas in the meantime.
+
+		Returns:
+			None        
+		"""
+        if self.is_calculating():
+            return
+        self.canvas.set_player_can_click(False)
+        self.search_worker = MonteCarloSearchWorker(self.mc_manager, self.snapshots_enabled)
+        self.search_worker.progress_changed.connect(self._handle_progress_changed)
+        self.search_worker.tree_snapshot_ready.connect(self._handle_tree_snapshot_ready)
+        self.search_worker.search_finished.connect(self._handle_search_finished)
+        self.on_search_started.fire(self)
+        self.search_worker.start()
+
+    def is_calculating(self):
+        """
+		Returns:
+			bool informing if PC's move is being calculated
+		"""
+        return self.search_worker is not None
+
+    def move_now(self):
+        """
+        Makes PC perform the best move found so far, without waiting until the calculation is finished.
+
+		Returns:
+			None
+		"""
+        if self.search_worker:
+            self.search_worker.move_now()
+
+    def cancel_move(self):
+        """
+        Stops calculation of PC's move. No move is performed then.
+
+		Returns:
+			None
+		"""
+        if self.search_worker:
+            self.search_worker.cancel()
+
+    def _handle_search_finished(self, alg_move):
+        """
+        Performs the calculated move. It notifies other methods to update information in window, such as:
         - game status label
         - chosen node info.
         It also informs whether the game is still in progress. If not, player cannot click and needs to start over.
 
+		Args:
+			alg_move:  calculated BaseGameMove object, None if the calculation was cancelled
+
 		Returns:
-			None        
+			None
 		"""
-        alg_move = self.mc_manager.calculate_next_move()
+        self.search_worker.wait()
+        self.search_worker = None
+        self.on_search_finished.fire(self, earg=alg_move)
+        if alg_move is None:
+            return
+        if self.game_mode == GameMode.PLAYER_VS_PC:
+            self.canvas.set_player_can_click(True)
         self.canvas.perform_algorithm_move(alg_move)
         if self.game == Game.Chess:
             phase = ChessState.cast_chess_phase_to_abstract_phase(self.canvas.chess_manager.board.game_status)
@@ -48,13 +107,58 @@ class MonteCarloWindowManager:
 
         if self.game_mode == GameMode.PC_VS_PC:
             self.mc_manager.perform_previous_move()
+        elif phase == GamePhase.IN_PROGRESS and self.mc_manager.settings.pondering:
+            self._start_pondering()
+
+    def close(self):
+        """
+        Releases resources of the algorithm, such as worker processes. Calculation in progress is cancelled.
+
+		Returns:
+			None
+		"""
+        self._stop_pondering()
+        if self.search_worker:
+            self.search_worker.search_finished.disconnect(self._handle_search_finished)
+            self.search_worker.cancel()
+            self.search_worker.wait()
+            self.search_worker = None
+        self.mc_manager.close()
+
+    def _start_pondering(self):
+        """
+        Starts searching the tree in a background worker while the player thinks about the move.
+
+		Returns:
+			None
+		"""
+        self.ponder_worker = MonteCarloSearchWorker(self.mc_manager, pondering=True)
+        self.ponder_worker.start()
+
+    def _stop_pondering(self):
+        """
+        Stops pondering, if it is in progress, and waits until the worker stops modifying the tree. It takes at most
+        a single iteration.
+
+		Returns:
+			None
+		"""
+        if self.ponder_worker:
+            self.ponder_worker.cancel()
+            self.ponder_worker.wait()
+            self.ponder_worker = None
+
+    def _handle_progress_changed(self, progress):
+        self.on_iteration_performed.fire(self, earg=progress)
+
+    def _handle_tree_snapshot_ready(self, tree):
+        self.on_tree_snapshot.fire(self, earg=tree)
 
     def _handle_player_move_performed(self, sender, move_info):
+        self._stop_pondering()
         if self.game_mode == GameMode.PLAYER_VS_PC and move_info["phase"] == GamePhase.IN_PROGRESS:
             self.mc_manager.notify_move_performed(move_info["move"])
-            QApplication.setOverrideCursor(Qt.WaitCursor)
             self.perform_algorithm_move()
-            QApplication.restoreOverrideCursor()
         elif move_info["phase"] != GamePhase.IN_PROGRESS:
             self.canvas.set_player_can_click(False)
             self.canvas.game_ended = True
@@ -1,6 +1,5 @@
-from PyQt5.QtWidgets import QMainWindow, QGridLayout, QApplication
+from PyQt5.QtWidgets import QMainWindow, QGridLayout
 from PyQt5 import QtCore
-from PyQt5.QtCore import Qt
 
 from main_application.GUI_utils import get_button
 from main_application.game_visualization_window import GameVisualizationWindow
@@ -12,18 +11,37 @@ class MachineVsMachineWindow(GameVisualizationWindow):
     """
     Class responsible for PC vs PC game window creation. It expands its parent by "Make next move" button,
     which allows user to push the play forward, because in this mode user cannot click on canvas to make moves by itself.
+    It also adds "Cancel" button, which stops the calculation of the move without performing it.
     """
     def __init__(self, parent: QMainWindow, manager: MonteCarloWindowManager, display_settings: DisplaySettings):
         self.main_layout = QGridLayout()
         self.next_move_button = get_button("Make next move")
         self.next_move_button.clicked.connect(self.handle_next_move_button)
+        self.cancel_button = get_button("Cancel")
+        self.cancel_button.clicked.connect(self.handle_cancel_button)
+        self.cancel_button.setEnabled(False)
         super(MachineVsMachineWindow, self).__init__(parent, manager, display_settings, self.main_layout)
         self.game_layout.addWidget(self.next_move_button, 3, 0, alignment=QtCore.Qt.AlignCenter)
+        self.search_buttons_layout.addWidget(self.cancel_button)
+        self.manager.on_search_started += self._handle_machine_search_started
+        self.manager.on_search_finished += self._handle_machine_search_finished
+        self.manager.on_update_tree += self._handle_machine_move_performed
 
     def handle_next_move_button(self, sender):
         if not self.manager.canvas.game_ended:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
             self.manager.perform_algorithm_move()
-            QApplication.restoreOverrideCursor()
+
+    def handle_cancel_button(self, sender):
+        self.manager.cancel_move()
+
+    def _handle_machine_search_started(self, sender, earg):
+        self.next_move_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+    def _handle_machine_search_finished(self, sender, move):
+        self.next_move_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def _handle_machine_move_performed(self, sender, move_info):
         if self.manager.canvas.game_ended:
             self.next_move_button.setEnabled(False)
@@ -1,14 +1,19 @@
 
-import utils.random_utils as RandomUtils
+import numpy as np
+
 from mancala.mancala_board import MancalaBoard
 from uct.algorithm.enums import GamePhase
 from uct.game.base_game_state import BaseGameState
+from utils.random_utils import RandomStream
 
 
 class MancalaState(BaseGameState):
     """
     Class is implementing BaseGameState class methods in relation to mancala game.
     """
+    MAX_SCORE_DIFF = 48
+    WIN_SCORE_SLOPE = 0.6 / (MAX_SCORE_DIFF * 2)
+
     def __init__(self, board: MancalaBoard):
         super().__init__()
         self.board = board
@@ -20,20 +25,24 @@ class MancalaState(BaseGameState):
 		"""
         return self.board.find_all_moves()
 
-    def perform_random_move(self):
+    def perform_random_move(self, random_stream: RandomStream):
         """
         Function chooses on of the all possible moves of currently moving player and performs it, changing the current
         player afterwards. Game phase is saved after the performed move.
 
+		Args:
+			random_stream:  RandomStream object of the search
+
 		Returns:
-			None        
+			MancalaMove object, the performed move
 		"""
         all_possible_moves = self.get_all_possible_moves()
-        random_number = RandomUtils.get_random_int(0, len(all_possible_moves))
+        random_number = random_stream.get_random_int(0, len(all_possible_moves))
         move = all_possible_moves[random_number]
         self.board.perform_move(move[0])
         self.switch_current_player()
         self.phase = self.board.phase
+        return move[0]
 
     def apply_moves(self, moves):
         """
@@ -62,12 +71,34 @@ class MancalaState(BaseGameState):
 		Returns:
 			value from range [0.2; 0.8] (middle value is 0.5 - treated like a draw)        
 		"""
-        max_score_diff = 48
         diff = self.board.get_win_score(player)
-        a = 0.6 / (max_score_diff * 2)
-        diff_normalized = a * diff + 0.5
+        diff_normalized = MancalaState.WIN_SCORE_SLOPE * diff + 0.5
         return diff_normalized
 
+    @classmethod
+    def evaluate_win_scores(cls, states):
+        """
+        Vectorized get_win_score of many states, computed from an array of points in bases of both players.
+
+		Args:
+			states:  list of MancalaState objects
+
+		Returns:
+			numpy array of shape (states count, 2) with scores of players 1 and 2
+		"""
+        bases = np.array([(state.board.board_values[6], state.board.board_values[13]) for state in states],
+                         dtype=float).reshape(-1, 2)
+        diff = bases[:, 0] - bases[:, 1]
+        player1_scores = MancalaState.WIN_SCORE_SLOPE * diff + 0.5
+        return np.column_stack((player1_scores, 1 - player1_scores))
+
+    def get_position_hash(self):
+        """
+		Returns:
+			Hash of the mancala board position.        
+		"""
+        return self.board.get_position_hash()
+
     def deep_copy(self):
         """
 		Returns:
@@ -141,6 +141,13 @@ class MancalaBoard:
         else:
             return self.board_values[13] - self.board_values[6]
 
+    def get_position_hash(self):
+        """
+		Returns:
+			int, hash of stones in holes and bases and the moving player
+		"""
+        return hash((tuple(self.board_values), self.current_player))
+
     def _get_player_holes(self, player):
         if player == 1:
             return self.board_values[0:6]
@@ -8,7 +8,7 @@ def create_node(name, move_name):
     n = MonteCarloNode()
     n.details.state_name = name
     if len(move_name) > 0:
-        n.details.move = move_name
+        n.details.move_name = move_name
         n.details.visits_count = 3
         n.details.visits_count_pre_modified = 4
         n.details.average_prize = 4.5
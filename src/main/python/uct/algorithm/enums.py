@@ -9,6 +9,18 @@ class GamePhase(Enum):
     DRAW = 4
 
 
+class ParallelisationMode(Enum):
+    NONE = 1,
+    ROOT = 2,
+    TREE = 3,
+    LEAF = 4
+
+
+class SimulationMode(Enum):
+    PLAYOUT = 1,
+    STATIC_EVALUATION = 2
+
+
 def get_player_win(player):
     """
 		Args:
@@ -0,0 +1,274 @@
+
+import visualisation_algorithm.mc_node_vis_details as Vis
+from uct.algorithm.mc_node_store import MonteCarloNodeStore
+
+
+class MonteCarloArrayNode:
+    """
+    Class is a lightweight handle of a node kept in MonteCarloNodeStore. It exposes the same interface as
+    MonteCarloNode, so that the algorithm, visualisation and serializers can use both node types interchangeably.
+    Handles are created on demand and compare equal when they point at the same node of the same store.
+    """
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: MonteCarloNodeStore, index):
+        self.store = store
+        self.index = int(index)
+
+    def __eq__(self, other):
+        return isinstance(other, MonteCarloArrayNode) and self.index == other.index and self.store is other.store
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    @property
+    def id(self):
+        return self.index + 1
+
+    @property
+    def move(self):
+        return self.store.moves[self.store.move_index[self.index]]
+
+    @property
+    def details(self):
+        return MonteCarloArrayNodeDetails(self.store, self.index)
+
+    @property
+    def parent(self):
+        parent_index = self.store.parent[self.index]
+        if parent_index == MonteCarloNodeStore.NO_NODE:
+            return None
+        return MonteCarloArrayNode(self.store, parent_index)
+
+    @property
+    def children(self):
+        store = self.store
+        return [MonteCarloArrayNode(store, index) for index in store.children_range(self.index)]
+
+    @property
+    def number(self):
+        parent_index = self.store.parent[self.index]
+        if parent_index == MonteCarloNodeStore.NO_NODE:
+            return 1
+        return self.index - int(self.store.first_child[parent_index]) + 1
+
+    @property
+    def vis_details(self):
+        vis_details = self.store.vis_details.get(self.index)
+        if vis_details is None:
+            vis_details = Vis.MonteCarloNodeVisualisationDetails(self)
+            self.store.vis_details[self.index] = vis_details
+        return vis_details
+
+    @property
+    def _ancestor(self):
+        return self.vis_details.ancestor
+
+    @_ancestor.setter
+    def _ancestor(self, value):
+        self.vis_details.ancestor = value
+
+    def add_child_by_move(self, move, state_desc=""):
+        """
+        Adds child node to the node. New node represents given move.
+
+		Args:
+			move:  BaseGameMove object
+
+		Returns:
+			MonteCarloArrayNode object, the added child
+		"""
+        self.store.add_children(self.index, [(move, state_desc)])
+        last_child = self.store.first_child[self.index] + self.store.child_count[self.index] - 1
+        return MonteCarloArrayNode(self.store, last_child)
+
+    def add_children_by_moves(self, moves):
+        """
+        Adds child nodes to the node at once, so that they are stored next to each other.
+
+		Args:
+			moves:  list of tuples (BaseGameMove, state description)
+
+		Returns:
+			None
+		"""
+        self.store.add_children(self.index, moves)
+
+    def has_children(self):
+        """
+		Returns:
+			bool informing if node has any children nodes
+		"""
+        return self.store.child_count[self.index] > 0
+
+    def left(self):
+        """
+        Needed for Improved Walker's Algorithm.
+
+		Returns:
+			MonteCarloArrayNode object, leftmost child or thread of the node
+		"""
+        if self.has_children():
+            return MonteCarloArrayNode(self.store, self.store.first_child[self.index])
+        return self.vis_details.thread
+
+    def right(self):
+        """
+        Needed for Improved Walker's Algorithm.
+
+		Returns:
+			MonteCarloArrayNode object, rightmost child or thread of the node
+		"""
+        if self.has_children():
+            last_child = self.store.first_child[self.index] + self.store.child_count[self.index] - 1
+            return MonteCarloArrayNode(self.store, last_child)
+        return self.vis_details.thread
+
+    def left_sibling(self):
+        """
+        Needed for Improved Walker's Algorithm.
+
+		Returns:
+			MonteCarloArrayNode object, left sibling of the node
+		"""
+        if self.number > 1:
+            return MonteCarloArrayNode(self.store, self.index - 1)
+        return None
+
+    def leftmost_sibling(self):
+        """
+        Needed for Improved Walker's Algorithm.
+
+		Returns:
+			MonteCarloArrayNode object, leftmost sibling of the node
+		"""
+        if self.number > 1:
+            return MonteCarloArrayNode(self.store, self.store.first_child[self.store.parent[self.index]])
+        return None
+
+
+class MonteCarloArrayNodeDetails:
+    """
+    Class is a handle of Monte Carlo Tree Search properties of a node kept in MonteCarloNodeStore.
+    """
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: MonteCarloNodeStore, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def visits_count(self):
+        return int(self.store.visits[self.index])
+
+    @visits_count.setter
+    def visits_count(self, value):
+        self.store.visits[self.index] = value
+
+    @property
+    def visits_count_pre_modified(self):
+        return 0
+
+    @property
+    def win_score(self):
+        return float(self.store.win_score[self.index])
+
+    @win_score.setter
+    def win_score(self, value):
+        self.store.win_score[self.index] = value
+
+    @property
+    def average_prize(self):
+        return float(self.store.average_prize[self.index])
+
+    @average_prize.setter
+    def average_prize(self, value):
+        self.store.average_prize[self.index] = value
+
+    @property
+    def virtual_loss(self):
+        return int(self.store.virtual_loss[self.index])
+
+    @virtual_loss.setter
+    def virtual_loss(self, value):
+        self.store.virtual_loss[self.index] = value
+
+    @property
+    def proven_result(self):
+        return int(self.store.proven_result[self.index])
+
+    @proven_result.setter
+    def proven_result(self, value):
+        self.store.proven_result[self.index] = value
+
+    @property
+    def amaf_visits_count(self):
+        return int(self.store.amaf_visits[self.index])
+
+    @amaf_visits_count.setter
+    def amaf_visits_count(self, value):
+        self.store.amaf_visits[self.index] = value
+
+    @property
+    def amaf_score(self):
+        return float(self.store.amaf_score[self.index])
+
+    @amaf_score.setter
+    def amaf_score(self, value):
+        self.store.amaf_score[self.index] = value
+
+    @property
+    def move_name(self):
+        move = self.store.moves[self.store.move_index[self.index]]
+        return move.description if move else ""
+
+    @property
+    def state_name(self):
+        return self.store.state_names[self.store.move_index[self.index]]
+
+    @state_name.setter
+    def state_name(self, value):
+        self.store.state_names[self.store.move_index[self.index]] = value
+
+    def add_score(self, amount):
+        """
+        Adds given amount to the win score.
+
+		Args:
+			amount:  numeric value
+
+		Returns:
+			None
+		"""
+        store = self.store
+        store.win_score[self.index] += amount
+        store.average_prize[self.index] = store.win_score[self.index] / store.visits[self.index]
+
+    def mark_visit(self, count=1):
+        """
+        Increments counter of visits.
+
+		Args:
+			count:  number of visits, 1 by default
+
+		Returns:
+			None
+		"""
+        self.store.visits[self.index] += count
+
+    def add_statistics(self, visits_count, win_score):
+        """
+        Adds visits and win score gathered elsewhere, e.g. by another search of the same position.
+
+		Args:
+			visits_count:  number of visits to add
+			win_score:  win score to add
+
+		Returns:
+			None
+		"""
+        store = self.store
+        store.visits[self.index] += visits_count
+        store.win_score[self.index] += win_score
+        if store.visits[self.index] > 0:
+            store.average_prize[self.index] = store.win_score[self.index] / store.visits[self.index]
@@ -0,0 +1,151 @@
+
+from uct.algorithm.mc_array_node import MonteCarloArrayNode
+from uct.algorithm.mc_node_store import MonteCarloNodeStore
+from uct.algorithm.mc_tree import MonteCarloTree, TreeData
+from uct.game.base_game_state import BaseGameState
+
+
+class MonteCarloArrayTree(MonteCarloTree):
+    """
+    Class is an alternative MonteCarloTree backend, which keeps nodes in MonteCarloNodeStore arrays instead of
+    separate MonteCarloNode objects. It is meant for long searches that create hundreds of thousands of nodes.
+    Nodes are exposed as MonteCarloArrayNode handles.
+    Indices of removed nodes are not reused. The store is compacted after root moves and after collapsing subtrees,
+    which invalidates handles obtained before.
+    """
+    NODE_SIZE_ESTIMATE = 80
+
+    def __init__(self, game_state: BaseGameState):
+        self.store = MonteCarloNodeStore()
+        root_index = self.store.add_node(MonteCarloNodeStore.NO_NODE, None)
+        self.root = MonteCarloArrayNode(self.store, root_index)
+        self.game_state = game_state.deep_copy() if game_state is not None else None
+        self.data = TreeData()
+        self.virtual_losses_count = 0
+        self.untried_moves = {}
+        self.nodes_count = 1
+        self.nodes_limit = 0
+        self._has_removed_nodes = False
+
+    def get_children_count(self, node: MonteCarloArrayNode):
+        """
+		Args:
+			node:  MonteCarloArrayNode object
+
+		Returns:
+			number of the node's children
+		"""
+        return self.store.child_count[node.index]
+
+    def get_children_statistics(self, node: MonteCarloArrayNode):
+        """
+        Returns views of the store arrays with visit counts and win scores of the node's children. Pending virtual
+        losses are counted as visits.
+
+		Args:
+			node:  MonteCarloArrayNode object
+
+		Returns:
+			tuple of numpy arrays (visits counts, win scores), ordered as node's children
+		"""
+        store = self.store
+        first = store.first_child[node.index]
+        last = first + store.child_count[node.index]
+        if self.virtual_losses_count > 0:
+            return store.visits[first:last] + store.virtual_loss[first:last], store.win_score[first:last]
+        return store.visits[first:last], store.win_score[first:last]
+
+    def get_children_statistics_lists(self, node: MonteCarloArrayNode):
+        """
+		Args:
+			node:  MonteCarloArrayNode object
+
+		Returns:
+			tuple of lists (visits counts, win scores), ordered as node's children
+		"""
+        visits, win_scores = self.get_children_statistics(node)
+        return visits.tolist(), win_scores.tolist()
+
+    def get_children_amaf_statistics(self, node: MonteCarloArrayNode):
+        """
+		Args:
+			node:  MonteCarloArrayNode object
+
+		Returns:
+			tuple of views of the store arrays (AMAF visits counts, AMAF scores), ordered as node's children
+		"""
+        store = self.store
+        first = store.first_child[node.index]
+        last = first + store.child_count[node.index]
+        return store.amaf_visits[first:last], store.amaf_score[first:last]
+
+    def get_children_proven_results(self, node: MonteCarloArrayNode):
+        """
+		Args:
+			node:  MonteCarloArrayNode object
+
+		Returns:
+			view of the store array with proven results of the node's children
+		"""
+        first = self.store.first_child[node.index]
+        return self.store.proven_result[first:first + self.store.child_count[node.index]]
+
+    def get_child_at(self, node: MonteCarloArrayNode, index):
+        """
+		Args:
+			node:  MonteCarloArrayNode object
+			index:  index of the child
+
+		Returns:
+			MonteCarloArrayNode object, child of the node at the given index
+		"""
+        return MonteCarloArrayNode(self.store, self.store.first_child[node.index] + index)
+
+    def reset_vis_data(self):
+        """
+        Resets visualization data of all nodes of the tree. Visualization details are created again on demand.
+
+		Returns:
+			None
+		"""
+        self.store.vis_details.clear()
+
+    def enforce_nodes_limit(self):
+        """
+        Collapses the least visited subtrees if the tree has more nodes than its budget, and compacts the store
+        afterwards. Compacting is postponed while some paths carry virtual losses, as their handles would become
+        invalid.
+
+		Returns:
+			None
+		"""
+        super().enforce_nodes_limit()
+        if self._has_removed_nodes and self.virtual_losses_count == 0:
+            self._compact()
+
+    def _move_root(self, next_root: MonteCarloArrayNode):
+        self.root = next_root
+        self._compact()
+
+    def _detach_children(self, node: MonteCarloArrayNode):
+        self.store.remove_children(node.index)
+        self._has_removed_nodes = True
+
+    def _compact(self):
+        """
+        Replaces the store with a copy of the root's subtree. Untried moves are moved to the new handles.
+
+		Returns:
+			None
+		"""
+        store, new_indices = self.store.compacted(self.root.index)
+        untried_moves = {}
+        for node, moves in self.untried_moves.items():
+            new_index = new_indices[node.index]
+            if new_index != MonteCarloNodeStore.NO_NODE:
+                untried_moves[MonteCarloArrayNode(store, new_index)] = moves
+        self.store = store
+        self.root = MonteCarloArrayNode(store, 0)
+        self.untried_moves = untried_moves
+        self.nodes_count = int(store.size)
+        self._has_removed_nodes = False
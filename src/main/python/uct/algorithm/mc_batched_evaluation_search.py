@@ -0,0 +1,55 @@
+
+from uct.algorithm.mc_simulation_result import MonteCarloSimulationResult
+from uct.algorithm.mc_static_evaluation import evaluate_states
+from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
+
+
+class MonteCarloBatchedEvaluationSearch(MonteCarloTreeSearch):
+    """
+    Class executes Monte Carlo Tree Search without playouts. Every leaf is scored by a static evaluation of its game
+    state instead. Leaves are collected in batches: each selected path carries a virtual loss, so that the following
+    selections of the batch spread across different branches. The whole batch is evaluated at once and backpropagated
+    afterwards. Each evaluated leaf counts as a single iteration.
+    """
+    def _perform_iteration(self):
+        """
+        Selects and expands as many leaves as the evaluation batch size allows, evaluates them together and
+        backpropagates their results. With the iterations limit, the batch does not exceed the remaining iterations.
+        The tree's budget of nodes is enforced before the batch.
+
+		Returns:
+			None
+		"""
+        self.tree.enforce_nodes_limit()
+        batch_size = self.settings.evaluation_batch_size
+        if self.settings.limit_iterations:
+            batch_size = max(1, min(batch_size, self.settings.max_iterations - self.iterations))
+
+        paths = []
+        leaf_states = []
+        leaf_players = []
+        for _ in range(batch_size):
+            path, leaf_state = self._select_leaf_to_explore()
+            self.tree.add_virtual_loss(path)
+            paths.append(path)
+            leaf_states.append(leaf_state)
+            leaf_players.append(leaf_state.current_player)
+            if self._is_root_proven():
+                break
+
+        for path, simulation_result, leaf_player in zip(paths, self._evaluate_states(leaf_states), leaf_players):
+            self.tree.remove_virtual_loss(path)
+            self._backpropagation(path, [simulation_result], leaf_player)
+        self.iterations += len(paths)
+
+    def _evaluate_states(self, leaf_states) -> [MonteCarloSimulationResult]:
+        """
+        Executes 3rd stage of MCTS for the whole batch.
+
+		Args:
+			leaf_states:  list of game states of the selected leaves
+
+		Returns:
+			list of MonteCarloSimulationResult objects, ordered as leaf_states
+		"""
+        return evaluate_states(leaf_states)
@@ -1,10 +1,22 @@
 
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 from main_application.gui_settings import MonteCarloSettings
-from uct.algorithm.mc_tree import MonteCarloTree
+from uct.algorithm.enums import ParallelisationMode, SimulationMode
+from uct.algorithm.mc_batched_evaluation_search import MonteCarloBatchedEvaluationSearch
+from uct.algorithm.mc_leaf_parallel_search import MonteCarloLeafParallelSearch
+from uct.algorithm.mc_root_parallel_search import MonteCarloRootParallelSearch
+from uct.algorithm.mc_search_profiler import append_report
+from uct.algorithm.mc_time_manager import MonteCarloTimeManager
+from uct.algorithm.mc_tree_parallel_search import MonteCarloTreeParallelSearch
+from uct.algorithm.mc_tree_factory import create_tree
 from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
 from uct.game.base_game_move import BaseGameMove
 from uct.game.base_game_state import BaseGameState
 from utils.custom_event import CustomEvent
+from utils.random_utils import RandomStream
 
 
 class MonteCarloGameManager:
@@ -13,17 +25,23 @@ class MonteCarloGameManager:
     """
     def __init__(self, game_state: BaseGameState, settings: MonteCarloSettings):
         self.current_state = game_state
-        self.tree = MonteCarloTree(self.current_state)
         self.settings = settings
-        self.first_move = True
+        self.tree = create_tree(self.current_state, settings)
         self.previous_move_calculated = None
         self.chosen_node = None
         self.iteration_performed = CustomEvent()
+        self.search_profiled = CustomEvent()
+        self.executor = None
+        self.yield_callback = None
+        self.yield_interval_ms = 0
+        self.current_search = None
+        self.time_manager = MonteCarloTimeManager(settings)
+        self.random_stream = RandomStream(settings.random_seed)
 
     def notify_move_performed(self, move: BaseGameMove):
         """
-        Updates tree's nodes after player's move. It this is not the first move, it firstly updates the information
-        after last algorithm's move to keep consistency.
+        Updates tree's nodes after player's move. If the last algorithm's move was not performed on the tree yet,
+        it firstly updates the information after that move to keep consistency.
 
 		Args:
 			move:  BaseGameMove object
@@ -31,13 +49,9 @@ class MonteCarloGameManager:
 		Returns:
 			None        
 		"""
-        if self.first_move:
-            self.first_move = False
-            return
-        else:
-            self.tree.perform_move_on_root(self.previous_move_calculated)
-            self.tree.perform_move_on_root(move)
-            self.previous_move_calculated = None
+        if self.previous_move_calculated is not None:
+            self.perform_previous_move()
+        self.tree.perform_move_on_root(move)
 
     def perform_previous_move(self):
         """
@@ -49,6 +63,20 @@ class MonteCarloGameManager:
         self.tree.perform_move_on_root(self.previous_move_calculated)
         self.previous_move_calculated = None
 
+    def set_yield_callback(self, callback, interval_ms=30):
+        """
+        Sets a function called periodically during calculation of moves, e.g. to process GUI events.
+
+		Args:
+			callback:  function without arguments or None
+			interval_ms:  minimal time between consecutive calls in milliseconds
+
+		Returns:
+			None
+		"""
+        self.yield_callback = callback
+        self.yield_interval_ms = interval_ms
+
     def calculate_next_move(self):
         """
         Calculates algorithm's move with UCT algorithm.
@@ -57,13 +85,114 @@ class MonteCarloGameManager:
 		Returns:
 			calculated move, BaseGameMove object        
 		"""
-        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts = self._create_search(self._get_move_settings())
+        mcts.set_yield_callback(self.yield_callback, self.yield_interval_ms)
         mcts.iteration_performed += self._handle_iteration_performed
-        move, state, best_node = mcts.calculate_next_move()
+        mcts.search_profiled += self._handle_search_profiled
+        self.current_search = mcts
+        try:
+            move, state, best_node = mcts.calculate_next_move()
+        finally:
+            self.current_search = None
         self.chosen_node = best_node
         self.previous_move_calculated = move
         return move
 
+    def ponder(self):
+        """
+        Keeps on searching the tree from the position after the last algorithm's move, while the opponent thinks,
+        until request_stop is called. The part of the tree under the opponent's actual move is reused when the next
+        move is calculated. Pondering with root parallelisation is not supported.
+
+		Returns:
+			None
+		"""
+        if self.previous_move_calculated is not None:
+            self.perform_previous_move()
+        mcts = self._create_search(self.settings)
+        mcts.set_yield_callback(self.yield_callback, self.yield_interval_ms)
+        self.current_search = mcts
+        try:
+            mcts.ponder()
+        finally:
+            self.current_search = None
+
+    def request_stop(self):
+        """
+        Asks the move calculation in progress, if there is any, to finish as soon as possible with the best move
+        found so far. It can be called from another thread than the one calculating the move.
+
+		Returns:
+			None
+		"""
+        search = self.current_search
+        if search:
+            search.request_stop()
+
+    def close(self):
+        """
+        Shuts down worker processes of the parallelised search, if there are any.
+
+		Returns:
+			None
+		"""
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _get_move_settings(self):
+        """
+        With smart stop and the time limit, time of the move is allocated by the time manager. The number of possible
+        moves is taken from the root, if it was expanded before, so that moves are not generated again.
+
+		Returns:
+			MonteCarloSettings object for calculation of the next move
+		"""
+        if not self.settings.smart_stop or self.settings.limit_iterations:
+            return self.settings
+        rc = copy.copy(self.settings)
+        rc.max_time = self.time_manager.get_move_time(self.tree.get_root_moves_count())
+        return rc
+
+    def _create_search(self, settings: MonteCarloSettings):
+        if settings.parallelisation == ParallelisationMode.ROOT:
+            return MonteCarloRootParallelSearch(self.tree, settings, self._get_executor(), self.random_stream)
+        elif settings.parallelisation == ParallelisationMode.TREE:
+            return MonteCarloTreeParallelSearch(self.tree, settings, self._get_executor(), self.random_stream)
+        elif settings.parallelisation == ParallelisationMode.LEAF:
+            return MonteCarloLeafParallelSearch(self.tree, settings, self._get_executor(), self.random_stream)
+        elif settings.simulation_mode == SimulationMode.STATIC_EVALUATION:
+            return MonteCarloBatchedEvaluationSearch(self.tree, settings, self.random_stream)
+        return MonteCarloTreeSearch(self.tree, settings, self.random_stream)
+
+    def _get_executor(self):
+        """
+        Worker processes are started once and reused for the following moves. They are spawned rather than forked,
+        so that they do not inherit the state of the GUI process.
+
+		Returns:
+			ProcessPoolExecutor object
+		"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.settings.workers_count,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return self.executor
+
     def _handle_iteration_performed(self, sender, earg):
         self.iteration_performed.fire(self, earg)
 
+    def _handle_search_profiled(self, sender, earg):
+        """
+        Passes the profiler's report on and appends it to the profile log, if its path is set.
+
+		Args:
+			sender:  MonteCarloTreeSearch object
+			earg:  dict with the report
+
+		Returns:
+			None
+		"""
+        if self.settings.profile_log_path:
+            append_report(self.settings.profile_log_path, earg)
+        self.search_profiled.fire(self, earg)
+
@@ -0,0 +1,54 @@
+
+from concurrent.futures import Executor
+
+from main_application.gui_settings import MonteCarloSettings
+from uct.algorithm.enums import GamePhase
+from uct.algorithm.mc_playout import perform_playouts
+from uct.algorithm.mc_simulation_result import MonteCarloSimulationResult
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
+from uct.game.base_game_state import BaseGameState
+from utils.random_utils import RandomStream
+
+
+class MonteCarloLeafParallelSearch(MonteCarloTreeSearch):
+    """
+    Class executes leaf parallelisation of Monte Carlo Tree Search. The tree is grown by the coordinating thread
+    exactly as in the sequential search, but playouts of every expanded leaf are split among worker processes.
+    Results of all playouts of a leaf are backpropagated at once.
+    """
+    def __init__(self, tree: MonteCarloTree, settings: MonteCarloSettings, executor: Executor,
+                 random_stream: RandomStream = None):
+        super().__init__(tree, settings, random_stream)
+        self.executor = executor
+
+    def _simulation(self, leaf_state: BaseGameState) -> [MonteCarloSimulationResult]:
+        """
+        Executes 3rd stage of MCTS.
+        Splits playouts of the leaf into even chunks, one per worker, and waits for all of them. Every chunk gets its
+        own random stream spawned from the search's stream. Playouts of a leaf that has already ended the game are
+        performed in place.
+
+		Args:
+			leaf_state:  game state of the leaf from which to process random playouts
+
+		Returns:
+			list of MonteCarloSimulationResult objects
+		"""
+        if leaf_state.phase != GamePhase.IN_PROGRESS:
+            return super()._simulation(leaf_state)
+
+        chunks = self._split_playouts()
+        futures = [self.executor.submit(perform_playouts, leaf_state, self.settings, chunk, chunk_stream)
+                   for chunk, chunk_stream in zip(chunks, self.random_stream.spawn(len(chunks)))]
+        return [result for future in futures for result in future.result()]
+
+    def _split_playouts(self):
+        """
+		Returns:
+			list of playouts counts of consecutive chunks, at most one chunk per worker
+		"""
+        playouts_count = self.settings.playouts_per_leaf
+        chunks_count = min(self.settings.workers_count, playouts_count)
+        chunk_size, remainder = divmod(playouts_count, chunks_count)
+        return [chunk_size + 1 if i < remainder else chunk_size for i in range(chunks_count)]
@@ -6,7 +6,9 @@ from uct.algorithm.mc_node_details import MonteCarloNodeDetails
 class MonteCarloNode:
     """
     Class is responsible for storing information about a single node in Monte Carlo tree.
+    Nodes are slotted, as trees hold a lot of them. Visualisation details are created only when the node is laid out.
     """
+    __slots__ = ('id', 'move', 'details', 'children', 'parent', '_vis_details', 'left_most_sibling', 'number')
     _node_counter = 0
 
     def __init__(self):
@@ -18,10 +20,38 @@ class MonteCarloNode:
         self.details = MonteCarloNodeDetails()
         self.children = []
         self.parent = None
-        self.vis_details = Vis.MonteCarloNodeVisualisationDetails(self)
+        self._vis_details = None
         self.left_most_sibling = None
         self.number = 1
 
+    @property
+    def vis_details(self):
+        """
+        Visualisation details of the node, created on the first access one level below the parent's details.
+        """
+        if self._vis_details is None:
+            depth = self.parent.vis_details.y + 1 if self.parent is not None else 0
+            self._vis_details = Vis.MonteCarloNodeVisualisationDetails(self, depth)
+        return self._vis_details
+
+    @property
+    def _ancestor(self):
+        return self.vis_details.ancestor
+
+    @_ancestor.setter
+    def _ancestor(self, value):
+        self.vis_details.ancestor = value
+
+    def reset_vis_details(self):
+        """
+        Drops visualisation details of the node. They are created again on demand.
+
+		Returns:
+			None
+		"""
+        self._vis_details = None
+        self.left_most_sibling = None
+
     def add_child_by_move(self, move, state_desc=""):
         """
         Adds child node to the node. New node represents given move.
@@ -30,15 +60,15 @@ class MonteCarloNode:
 			move:  BaseGameMove object
 
 		Returns:
-			None        
+			MonteCarloNode object, the added child        
 		"""
         child = MonteCarloNode._create_instance(move)
         if state_desc != "":
             child.details.state_name = state_desc
         child.parent = self
-        child.vis_details.y = self.vis_details.y + 1
         self.children.append(child)
         child.number = len(self.children)
+        return child
 
     def add_child_by_node(self, child):
         """
@@ -51,7 +81,6 @@ class MonteCarloNode:
 			None        
 		"""
         child.parent = self
-        child.vis_details.y = self.vis_details.y + 1
         self.children.append(child)
         child.number = len(self.children)
 
@@ -75,12 +104,7 @@ class MonteCarloNode:
         node = MonteCarloNode()
         node.id = MonteCarloNode.generate_next_id()
         node.move = move
-        node.vis_details = Vis.MonteCarloNodeVisualisationDetails(node)
-        node.details = MonteCarloNodeDetails()
-        node.children = []
-        node.parent = None
-        if move:
-            node.details.move_name = move.description
+        node.details = MonteCarloNodeDetails(move)
         return node
 
     @staticmethod
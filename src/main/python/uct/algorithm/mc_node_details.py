@@ -2,14 +2,40 @@
 class MonteCarloNodeDetails:
     """
     Class is responsible for storing information about Monte Carlo Tree Search properties of the node.
+    Proven result of the node is given from the point of view of the player who made the node's move.
     """
-    def __init__(self):
+    __slots__ = ('state_name', '_move', '_move_name', 'visits_count', 'visits_count_pre_modified', 'win_score',
+                 'average_prize', 'virtual_loss', 'proven_result', 'amaf_visits_count', 'amaf_score')
+    NOT_PROVEN = 0
+    PROVEN_WIN = 1
+    PROVEN_LOSS = -1
+
+    def __init__(self, move=None):
         self.state_name = ""
-        self.move_name = ""
+        self._move = move
+        self._move_name = None
         self.visits_count = 0
         self.visits_count_pre_modified = 0
         self.win_score = 0
         self.average_prize = 0
+        self.virtual_loss = 0
+        self.proven_result = MonteCarloNodeDetails.NOT_PROVEN
+        self.amaf_visits_count = 0
+        self.amaf_score = 0
+
+    @property
+    def move_name(self):
+        """
+        Description of the node's move. Unless it was set explicitly, it is read from the move only when requested,
+        e.g. by the visualisation or a serializer.
+        """
+        if self._move_name is not None:
+            return self._move_name
+        return self._move.description if self._move else ""
+
+    @move_name.setter
+    def move_name(self, value):
+        self._move_name = value
 
     def add_score(self, amount):
         """
@@ -24,12 +50,30 @@ class MonteCarloNodeDetails:
         self.win_score = self.win_score + amount
         self.average_prize = self.win_score / self.visits_count
 
-    def mark_visit(self):
+    def mark_visit(self, count=1):
         """
         Increments counter of visits.
 
+		Args:
+			count:  number of visits, 1 by default
+
 		Returns:
 			None        
 		"""
-        self.visits_count = self.visits_count + 1
+        self.visits_count = self.visits_count + count
 
+    def add_statistics(self, visits_count, win_score):
+        """
+        Adds visits and win score gathered elsewhere, e.g. by another search of the same position.
+
+		Args:
+			visits_count:  number of visits to add
+			win_score:  win score to add
+
+		Returns:
+			None
+		"""
+        self.visits_count = self.visits_count + visits_count
+        self.win_score = self.win_score + win_score
+        if self.visits_count > 0:
+            self.average_prize = self.win_score / self.visits_count
@@ -0,0 +1,222 @@
+
+import numpy as np
+
+
+class MonteCarloNodeStore:
+    """
+    Class stores Monte Carlo tree nodes as a structure of arrays instead of separate objects.
+    Node properties are kept in growable numpy arrays indexed by node index. Children of a node always occupy
+    a contiguous block of indices, described by first child index and children count. A block can have room for more
+    children than it holds, so that children added one by one do not move the block each time. Moves and state
+    descriptions are kept in lists indexed by the node's move index.
+    """
+    NO_NODE = -1
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, capacity=_INITIAL_CAPACITY):
+        self.size = 0
+        self.capacity = 0
+        self.visits = np.zeros(0, dtype=np.int32)
+        self.win_score = np.zeros(0, dtype=np.float64)
+        self.average_prize = np.zeros(0, dtype=np.float64)
+        self.virtual_loss = np.zeros(0, dtype=np.int32)
+        self.proven_result = np.zeros(0, dtype=np.int8)
+        self.amaf_visits = np.zeros(0, dtype=np.int32)
+        self.amaf_score = np.zeros(0, dtype=np.float64)
+        self.parent = np.zeros(0, dtype=np.int32)
+        self.first_child = np.zeros(0, dtype=np.int32)
+        self.child_count = np.zeros(0, dtype=np.int32)
+        self.child_capacity = np.zeros(0, dtype=np.int32)
+        self.move_index = np.zeros(0, dtype=np.int32)
+        self.moves = []
+        self.state_names = []
+        self.vis_details = {}
+        self._grow(capacity)
+
+    def add_node(self, parent_index, move, state_name=""):
+        """
+        Appends a single node at the end of the store. It does not register the node as a child of its parent.
+
+		Args:
+			parent_index:  index of the parent node or NO_NODE
+			move:  BaseGameMove object or None for root
+
+		Returns:
+			index of the created node
+		"""
+        if self.size == self.capacity:
+            self._grow(2 * self.capacity)
+        index = self.size
+        self.size += 1
+        self._set_node(index, parent_index, move, state_name)
+        return index
+
+    def add_children(self, parent_index, moves):
+        """
+        Adds children to the node. They are appended to the node's block of children. If the block has no room for
+        them, it is moved to the end of the store beforehand, with room for at least twice as many children.
+        A block of the first children added at once has no spare room.
+
+		Args:
+			parent_index:  index of the parent node
+			moves:  list of tuples (BaseGameMove, state description)
+
+		Returns:
+			None
+		"""
+        if not moves:
+            return
+        count = self.child_count[parent_index]
+        required_capacity = count + len(moves)
+        if count == 0:
+            self._allocate_children(parent_index, required_capacity)
+        elif required_capacity > self.child_capacity[parent_index]:
+            self._relocate_children(parent_index, max(required_capacity, 2 * self.child_capacity[parent_index]))
+        index = self.first_child[parent_index] + count
+        for move, state_name in moves:
+            self._set_node(index, parent_index, move, state_name)
+            index += 1
+        self.child_count[parent_index] = required_capacity
+
+    def children_range(self, index):
+        """
+		Args:
+			index:  node index
+
+		Returns:
+			range of indices of the node's children
+		"""
+        first = self.first_child[index]
+        return range(first, first + self.child_count[index])
+
+    def remove_children(self, index):
+        """
+        Detaches all descendants of the node. Their indices stay occupied until the store is compacted.
+
+		Args:
+			index:  node index
+
+		Returns:
+			None
+		"""
+        self.first_child[index] = MonteCarloNodeStore.NO_NODE
+        self.child_count[index] = 0
+        self.child_capacity[index] = 0
+
+    def compacted(self, root_index):
+        """
+        Copies the subtree of the given node into a new store without unused indices. Every block of children is
+        copied at once. Visualization details are not copied.
+
+		Args:
+			root_index:  index of the node which becomes the root of the new store
+
+		Returns:
+			tuple of (MonteCarloNodeStore, numpy array) - the new store and new indices of nodes of this store,
+			NO_NODE for nodes which were not copied
+		"""
+        rc = MonteCarloNodeStore()
+        new_indices = np.full(self.size, MonteCarloNodeStore.NO_NODE, dtype=np.int32)
+        new_root_index = rc.add_node(MonteCarloNodeStore.NO_NODE, self.moves[self.move_index[root_index]],
+                                     self.state_names[self.move_index[root_index]])
+        rc._copy_statistics(self, root_index, new_root_index, 1)
+        new_indices[root_index] = new_root_index
+        nodes_to_copy = [(root_index, new_root_index)]
+        while nodes_to_copy:
+            index, new_index = nodes_to_copy.pop()
+            count = self.child_count[index]
+            if count == 0:
+                continue
+            first = self.first_child[index]
+            move_indices = self.move_index[first:first + count]
+            rc.add_children(new_index, [(self.moves[i], self.state_names[i]) for i in move_indices])
+            new_first = rc.first_child[new_index]
+            rc._copy_statistics(self, first, new_first, count)
+            new_indices[first:first + count] = np.arange(new_first, new_first + count)
+            nodes_to_copy.extend(zip(range(first, first + count), range(new_first, new_first + count)))
+        return rc, new_indices
+
+    def get_nbytes(self):
+        """
+		Returns:
+			number of bytes used by the arrays and the per-node lists of the store
+		"""
+        lists_size = 8 * (len(self.moves) + len(self.state_names))
+        return sum(array.nbytes for array in self._get_arrays()) + lists_size
+
+    def _set_node(self, index, parent_index, move, state_name):
+        self.visits[index] = 0
+        self.win_score[index] = 0
+        self.average_prize[index] = 0
+        self.virtual_loss[index] = 0
+        self.proven_result[index] = 0
+        self.amaf_visits[index] = 0
+        self.amaf_score[index] = 0
+        self.parent[index] = parent_index
+        self.first_child[index] = MonteCarloNodeStore.NO_NODE
+        self.child_count[index] = 0
+        self.child_capacity[index] = 0
+        self.move_index[index] = len(self.moves)
+        self.moves.append(move)
+        self.state_names.append(state_name)
+
+    def _allocate_children(self, parent_index, capacity):
+        required = self.size + capacity
+        if required > self.capacity:
+            self._grow(max(2 * self.capacity, required))
+        self.parent[self.size:required] = MonteCarloNodeStore.NO_NODE
+        self.first_child[parent_index] = self.size
+        self.child_capacity[parent_index] = capacity
+        self.size = required
+
+    def _relocate_children(self, parent_index, capacity):
+        old_first = self.first_child[parent_index]
+        count = self.child_count[parent_index]
+        self._allocate_children(parent_index, capacity)
+        new_first = self.first_child[parent_index]
+        for array in self._get_arrays():
+            array[new_first:new_first + count] = array[old_first:old_first + count]
+        for offset in range(count):
+            new_index = new_first + offset
+            for grandchild in self.children_range(new_index):
+                self.parent[grandchild] = new_index
+            vis_details = self.vis_details.pop(old_first + offset, None)
+            if vis_details:
+                self.vis_details[new_index] = vis_details
+        self.parent[old_first:old_first + count] = MonteCarloNodeStore.NO_NODE
+
+    def _copy_statistics(self, source, source_first, first, count):
+        last = first + count
+        source_last = source_first + count
+        self.visits[first:last] = source.visits[source_first:source_last]
+        self.win_score[first:last] = source.win_score[source_first:source_last]
+        self.average_prize[first:last] = source.average_prize[source_first:source_last]
+        self.virtual_loss[first:last] = source.virtual_loss[source_first:source_last]
+        self.proven_result[first:last] = source.proven_result[source_first:source_last]
+        self.amaf_visits[first:last] = source.amaf_visits[source_first:source_last]
+        self.amaf_score[first:last] = source.amaf_score[source_first:source_last]
+
+    def _get_arrays(self):
+        return (self.visits, self.win_score, self.average_prize, self.virtual_loss, self.proven_result,
+                self.amaf_visits, self.amaf_score, self.parent, self.first_child, self.child_count, self.child_capacity,
+                self.move_index)
+
+    def _grow(self, capacity):
+        self.visits = self._resized(self.visits, capacity)
+        self.win_score = self._resized(self.win_score, capacity)
+        self.average_prize = self._resized(self.average_prize, capacity)
+        self.virtual_loss = self._resized(self.virtual_loss, capacity)
+        self.proven_result = self._resized(self.proven_result, capacity)
+        self.amaf_visits = self._resized(self.amaf_visits, capacity)
+        self.amaf_score = self._resized(self.amaf_score, capacity)
+        self.parent = self._resized(self.parent, capacity)
+        self.first_child = self._resized(self.first_child, capacity)
+        self.child_count = self._resized(self.child_count, capacity)
+        self.child_capacity = self._resized(self.child_capacity, capacity)
+        self.move_index = self._resized(self.move_index, capacity)
+        self.capacity = capacity
+
+    def _resized(self, array, capacity):
+        rc = np.zeros(capacity, dtype=array.dtype)
+        rc[:self.size] = array[:self.size]
+        return rc
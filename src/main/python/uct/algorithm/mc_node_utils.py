@@ -1,14 +1,15 @@
 
-import utils.random_utils as RandomUtils
 from uct.algorithm.mc_node import MonteCarloNode
+from utils.random_utils import RandomStream
 
 
-def get_random_child(node: MonteCarloNode):
+def get_random_child(node: MonteCarloNode, random_stream: RandomStream):
     """
     Returns random child of the node. Exception is raised if node has no children.
 
 		Args:
 			node:  MonteCarloNode object
+			random_stream:  RandomStream object of the search
 
 		Returns:
 			MonteCarloNode object, random child of the given node    
@@ -16,7 +17,7 @@ def get_random_child(node: MonteCarloNode):
     if not node.has_children():
         raise Exception("Node does not have any child nodes")
     else:
-        child_index = RandomUtils.get_random_int(0, len(node.children))
+        child_index = random_stream.get_random_int(0, len(node.children))
         return node.children[child_index]
 
 
@@ -35,3 +36,19 @@ def get_child_with_max_score(node: MonteCarloNode):
     else:
         return max(node.children, key=lambda n: n.details.average_prize)
 
+
+def get_child_with_max_visits(node: MonteCarloNode):
+    """
+    Returns the most visited child. Exception is raised if node has no children.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			MonteCarloNode object, child with biggest visits count
+		"""
+    if not node.has_children():
+        raise Exception("Node does not have any child nodes")
+    else:
+        return max(node.children, key=lambda n: n.details.visits_count)
+
@@ -0,0 +1,53 @@
+
+import uct.algorithm.enums as Enums
+from main_application.gui_settings import MonteCarloSettings
+from uct.algorithm.mc_simulation_result import MonteCarloSimulationResult
+from uct.game.base_game_state import BaseGameState
+from utils.random_utils import RandomStream
+
+
+def perform_playout(state: BaseGameState, settings: MonteCarloSettings,
+                    random_stream: RandomStream) -> MonteCarloSimulationResult:
+    """
+    Performs random moves on the given state until the game ends or the moves limit is reached. The function does not
+    depend on the tree, so it can be executed in a worker process. Performed moves are recorded for RAVE.
+
+		Args:
+			state:  BaseGameState object, it is modified by the playout
+			settings:  MonteCarloSettings object
+			random_stream:  RandomStream object choosing the moves
+
+		Returns:
+			MonteCarloSimulationResult object
+	"""
+    tmp_phase = state.phase
+    moves_counter = 0
+    moves = [] if settings.use_rave else None
+    while tmp_phase == Enums.GamePhase.IN_PROGRESS:
+        move = state.perform_random_move(random_stream)
+        if moves is not None:
+            moves.append(move)
+        tmp_phase = state.phase
+        moves_counter += 1
+        if settings.limit_moves and moves_counter >= settings.max_moves_per_iteration:
+            break
+    return MonteCarloSimulationResult(state, moves, moves_count=moves_counter)
+
+
+def perform_playouts(state: BaseGameState, settings: MonteCarloSettings, count, random_stream: RandomStream):
+    """
+    Performs the given number of playouts from the same state. All playouts but the last one are performed on copies
+    of the state.
+
+		Args:
+			state:  BaseGameState object, it is modified by the last playout
+			settings:  MonteCarloSettings object
+			count:  number of playouts
+			random_stream:  RandomStream object choosing the moves
+
+		Returns:
+			list of MonteCarloSimulationResult objects
+	"""
+    results = [perform_playout(state.deep_copy(), settings, random_stream) for _ in range(count - 1)]
+    results.append(perform_playout(state, settings, random_stream))
+    return results
@@ -0,0 +1,104 @@
+
+import copy
+from concurrent.futures import Executor, as_completed
+
+from main_application.gui_settings import MonteCarloSettings
+import uct.algorithm.mc_node_utils as NodeUtils
+from uct.algorithm.enums import ParallelisationMode
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.algorithm.mc_tree_factory import create_tree
+from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
+from uct.game.base_game_state import BaseGameState
+from utils.random_utils import RandomStream
+
+
+class MonteCarloRootParallelSearch(MonteCarloTreeSearch):
+    """
+    Class executes root parallelisation of Monte Carlo Tree Search. Every worker process grows its own independent
+    tree from the same game state with the same iterations or time limit. Afterwards statistics of the root's children
+    are merged by move into the tree's root, from which the most visited move is chosen.
+    """
+    def __init__(self, tree: MonteCarloTree, settings: MonteCarloSettings, executor: Executor,
+                 random_stream: RandomStream = None):
+        super().__init__(tree, settings, random_stream)
+        self.executor = executor
+
+    def _calculate_next_move(self):
+        """
+        Runs a search in each worker process and merges their results. Progress is reported after each worker
+        finishes. When a stop is requested, searches that have not finished yet are abandoned, as long as at least
+        one result is merged.
+
+		Returns:
+			tuple of (BaseGameMove, BaseGameState, MonteCarloNode) of the chosen move
+		"""
+        root_state = self._retrieve_node_game_state(self.tree.root)
+        workers_count = self.settings.workers_count
+        futures = [self.executor.submit(search_independent_tree, root_state, self.settings, worker_stream)
+                   for worker_stream in self.random_stream.spawn(workers_count)]
+        for finished_count, future in enumerate(as_completed(futures), 1):
+            iterations, root_children_statistics = future.result()
+            self._merge_root_children_statistics(root_children_statistics)
+            self.iterations += iterations
+            self.iteration_performed.fire(self, finished_count / workers_count)
+            self._yield()
+            if self.stop_requested:
+                for pending_future in futures:
+                    pending_future.cancel()
+                self.iteration_performed.fire(self, 1)
+                break
+        return self._select_result_node()
+
+    def _get_best_child(self, node):
+        """
+        Visits merged from all trees decide, as a move favoured by one tree only gets few visits from the others.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			MonteCarloNode object, child with the biggest merged visits count
+		"""
+        return NodeUtils.get_child_with_max_visits(node)
+
+    def _merge_root_children_statistics(self, root_children_statistics):
+        """
+        Adds statistics of the root's children of one worker's tree to the matching children of the tree's root.
+        Children for moves absent in the tree are created.
+
+		Args:
+			root_children_statistics:  list of tuples (move, state name, visits count, win score)
+
+		Returns:
+			None
+		"""
+        root = self.tree.root
+        for move, state_name, visits_count, win_score in root_children_statistics:
+            child = next((child for child in root.children if move.move_equal(child.move)), None)
+            if child is None:
+                child = root.add_child_by_move(move, state_desc=state_name)
+                self.tree.nodes_count += 1
+            child.details.add_statistics(visits_count, win_score)
+            root.details.add_statistics(visits_count, 0)
+
+
+def search_independent_tree(game_state: BaseGameState, settings: MonteCarloSettings, random_stream: RandomStream):
+    """
+    Grows a new tree from the given game state in a worker process.
+
+		Args:
+			game_state:  BaseGameState object of the root
+			settings:  MonteCarloSettings object
+			random_stream:  RandomStream object of the worker
+
+		Returns:
+			tuple of (iterations count, list of tuples (move, state name, visits count, win score) of root's children)
+	"""
+    worker_settings = copy.copy(settings)
+    worker_settings.parallelisation = ParallelisationMode.NONE
+    tree = create_tree(game_state, worker_settings)
+    mcts = MonteCarloTreeSearch(tree, worker_settings, random_stream)
+    mcts.calculate_next_move()
+    root_children_statistics = [(child.move, child.details.state_name, child.details.visits_count,
+                                 child.details.win_score) for child in tree.root.children]
+    return mcts.iterations, root_children_statistics
@@ -0,0 +1,131 @@
+
+import json
+import time
+from functools import wraps
+
+
+class MonteCarloSearchProfiler:
+    """
+    Class measures where the time of a search goes. It accumulates wall time and calls count of every phase of the
+    search, lengths of playouts, depths of game states reconstructed by replaying moves from the root and the number
+    of nodes created by expansions.
+    Phases are measured by wrapping methods of the search instance, so a search without a profiler runs its methods
+    untouched. Phases may be nested, e.g. reconstruction of the root's state is a part of selection.
+    """
+    PROFILED_METHODS = {
+        '_selection': 'selection',
+        '_expansion': 'expansion',
+        '_expansion_lazy': 'expansion',
+        '_retrieve_node_game_state': 'reconstruction',
+        '_simulation': 'simulation',
+        '_evaluate_states': 'simulation',
+        '_backpropagation': 'backpropagation',
+        '_yield': 'yield',
+    }
+
+    def __init__(self, search):
+        self.search = search
+        for method_name, phase in MonteCarloSearchProfiler.PROFILED_METHODS.items():
+            method = getattr(search, method_name, None)
+            if method is not None:
+                setattr(search, method_name, self._wrap(method, phase))
+        self.start()
+
+    def start(self):
+        """
+        Clears statistics before a new calculation of a move.
+
+		Returns:
+			None
+		"""
+        self.phase_times = {}
+        self.phase_calls = {}
+        self.playouts_count = 0
+        self.playout_moves_count = 0
+        self.max_playout_length = 0
+        self.replayed_moves_count = 0
+        self.max_replay_depth = 0
+        self.nodes_created = 0
+        self._start_time = time.perf_counter()
+        self._start_iterations = self.search.iterations
+
+    def get_report(self):
+        """
+		Returns:
+			dict with statistics gathered since start, which can be serialised to JSON
+		"""
+        return {
+            'iterations': self.search.iterations - self._start_iterations,
+            'time': time.perf_counter() - self._start_time,
+            'phases': {phase: {'time': phase_time, 'calls': self.phase_calls[phase]}
+                       for phase, phase_time in self.phase_times.items()},
+            'playouts': {
+                'count': self.playouts_count,
+                'moves': self.playout_moves_count,
+                'max_length': self.max_playout_length,
+            },
+            'reconstruction': {
+                'replayed_moves': self.replayed_moves_count,
+                'max_depth': self.max_replay_depth,
+            },
+            'nodes_created': self.nodes_created,
+            'tree_nodes': self.search.tree.nodes_count,
+        }
+
+    def _wrap(self, method, phase):
+        """
+		Args:
+			method:  bound method of the search
+			phase:  name of the phase the method belongs to
+
+		Returns:
+			function calling the method and recording its time and phase specific statistics
+		"""
+        tree = self.search.tree
+
+        @wraps(method)
+        def profiled_method(*args):
+            nodes_count = tree.nodes_count
+            start_time = time.perf_counter()
+            rc = method(*args)
+            self.phase_times[phase] = self.phase_times.get(phase, 0) + time.perf_counter() - start_time
+            self.phase_calls[phase] = self.phase_calls.get(phase, 0) + 1
+            if phase == 'expansion':
+                self.nodes_created += tree.nodes_count - nodes_count
+            elif phase == 'simulation':
+                self._record_playouts(rc)
+            elif phase == 'reconstruction':
+                self._record_reconstruction(args[0])
+            return rc
+
+        return profiled_method
+
+    def _record_playouts(self, simulation_results):
+        for simulation_result in simulation_results:
+            self.playouts_count += 1
+            self.playout_moves_count += simulation_result.moves_count
+            self.max_playout_length = max(self.max_playout_length, simulation_result.moves_count)
+
+    def _record_reconstruction(self, node):
+        depth = 0
+        tmp_node = node
+        while tmp_node.parent is not None:
+            depth += 1
+            tmp_node = tmp_node.parent
+        self.replayed_moves_count += depth
+        self.max_replay_depth = max(self.max_replay_depth, depth)
+
+
+def append_report(path, report):
+    """
+    Appends the report as a single line to a JSON lines file.
+
+		Args:
+			path:  path of the file
+			report:  dict returned by MonteCarloSearchProfiler.get_report
+
+		Returns:
+			None
+	"""
+    with open(path, 'a') as file:
+        file.write(json.dumps(report) + '\n')
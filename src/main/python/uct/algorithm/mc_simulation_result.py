@@ -4,12 +4,18 @@ from uct.game.base_game_state import BaseGameState
 
 class MonteCarloSimulationResult:
     """
-    Class is responsible for storing the rewards from the game.
+    Class is responsible for storing the rewards from the game, and optionally the moves performed by the playout.
+    Rewards are taken from the given scores of players 1 and 2, if the state was already evaluated.
     """
-    def __init__(self, tmp_state: BaseGameState):
+    def __init__(self, tmp_state: BaseGameState, moves=None, win_scores=None, moves_count=0):
         self.phase = tmp_state.phase
-        self.player1_reward = tmp_state.get_win_score(1)
-        self.player2_reward = tmp_state.get_win_score(2)
+        self.moves = moves if moves is not None else []
+        self.moves_count = moves_count
+        if win_scores is None:
+            self.player1_reward = tmp_state.get_win_score(1)
+            self.player2_reward = tmp_state.get_win_score(2)
+        else:
+            self.player1_reward, self.player2_reward = win_scores
 
     def get_reward(self, leaf_player):
         """
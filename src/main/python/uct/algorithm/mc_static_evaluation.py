@@ -0,0 +1,18 @@
+
+from uct.algorithm.mc_simulation_result import MonteCarloSimulationResult
+
+
+def evaluate_states(states) -> [MonteCarloSimulationResult]:
+    """
+    Evaluates the given states statically, without any playouts, in a single batch. Scores are calculated at once for
+    all states by evaluate_win_scores of their class.
+
+		Args:
+			states:  non-empty list of BaseGameState objects of the same class
+
+		Returns:
+			list of MonteCarloSimulationResult objects, ordered as states
+	"""
+    win_scores = type(states[0]).evaluate_win_scores(states)
+    return [MonteCarloSimulationResult(state, win_scores=(float(player1_score), float(player2_score)))
+            for state, (player1_score, player2_score) in zip(states, win_scores)]
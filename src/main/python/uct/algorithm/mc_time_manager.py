@@ -0,0 +1,47 @@
+
+from main_application.gui_settings import MonteCarloSettings
+
+
+class MonteCarloTimeManager:
+    """
+    Class allocates time for the moves of a single game from the game's budget. Every move adds NOMINAL_TIME_FRACTION
+    of the time limit of the settings to the budget, while the time limit stays the hard cap of a single move.
+    Positions with more possible moves than the average of the game so far, like sharp middlegame positions, get
+    proportionally more than the nominal time, and positions with fewer moves, like endgames, get less. Time saved on
+    simple positions stays in the budget for the harder ones, and no move gets more than is left in the budget, so
+    the whole game does not take longer than its budget.
+    """
+    NOMINAL_TIME_FRACTION = 0.5
+    MIN_TIME_FACTOR = 0.5
+    MAX_TIME_FACTOR = 2
+
+    def __init__(self, settings: MonteCarloSettings):
+        self.settings = settings
+        self.positions_count = 0
+        self.moves_count_sum = 0
+        self.game_budget = 0
+        self.allocated_time = 0
+
+    def get_move_time(self, moves_count):
+        """
+        Allocates time for the move in a position with the given number of possible moves and remembers the number.
+        A position with unknown number of moves gets the nominal time.
+
+		Args:
+			moves_count:  number of possible moves in the position to move from, None if it is not known
+
+		Returns:
+			time for the move in milliseconds, between MIN_TIME_FACTOR of the nominal time and the time limit
+		"""
+        nominal_time = self.NOMINAL_TIME_FRACTION * self.settings.max_time
+        self.game_budget += nominal_time
+        time_factor = 1
+        if moves_count:
+            self.positions_count += 1
+            self.moves_count_sum += moves_count
+            average_moves_count = self.moves_count_sum / self.positions_count
+            time_factor = min(max(moves_count / average_moves_count, self.MIN_TIME_FACTOR), self.MAX_TIME_FACTOR)
+        move_time = min(time_factor * nominal_time, self.game_budget - self.allocated_time, self.settings.max_time)
+        move_time = max(move_time, self.MIN_TIME_FACTOR * nominal_time)
+        self.allocated_time += move_time
+        return move_time
@@ -0,0 +1,197 @@
+
+import numpy as np
+
+from uct.algorithm.mc_node import MonteCarloNode
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.game.base_game_move import BaseGameMove
+from uct.game.base_game_state import BaseGameState
+
+
+class MonteCarloTranspositionTree(MonteCarloTree):
+    """
+    Class is a MonteCarloTree which shares nodes of identical positions reached by different sequences of moves,
+    turning the tree into a directed acyclic graph.
+    The first node created for a position is its canonical node. It keeps statistics of all visits of the position
+    and the only expanded subtree. Every other node of the same position becomes a transposition: it stays a leaf,
+    keeps its own move and statistics of its edge, and refers to the canonical node. The search steps from the
+    transposition into the canonical node and continues there.
+    Transpositions are resolved lazily, when a node is entered for the first time, so that the position hash is
+    calculated only on the game state the search already has.
+    """
+    NODE_SIZE_ESTIMATE = 700
+
+    def __init__(self, game_state: BaseGameState):
+        super().__init__(game_state)
+        self.table = {game_state.get_position_hash(): self.root}
+        self.transpositions = {}
+
+    def enter_node(self, path, node_state: BaseGameState):
+        """
+        Resolves a transposition of the entered node, if it was not visited before. Entering a transposition appends
+        its canonical node to the path, unless the canonical node is already on the path (the position repeats).
+
+		Args:
+			path:  list of MonteCarloNode objects from the root to the entered node
+			node_state:  game state of the entered node
+
+		Returns:
+			MonteCarloNode object, node from which the search continues
+		"""
+        node = path[-1]
+        canonical = self.transpositions.get(node)
+        if canonical is None and node.details.visits_count == 0 and not node.has_children():
+            canonical = self._resolve_transposition(node, node_state, path)
+        if canonical is None or canonical in path:
+            return node
+        path.append(canonical)
+        return canonical
+
+    def is_transposition(self, node: MonteCarloNode):
+        """
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			bool informing if the node refers to a canonical node of the same position
+		"""
+        return node in self.transpositions
+
+    def get_children_statistics(self, node: MonteCarloNode):
+        """
+        Gathers statistics of the node's children for UCT. Visits are counted per edge, i.e. by the children
+        themselves, so that exploration of the node's moves is not affected by visits that came from other parents.
+        Win rates of transpositions are taken from their canonical nodes, which know more about the position. If the
+        move of the canonical node was made by the other player, e.g. after an extra move, its win rate is taken from
+        the other player's point of view. Rewards of both players add up to 1.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			tuple of numpy arrays (visits counts, win scores), ordered as node's children
+		"""
+        visits, win_scores = super().get_children_statistics(node)
+        self._take_win_scores_from_canonical_nodes(node, win_scores)
+        return visits, win_scores
+
+    def get_children_statistics_lists(self, node: MonteCarloNode):
+        """
+        Gathers the same statistics as 'get_children_statistics' into lists.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			tuple of lists (visits counts, win scores), ordered as node's children
+		"""
+        visits, win_scores = super().get_children_statistics_lists(node)
+        self._take_win_scores_from_canonical_nodes(node, win_scores)
+        return visits, win_scores
+
+    def _take_win_scores_from_canonical_nodes(self, node: MonteCarloNode, win_scores):
+        for index, child in enumerate(node.children):
+            canonical = self.transpositions.get(child)
+            if canonical is not None and canonical.details.visits_count > 0:
+                win_rate = canonical.details.win_score / canonical.details.visits_count
+                if canonical.move.player != child.move.player:
+                    win_rate = 1 - win_rate
+                win_scores[index] = child.details.visits_count * win_rate
+
+    def get_children_proven_results(self, node: MonteCarloNode):
+        """
+        Proven results of transpositions are taken from their canonical nodes. The result is reversed if the move of
+        the canonical node was made by the other player, e.g. when the game ended with an extra move.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			numpy array of proven results of the node's children, ordered as node's children
+		"""
+        return np.fromiter((self._get_proven_result(child) for child in node.children), dtype=np.int8,
+                           count=len(node.children))
+
+    def _get_proven_result(self, node: MonteCarloNode):
+        canonical = self.transpositions.get(node)
+        if canonical is None:
+            return node.details.proven_result
+        if canonical.move.player != node.move.player:
+            return -canonical.details.proven_result
+        return canonical.details.proven_result
+
+    def get_visualisation_tree(self):
+        """
+		Returns:
+			MonteCarloTree object, copy of the graph unfolded into a tree
+		"""
+        return self.create_snapshot()
+
+    def create_snapshot(self):
+        """
+        Copies the nodes of the graph into a tree. Subtrees of canonical nodes are copied under each of their
+        transpositions, except for transpositions to positions repeated on their own path.
+
+		Returns:
+			MonteCarloTree object with MonteCarloNode nodes
+		"""
+        snapshot_root = MonteCarloTree._copy_node(self.root)
+        nodes_to_copy = [(self.root, snapshot_root, (self.root,))]
+        while nodes_to_copy:
+            node, node_copy, path = nodes_to_copy.pop()
+            for child in node.children:
+                child_copy = MonteCarloTree._copy_node(child)
+                node_copy.add_child_by_node(child_copy)
+                canonical = self.transpositions.get(child, child)
+                if canonical not in path:
+                    nodes_to_copy.append((canonical, child_copy, path + (canonical,)))
+        return MonteCarloTree(root=snapshot_root)
+
+    def _get_next_root(self, move: BaseGameMove):
+        """
+        If the node with the move is a transposition, the root is moved further to its canonical node, which holds
+        the subtree of the position.
+
+		Args:
+			move:  BaseGameMove object with move to be performed
+
+		Returns:
+			MonteCarloNode object, node of the position after the move
+		"""
+        next_root = super()._get_next_root(move)
+        return self.transpositions.get(next_root, next_root)
+
+    def _prune_references(self, is_alive):
+        """
+        Forgets nodes which are no longer part of the tree. Transpositions to canonical nodes that were removed become
+        ordinary leaves.
+
+		Args:
+			is_alive:  function telling if the given node is still part of the tree
+
+		Returns:
+			None
+		"""
+        super()._prune_references(is_alive)
+        self.table = {position_hash: node for position_hash, node in self.table.items() if is_alive(node)}
+        self.transpositions = {node: canonical for node, canonical in self.transpositions.items()
+                               if is_alive(node) and is_alive(canonical)}
+
+    def _resolve_transposition(self, node: MonteCarloNode, node_state: BaseGameState, path):
+        """
+        Registers the node as the canonical node of its position, or marks it as a transposition if the position
+        already has a canonical node.
+
+		Args:
+			node:  MonteCarloNode object, not visited yet
+			node_state:  game state of the node
+			path:  list of MonteCarloNode objects from the root to the node
+
+		Returns:
+			canonical MonteCarloNode object, or None if the node is canonical itself
+		"""
+        position_hash = node_state.get_position_hash()
+        canonical = self.table.setdefault(position_hash, node)
+        if canonical is node or canonical in path:
+            return None
+        self.transpositions[node] = canonical
+        return canonical
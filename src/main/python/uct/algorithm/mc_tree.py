@@ -1,4 +1,6 @@
 
+import numpy as np
+
 from uct.algorithm.mc_node import MonteCarloNode
 from uct.game.base_game_move import BaseGameMove
 from uct.game.base_game_state import BaseGameState
@@ -7,15 +9,25 @@ from uct.game.base_game_state import BaseGameState
 class MonteCarloTree:
     """
     Class stores the information of the root of the Monte Carlo tree and about game state, and visualization data.
+    The tree keeps its own copy of the root's game state, which follows the moves performed on the root. Thanks to
+    that the tree can be searched while the game itself is modified, e.g. while the opponent makes a move.
+    The tree can be given a budget of nodes. Once it is exceeded, the least visited subtrees are collapsed.
     """
+    NODE_SIZE_ESTIMATE = 600
+    COLLAPSE_TARGET_FRACTION = 0.75
+
     def __init__(self, game_state: BaseGameState = None, root: MonteCarloNode = None):
         if game_state is not None:
             self.root = MonteCarloNode.create_root()
-            self.game_state = game_state
+            self.game_state = game_state.deep_copy()
         else:
             self.game_state = None
             self.root = root
         self.data = TreeData()
+        self.virtual_losses_count = 0
+        self.untried_moves = {}
+        self.nodes_count = 1
+        self.nodes_limit = 0
 
     def retrieve_node_game_state(self, node: MonteCarloNode):
         """
@@ -38,10 +50,169 @@ class MonteCarloTree:
         rc.apply_moves(moves[::-1])
         return rc
 
+    def get_children_count(self, node: MonteCarloNode):
+        """
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			number of the node's children
+		"""
+        return len(node.children)
+
+    def get_root_moves_count(self):
+        """
+		Returns:
+			number of possible moves of the root, children and untried moves, None if the root was not expanded yet
+		"""
+        untried_moves = self.untried_moves.get(self.root, ())
+        if not self.root.has_children() and not untried_moves:
+            return None
+        return self.get_children_count(self.root) + len(untried_moves)
+
+    def get_children_statistics(self, node: MonteCarloNode):
+        """
+        Gathers visit counts and win scores of the node's children into contiguous arrays. Pending virtual losses
+        are counted as visits.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			tuple of numpy arrays (visits counts, win scores), ordered as node's children
+		"""
+        children = node.children
+        count = len(children)
+        if self.virtual_losses_count > 0:
+            visits = np.fromiter((child.details.visits_count + child.details.virtual_loss for child in children),
+                                 dtype=np.float64, count=count)
+        else:
+            visits = np.fromiter((child.details.visits_count for child in children), dtype=np.float64, count=count)
+        win_scores = np.fromiter((child.details.win_score for child in children), dtype=np.float64, count=count)
+        return visits, win_scores
+
+    def get_children_statistics_lists(self, node: MonteCarloNode):
+        """
+        Gathers the same statistics as 'get_children_statistics' into lists, which are cheaper for few children.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			tuple of lists (visits counts, win scores), ordered as node's children
+		"""
+        children = node.children
+        if self.virtual_losses_count > 0:
+            visits = [child.details.visits_count + child.details.virtual_loss for child in children]
+        else:
+            visits = [child.details.visits_count for child in children]
+        return visits, [child.details.win_score for child in children]
+
+    def get_children_amaf_statistics(self, node: MonteCarloNode):
+        """
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			tuple of numpy arrays (AMAF visits counts, AMAF scores), ordered as node's children
+		"""
+        children = node.children
+        count = len(children)
+        amaf_visits = np.fromiter((child.details.amaf_visits_count for child in children), dtype=np.float64,
+                                  count=count)
+        amaf_scores = np.fromiter((child.details.amaf_score for child in children), dtype=np.float64, count=count)
+        return amaf_visits, amaf_scores
+
+    def get_children_proven_results(self, node: MonteCarloNode):
+        """
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			numpy array of proven results of the node's children, ordered as node's children
+		"""
+        return np.fromiter((child.details.proven_result for child in node.children), dtype=np.int8,
+                           count=len(node.children))
+
+    def get_child_at(self, node: MonteCarloNode, index):
+        """
+		Args:
+			node:  MonteCarloNode object
+			index:  index of the child
+
+		Returns:
+			MonteCarloNode object, child of the node at the given index
+		"""
+        return node.children[index]
+
+    def enter_node(self, path, node_state: BaseGameState):
+        """
+        Called by the search when it steps into the last node of the path. The base tree does not share nodes, so
+        the search simply continues from that node.
+
+		Args:
+			path:  list of MonteCarloNode objects from the root to the entered node
+			node_state:  game state of the entered node
+
+		Returns:
+			MonteCarloNode object, node from which the search continues
+		"""
+        return path[-1]
+
+    def is_transposition(self, node: MonteCarloNode):
+        """
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			bool informing if the node only refers to another node of the same position, so it must not be expanded
+		"""
+        return False
+
+    def get_visualisation_tree(self):
+        """
+		Returns:
+			MonteCarloTree object which can be drawn by the visualisation
+		"""
+        return self
+
+    def add_virtual_loss(self, path):
+        """
+        Marks the path from the root to the leaf as visited by a playout, which result is not known yet. Such visits
+        lower UCT values of the nodes until the result is backpropagated, so that concurrent selections spread across
+        different branches.
+
+		Args:
+			path:  list of MonteCarloNode objects from the root to the leaf
+
+		Returns:
+			None
+		"""
+        self._change_virtual_loss(path, 1)
+        self.virtual_losses_count += 1
+
+    def remove_virtual_loss(self, path):
+        """
+        Reverts add_virtual_loss for the path.
+
+		Args:
+			path:  list of MonteCarloNode objects from the root to the leaf
+
+		Returns:
+			None
+		"""
+        self._change_virtual_loss(path, -1)
+        self.virtual_losses_count -= 1
+
+    @staticmethod
+    def _change_virtual_loss(path, amount):
+        for node in path:
+            node.details.virtual_loss += amount
+
     def perform_move_on_root(self, move: BaseGameMove):
         """
-        Moves the root to the node with newly executed move.
-        If the node was absent, even though it was chosen by the algorithm, it is artificially added.
+        Moves the root to the node with newly executed move and applies the move to the root's game state.
+        Ancestors of the new root and their other subtrees are detached from the tree, so that they can be freed.
 
 		Args:
 			move:  BaseGameMove object with move to be performed
@@ -49,39 +220,167 @@ class MonteCarloTree:
 		Returns:
 			None        
 		"""
-        next_root = None
+        next_root = self._get_next_root(move)
+        self.game_state.apply_moves([move])
+        self._move_root(next_root)
+
+    def set_nodes_limit(self, max_nodes=0, max_memory_mb=0):
+        """
+        Sets the budget of nodes of the tree. Budget in megabytes is converted to nodes with the estimated size of
+        a single node. If both are given, the lower one is used.
+
+		Args:
+			max_nodes:  maximal number of nodes, 0 for no limit
+			max_memory_mb:  maximal memory used by nodes in megabytes, 0 for no limit
+
+		Returns:
+			None
+		"""
+        limits = [max_nodes, max_memory_mb * 1024 * 1024 // self.NODE_SIZE_ESTIMATE]
+        limits = [int(limit) for limit in limits if limit > 0]
+        self.nodes_limit = max(min(limits), 1) if limits else 0
+
+    def enforce_nodes_limit(self):
+        """
+        Collapses the least visited subtrees if the tree has more nodes than its budget. Collapsed nodes become leaves
+        again, keeping their statistics, and can be expanded later. Subtrees are collapsed until the tree shrinks well
+        below the budget, so that collapsing is not repeated every iteration. It is called by the search between
+        iterations. Subtrees containing paths which carry virtual losses are kept, so that results of pending
+        playouts are backpropagated into attached nodes.
+
+		Returns:
+			None
+		"""
+        if self.nodes_limit == 0 or self.nodes_count <= self.nodes_limit:
+            return
+        target_count = int(self.nodes_limit * self.COLLAPSE_TARGET_FRACTION)
+        candidates = [node for node in self._iterate_nodes() if node.has_children() and node != self.root]
+        if self.virtual_losses_count > 0:
+            candidates = [node for node in candidates
+                          if not any(child.details.virtual_loss > 0 for child in node.children)]
+        candidates.sort(key=lambda node: node.details.visits_count)
+        removed_nodes = set()
+        for node in candidates:
+            if self.nodes_count <= target_count:
+                break
+            if node not in removed_nodes:
+                self._collapse_node(node, removed_nodes)
+        self._prune_references(lambda node: node not in removed_nodes)
+
+    def _get_next_root(self, move: BaseGameMove):
+        """
+        If the node of the move was absent, even though it was chosen by the algorithm, it is artificially added.
+        With lazy expansion it is normal that the move has not been tried yet.
+
+		Args:
+			move:  BaseGameMove object with move to be performed
+
+		Returns:
+			MonteCarloNode object, child of the root with the given move
+		"""
         for child in self.root.children:
             if move.move_equal(child.move):
-                next_root = child
-                break
+                return child
+
+        if self.root.has_children() and self.root not in self.untried_moves:
+            raise RuntimeError("Why wouldn't you find your move?")
+        return self.root.add_child_by_move(move)
 
-        if next_root is None:
-            self.root.add_child_by_move(move)
-            if len(self.root.children) > 1:
-                raise RuntimeError("Why wouldn't you find your move?")
-            next_root = self.root.children[0]
+    def _move_root(self, next_root: MonteCarloNode):
+        old_root = self.root
         self.root = next_root
+        next_root.parent = None
+        old_root.children = []
+        live_nodes = set(self._iterate_nodes())
+        self.nodes_count = len(live_nodes)
+        self._prune_references(live_nodes.__contains__)
+
+    def _collapse_node(self, node: MonteCarloNode, removed_nodes):
+        """
+        Removes all descendants of the node and adds them to removed_nodes.
+        """
+        nodes_to_remove = list(node.children)
+        while nodes_to_remove:
+            descendant = nodes_to_remove.pop()
+            removed_nodes.add(descendant)
+            nodes_to_remove.extend(descendant.children)
+            self.nodes_count -= 1
+        self._detach_children(node)
+        self.untried_moves.pop(node, None)
+
+    def _detach_children(self, node: MonteCarloNode):
+        node.children = []
+
+    def _prune_references(self, is_alive):
+        """
+        Forgets data kept by the tree for nodes which are no longer part of it.
+
+		Args:
+			is_alive:  function telling if the given node is still part of the tree
+
+		Returns:
+			None
+		"""
+        if self.untried_moves:
+            self.untried_moves = {node: moves for node, moves in self.untried_moves.items() if is_alive(node)}
+
+    def _iterate_nodes(self):
+        """
+		Returns:
+			generator of all nodes of the tree, starting from the root
+		"""
+        nodes_to_visit = [self.root]
+        while nodes_to_visit:
+            node = nodes_to_visit.pop()
+            yield node
+            nodes_to_visit.extend(node.children)
+
+    def create_snapshot(self):
+        """
+        Copies the nodes of the tree, without game states, so that the copy can be visualised while the search keeps
+        on modifying the original tree, e.g. in another thread. Copied nodes keep ids of the original ones.
+
+		Returns:
+			MonteCarloTree object with MonteCarloNode nodes
+		"""
+        snapshot_root = MonteCarloTree._copy_node(self.root)
+        nodes_to_copy = [(self.root, snapshot_root)]
+        while nodes_to_copy:
+            node, node_copy = nodes_to_copy.pop()
+            for child in node.children:
+                child_copy = MonteCarloTree._copy_node(child)
+                node_copy.add_child_by_node(child_copy)
+                nodes_to_copy.append((child, child_copy))
+        return MonteCarloTree(root=snapshot_root)
+
+    @staticmethod
+    def _copy_node(node: MonteCarloNode):
+        rc = MonteCarloNode()
+        rc.id = node.id
+        rc.move = node.move
+        details = node.details
+        rc.details.state_name = details.state_name
+        rc.details.move_name = details.move_name
+        rc.details.visits_count = details.visits_count
+        rc.details.visits_count_pre_modified = details.visits_count_pre_modified
+        rc.details.win_score = details.win_score
+        rc.details.average_prize = details.average_prize
+        rc.details.proven_result = details.proven_result
+        return rc
 
     def reset_vis_data(self):
         """
-        Resets visualization data of all nodes of the tree.
+        Resets visualization data of all nodes of the tree. Visualization details are created again on demand.
 
 		Returns:
 			None        
 		"""
         self._reset_vis_data_internal(self.root)
 
-    def _reset_vis_data_internal(self, node: MonteCarloNode, depth=0):
-        node.vis_details.x = -1
-        node.vis_details.y = depth
-        node.vis_details.thread = None
-        node.vis_details.mod = 0
-        node.vis_details._ancestor = self
-        node.vis_details.change = 0
-        node.vis_details.shift = 0
-        node.left_most_sibling = None
+    def _reset_vis_data_internal(self, node: MonteCarloNode):
+        node.reset_vis_details()
         for child in node.children:
-            self._reset_vis_data_internal(child, depth + 1)
+            self._reset_vis_data_internal(child)
 
 
 class TreeData:
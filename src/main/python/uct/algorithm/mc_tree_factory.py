@@ -0,0 +1,27 @@
+
+from main_application.gui_settings import MonteCarloSettings
+from uct.algorithm.mc_array_tree import MonteCarloArrayTree
+from uct.algorithm.mc_transposition_tree import MonteCarloTranspositionTree
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.game.base_game_state import BaseGameState
+
+
+def create_tree(game_state: BaseGameState, settings: MonteCarloSettings) -> MonteCarloTree:
+    """
+    Creates the tree of the kind chosen in the settings, with the budget of nodes set in the settings.
+
+		Args:
+			game_state:  BaseGameState object of the root
+			settings:  MonteCarloSettings object
+
+		Returns:
+			MonteCarloTree, MonteCarloArrayTree or MonteCarloTranspositionTree object
+	"""
+    if settings.use_transpositions:
+        rc = MonteCarloTranspositionTree(game_state)
+    elif settings.use_array_tree:
+        rc = MonteCarloArrayTree(game_state)
+    else:
+        rc = MonteCarloTree(game_state)
+    rc.set_nodes_limit(settings.max_tree_nodes, settings.max_tree_memory)
+    return rc
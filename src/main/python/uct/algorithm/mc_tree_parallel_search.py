@@ -0,0 +1,100 @@
+
+from concurrent.futures import Executor, FIRST_COMPLETED, ALL_COMPLETED, wait
+
+from main_application.gui_settings import MonteCarloSettings
+from uct.algorithm.enums import GamePhase
+from uct.algorithm.mc_playout import perform_playouts
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
+from utils.random_utils import RandomStream
+
+
+class MonteCarloTreeParallelSearch(MonteCarloTreeSearch):
+    """
+    Class executes tree parallelisation of Monte Carlo Tree Search. Selection, expansion and backpropagation are
+    executed on the coordinating thread on a single shared tree, while playouts run concurrently in worker processes.
+    Every path waiting for the result of its playout carries a virtual loss, so that the following selections spread
+    across different branches. Each playout gets its own random stream spawned from the search's stream.
+    """
+    def __init__(self, tree: MonteCarloTree, settings: MonteCarloSettings, executor: Executor,
+                 random_stream: RandomStream = None):
+        super().__init__(tree, settings, random_stream)
+        self.executor = executor
+        self.pending_playouts = {}
+
+    def _perform_iteration(self):
+        """
+        Starts new iterations until every worker has a playout to perform. Then waits until at least one playout
+        is finished and backpropagates results of all finished playouts.
+        The tree's budget of nodes is enforced before new iterations are started.
+
+		Returns:
+			None
+		"""
+        self.tree.enforce_nodes_limit()
+        while len(self.pending_playouts) < self.settings.workers_count and self._can_start_iteration():
+            self._start_iteration()
+        self._finish_iterations(FIRST_COMPLETED)
+
+    def ponder(self):
+        """
+        Performs iterations until a stop is requested, and waits for the playouts that are still pending.
+
+		Returns:
+			None
+		"""
+        super().ponder()
+        self._finish_iterations(ALL_COMPLETED)
+
+    def _select_result_node(self):
+        """
+        Waits for the playouts that are still pending and selects the best node afterwards.
+
+		Returns:
+			tuple of (BaseGameMove, BaseGameState, MonteCarloNode) of the chosen move
+		"""
+        self._finish_iterations(ALL_COMPLETED)
+        return super()._select_result_node()
+
+    def _can_start_iteration(self):
+        if not self.settings.limit_iterations:
+            return True
+        return self.iterations + len(self.pending_playouts) < self.settings.max_iterations
+
+    def _start_iteration(self):
+        """
+        Selects and expands a leaf and sends its playout to a worker, marking the path with a virtual loss.
+        A leaf that has already ended the game is backpropagated immediately.
+
+		Returns:
+			None
+		"""
+        path, leaf_state = self._select_leaf_to_explore()
+        leaf_player = leaf_state.current_player
+        if leaf_state.phase != GamePhase.IN_PROGRESS:
+            self._backpropagation(path, self._simulation(leaf_state), leaf_player)
+            self.iterations += 1
+            return
+
+        self.tree.add_virtual_loss(path)
+        playouts_stream, = self.random_stream.spawn(1)
+        future = self.executor.submit(perform_playouts, leaf_state, self.settings, self.settings.playouts_per_leaf,
+                                      playouts_stream)
+        self.pending_playouts[future] = (path, leaf_player)
+
+    def _finish_iterations(self, return_when):
+        """
+        Waits for pending playouts and backpropagates results of the finished ones, resolving their virtual losses.
+
+		Args:
+			return_when:  FIRST_COMPLETED or ALL_COMPLETED
+
+		Returns:
+			None
+		"""
+        finished, _ = wait(self.pending_playouts, return_when=return_when)
+        for future in finished:
+            path, leaf_player = self.pending_playouts.pop(future)
+            self.tree.remove_virtual_loss(path)
+            self._backpropagation(path, future.result(), leaf_player)
+            self.iterations += 1
@@ -1,28 +1,68 @@
 
 import time
-from math import sqrt, log
+from math import inf, log, sqrt
 
-from PyQt5.QtWidgets import QApplication
+import numpy as np
 
 import uct.algorithm.enums as Enums
 import uct.algorithm.mc_node_utils as NodeUtils
 from main_application.gui_settings import MonteCarloSettings
+from uct.algorithm.mc_node_details import MonteCarloNodeDetails
+from uct.algorithm.mc_playout import perform_playouts
+from uct.algorithm.mc_search_profiler import MonteCarloSearchProfiler
 from uct.algorithm.mc_simulation_result import MonteCarloSimulationResult
 from uct.algorithm.mc_tree import MonteCarloTree
 from uct.game.base_game_move import BaseGameMove
 from uct.game.base_game_state import BaseGameState
 from utils.custom_event import CustomEvent
+from utils.random_utils import RandomStream
 
 
 class MonteCarloTreeSearch:
     """
     Class responsible for executing four steps of the Monte Carlo Tree Search method in an iterative way.
+    All random choices of the search are drawn from its random stream, so a search started from the same seed is
+    replayed exactly.
+    With profiling, statistics of phases of every calculation of a move are reported by the search_profiled event.
+    With smart stop, the search ends before its limit once the chosen move can no longer change.
+    With the solver, wins and losses proven by reaching the end of the game are propagated up the tree in the minimax
+    way. Proven losses are not selected any more and the search ends once the result of the root is proven. Players
+    are assumed to alternate moves.
+    With RAVE, every playout also updates all-moves-as-first (AMAF) statistics of the children of the nodes on its
+    path, whose moves were played later in the tree or in the playout, and these statistics are blended into UCT.
     """
-    def __init__(self, tree: MonteCarloTree, settings: MonteCarloSettings):
+    SMART_STOP_STABLE_FRACTION = 0.2
+    SCALAR_UCT_MAX_CHILDREN = 16
+
+    def __init__(self, tree: MonteCarloTree, settings: MonteCarloSettings, random_stream: RandomStream = None):
         self.tree = tree
         self.settings = settings
+        self.random_stream = random_stream if random_stream is not None else RandomStream(settings.random_seed)
         self.iteration_performed = CustomEvent()
         self.iterations = 0
+        self.yield_callback = None
+        self.yield_interval = 0
+        self._last_yield_time = 0
+        self.stop_requested = False
+        self._best_child = None
+        self._best_child_iteration = 0
+        self.search_profiled = CustomEvent()
+        self.profiler = MonteCarloSearchProfiler(self) if settings.profile_search else None
+
+    def set_yield_callback(self, callback, interval_ms):
+        """
+        Installs a function that is called between iterations, at most once per given interval. It lets the caller,
+        e.g. GUI event loop, do its own work during the calculation. The search does not yield without it.
+
+		Args:
+			callback:  function without arguments or None
+			interval_ms:  minimal time between consecutive calls in milliseconds
+
+		Returns:
+			None
+		"""
+        self.yield_callback = callback
+        self.yield_interval = interval_ms / 1000
 
     def calculate_next_move(self) -> (BaseGameMove, BaseGameState):
         """
@@ -33,22 +73,62 @@ class MonteCarloTreeSearch:
 		Returns:
 			tuple of (BaseGameMove, BaseGameState, MonteCarloNode) of the chosen move        
 		"""
+        if self.profiler is None:
+            return self._calculate_next_move()
+        self.profiler.start()
+        rc = self._calculate_next_move()
+        self.search_profiled.fire(self, self.profiler.get_report())
+        return rc
+
+    def _calculate_next_move(self):
         if self.settings.limit_iterations:
             return self._calculate_next_move_iterations_limited()
         else:
             return self._calculate_next_move_time_limited()
 
+    def request_stop(self):
+        """
+        Asks the search to finish after the current iteration. The best move found so far is returned then. It is safe
+        to call it from another thread than the one performing the search.
+
+		Returns:
+			None
+		"""
+        self.stop_requested = True
+
+    def ponder(self):
+        """
+        Performs iterations until a stop is requested, without choosing any move. It is meant to be run while the
+        opponent thinks, so that the subtree of the opponent's reply is already explored when the next move is
+        calculated.
+
+		Returns:
+			None
+		"""
+        while not self.stop_requested:
+            self._perform_iteration()
+            self._yield()
+
     def _calculate_next_move_iterations_limited(self):
         """
         Calculates the best move for a computer using UCT algorithm for a given number of iterations.
         After the calculation an event that signalizes the end of iteration is triggered.
+        The calculation ends earlier if a stop was requested, if the solver proved the result of the root, or with
+        smart stop, if the move is already decided.
 
 		Returns:
 			tuple of (BaseGameMove, BaseGameState, MonteCarloNode) of the chosen move        
 		"""
         while self.iterations < self.settings.max_iterations:
             self._perform_iteration()
+            self._yield()
             self.iteration_performed.fire(self, self.iterations / self.settings.max_iterations)
+            if self.stop_requested or self._is_root_proven():
+                break
+            if self.settings.smart_stop and self._is_move_decided(self.settings.max_iterations - self.iterations):
+                break
+        if self.iterations < self.settings.max_iterations:
+            self.iteration_performed.fire(self, 1)
         return self._select_result_node()
 
     def _calculate_next_move_time_limited(self):
@@ -56,6 +136,8 @@ class MonteCarloTreeSearch:
         Calculates the best move for a computer using UCT algorithm for a given amount of time.
         After the calculation an event that signalizes the end of iteration is triggered.
         When the time is over during calculation, the last iteration is calculated to the end.
+        The calculation ends earlier if a stop was requested, if the solver proved the result of the root, or with
+        smart stop, if the move is already decided.
 
 		Returns:
 			tuple of (BaseGameMove, BaseGameState, MonteCarloNode) of the chosen move        
@@ -66,34 +148,113 @@ class MonteCarloTreeSearch:
         progress_fraction = 0
         while elapsed_time_ms < max_time:
             self._perform_iteration()
+            self._yield()
             elapsed_time_ms = (time.time() - start_time) * 1000
             progress_fraction = elapsed_time_ms / max_time
             self.iteration_performed.fire(self, progress_fraction)
+            if self.stop_requested or self._is_root_proven():
+                break
+            if self.settings.smart_stop and elapsed_time_ms > 0:
+                remaining_iterations = self.iterations * (max_time - elapsed_time_ms) / elapsed_time_ms
+                if self._is_move_decided(remaining_iterations):
+                    break
         if progress_fraction != 1:
             self.iteration_performed.fire(self, 1)
         return self._select_result_node()
 
+    def _is_move_decided(self, remaining_iterations):
+        """
+        Checks if the search can be finished early. The move is decided when no other child of the root can overtake
+        the child that would be chosen in visits within the remaining iterations, and the child that would be chosen
+        has not changed for the last SMART_STOP_STABLE_FRACTION of all iterations. The root with a single move is
+        decided at once.
+
+		Args:
+			remaining_iterations:  expected number of iterations left until the limit
+
+		Returns:
+			bool informing if further iterations would not change the chosen move
+		"""
+        root = self.tree.root
+        if self._has_untried_moves(root) or not root.has_children():
+            return False
+        if self.tree.get_children_count(root) == 1:
+            return True
+
+        best_child = self._get_best_child(root)
+        if best_child != self._best_child:
+            self._best_child = best_child
+            self._best_child_iteration = self.iterations
+        stable_iterations = self.iterations - self._best_child_iteration
+        if stable_iterations < self.SMART_STOP_STABLE_FRACTION * (self.iterations + remaining_iterations):
+            return False
+
+        runner_up_visits = max(child.details.visits_count for child in root.children if child != best_child)
+        lead = best_child.details.visits_count - runner_up_visits
+        return lead > remaining_iterations * self.settings.playouts_per_leaf
+
+    def _yield(self):
+        """
+        Calls the yield callback, unless it was called less than yield interval ago.
+
+		Returns:
+			None
+		"""
+        if self.yield_callback is None:
+            return
+        now = time.perf_counter()
+        if now - self._last_yield_time >= self.yield_interval:
+            self._last_yield_time = now
+            self.yield_callback()
+
     def _perform_iteration(self):
         """
         Performs single UCT algorithm iteration.
         Execution consists of four steps: selection, expansion, simulation and backpropagation.
+        Game state is retrieved only once per iteration and carried down the selection path, so that expansion,
+        simulation and backpropagation do not replay the moves from the root again.
+        The tree's budget of nodes is enforced before the iteration.
 
 		Returns:
 			None        
 		"""
-        QApplication.processEvents()
-        promising_node = self._selection(self.tree.root)
-        self._expansion(promising_node)
+        self.tree.enforce_nodes_limit()
+        path, leaf_state = self._select_leaf_to_explore()
+        leaf_player = leaf_state.current_player
+        simulation_results = self._simulation(leaf_state)
+        self._backpropagation(path, simulation_results, leaf_player)
 
-        if promising_node.has_children():
-            leaf_to_explore = NodeUtils.get_random_child(promising_node)
-        else:
-            leaf_to_explore = promising_node
+        self.iterations += 1
 
-        simulation_result = self._simulation(leaf_to_explore)
-        self._backpropagation(leaf_to_explore, simulation_result)
+    def _select_leaf_to_explore(self):
+        """
+        Executes selection and expansion, then chooses a random child of the expanded node (if there is any) as the
+        leaf to start the playout from. With lazy expansion, the only child created is chosen.
 
-        self.iterations += 1
+		Returns:
+			tuple of (list of MonteCarloNode, BaseGameState) - path from the root to the leaf to explore and the game
+			state of that leaf
+		"""
+        path, node_state = self._selection(self.tree.root)
+        promising_node = path[-1]
+        if self.tree.is_transposition(promising_node):
+            return path, node_state
+
+        if self.settings.lazy_expansion:
+            leaf_to_explore = self._expansion_lazy(promising_node, node_state)
+        else:
+            self._expansion(promising_node, node_state)
+            leaf_to_explore = None
+            if promising_node.has_children():
+                leaf_to_explore = NodeUtils.get_random_child(promising_node, self.random_stream)
+
+        if leaf_to_explore is not None:
+            node_state.apply_moves([leaf_to_explore.move])
+            path.append(leaf_to_explore)
+            self.tree.enter_node(path, node_state)
+        if self.settings.use_solver and node_state.phase != Enums.GamePhase.IN_PROGRESS:
+            self._update_proven_results(path, node_state)
+        return path, node_state
 
     def _select_result_node(self):
         """
@@ -103,104 +264,273 @@ class MonteCarloTreeSearch:
 		Returns:
 			tuple of (BaseGameMove, BaseGameState, MonteCarloNode) of the chosen move        
 		"""
-        best_child = NodeUtils.get_child_with_max_score(self.tree.root)
+        best_child = self._get_best_child(self.tree.root)
 
-        result_game_state = self.tree.retrieve_node_game_state(best_child)
+        result_game_state = self._retrieve_node_game_state(best_child)
         result_game_state.switch_current_player()
         result_move = best_child.move
         return result_move, result_game_state, best_child
 
+    def _get_best_child(self, node):
+        """
+        With the solver, a proven win is chosen, if there is any, and proven losses are avoided, unless all children
+        are lost. With smart stop, the most visited child is chosen instead of the one with the biggest average prize,
+        as the search is stopped early by its lead in visits.
+
+		Args:
+			node:  MonteCarloNode object
+
+		Returns:
+			MonteCarloNode object, child with the biggest average prize or visits count
+		"""
+        if self.settings.smart_stop:
+            get_best_child = NodeUtils.get_child_with_max_visits
+            get_score = lambda child: child.details.visits_count
+        else:
+            get_best_child = NodeUtils.get_child_with_max_score
+            get_score = lambda child: child.details.average_prize
+        if not self.settings.use_solver:
+            return get_best_child(node)
+        proven_results = self.tree.get_children_proven_results(node)
+        won_indices = np.flatnonzero(proven_results == MonteCarloNodeDetails.PROVEN_WIN)
+        if won_indices.size > 0:
+            return self.tree.get_child_at(node, won_indices[0])
+        candidates = [child for child, proven_result in zip(node.children, proven_results)
+                      if proven_result != MonteCarloNodeDetails.PROVEN_LOSS]
+        if not candidates:
+            return get_best_child(node)
+        return max(candidates, key=get_score)
+
+    def _is_root_proven(self):
+        return self.tree.root.details.proven_result != MonteCarloNodeDetails.NOT_PROVEN
+
+    def _update_proven_results(self, path, leaf_state: BaseGameState):
+        """
+        Proves the result of the leaf which ends the game and propagates it up the path. A node is proven lost if any
+        of its children is proven won, as the opponent will choose it, and it is proven won if all of its moves were
+        tried and all of its children are proven lost. A draw is not proven. Nodes proven before are passed, as
+        a node can be reached from more than one parent when transpositions are used.
+
+		Args:
+			path:  list of nodes from the root to the leaf
+			leaf_state:  game state of the leaf, which ended the game
+
+		Returns:
+			None
+		"""
+        leaf = path[-1]
+        if len(path) < 2 or leaf_state.phase == Enums.GamePhase.DRAW:
+            return
+        if leaf_state.phase == Enums.get_player_win(leaf.move.player):
+            leaf.details.proven_result = MonteCarloNodeDetails.PROVEN_WIN
+        else:
+            leaf.details.proven_result = MonteCarloNodeDetails.PROVEN_LOSS
+
+        for node in reversed(path[:-1]):
+            if self.tree.is_transposition(node) or node.details.proven_result != MonteCarloNodeDetails.NOT_PROVEN:
+                continue
+            if self._has_untried_moves(node):
+                break
+            proven_results = self.tree.get_children_proven_results(node)
+            if (proven_results == MonteCarloNodeDetails.PROVEN_WIN).any():
+                node.details.proven_result = MonteCarloNodeDetails.PROVEN_LOSS
+            elif (proven_results == MonteCarloNodeDetails.PROVEN_LOSS).all():
+                node.details.proven_result = MonteCarloNodeDetails.PROVEN_WIN
+            else:
+                break
+
     def _selection(self, node):
         """
         Executes 1st stage of MCTS.
         Starts from root R and selects successive child nodes until a leaf node L is reached.
 
+        Moves of the selected nodes are applied to the working game state on the way down. Selected nodes are
+        gathered in a path, which is later used in backpropagation, as a node can be reached from more than one parent
+        when transpositions are used.
+
 		Args:
 			node:  node from which to start selection
 
 		Returns:
-			UCT-best leaf node        
+			tuple of (list of MonteCarloNode, BaseGameState) - path from the given node to UCT-best leaf node and the
+			game state of that leaf        
 		"""
         tmp_node = node
-        while tmp_node.has_children() != 0:
+        tmp_state = self._retrieve_node_game_state(node)
+        path = [tmp_node]
+        while tmp_node.has_children() and not self._has_untried_moves(tmp_node):
             tmp_node = self._find_best_child_with_uct(tmp_node)
-        return tmp_node
+            tmp_state.apply_moves([tmp_node.move])
+            path.append(tmp_node)
+            tmp_node = self.tree.enter_node(path, tmp_state)
+        return path, tmp_state
 
-    def _expansion(self, node):
+    def _retrieve_node_game_state(self, node):
+        return self.tree.retrieve_node_game_state(node)
+
+    def _expansion(self, node, node_state: BaseGameState):
         """
         Executes 2nd stage of MCTS.
         Unless L ends the game, creates one (or more) child nodes and chooses node C from one of them.
 
 		Args:
 			node:  node from which to start expanding
+			node_state:  game state of the node
 
 		Returns:
 			None        
 		"""
-        node_state = self.tree.retrieve_node_game_state(node)
         possible_moves = node_state.get_all_possible_moves()
         for move in possible_moves:
             node.add_child_by_move(move[0], state_desc=move[1])
+        self.tree.nodes_count += len(possible_moves)
 
-    def _simulation(self, leaf) -> MonteCarloSimulationResult:
+    def _expansion_lazy(self, node, node_state: BaseGameState):
         """
-        Executes 3rd stage of MCTS.
-        Complete a random playout from node C.
+        Executes 2nd stage of MCTS with lazy expansion.
+        Instead of creating all children of L at once, possible moves are stored as untried moves of L when it is
+        expanded for the first time. Each expansion creates a child for one of them, chosen randomly.
 
 		Args:
-			leaf:  leaf from which to process a random playout
+			node:  node from which to start expanding
+			node_state:  game state of the node
 
 		Returns:
-			None        
+			created child node C, or None if L ends the game
 		"""
-        leaf_state = self.tree.retrieve_node_game_state(leaf)
-        tmp_state = leaf_state.deep_copy()
-        tmp_phase = leaf_state.phase
+        untried_moves = self.tree.untried_moves.get(node)
+        if untried_moves is None:
+            if node.has_children():
+                return None
+            untried_moves = node_state.get_all_possible_moves()
+            if not untried_moves:
+                return None
+            self.tree.untried_moves[node] = untried_moves
+
+        move_index = self.random_stream.get_random_int(0, len(untried_moves))
+        untried_moves[move_index], untried_moves[-1] = untried_moves[-1], untried_moves[move_index]
+        move, state_desc = untried_moves.pop()
+        if not untried_moves:
+            del self.tree.untried_moves[node]
+        self.tree.nodes_count += 1
+        return node.add_child_by_move(move, state_desc=state_desc)
+
+    def _has_untried_moves(self, node):
+        return self.settings.lazy_expansion and node in self.tree.untried_moves
+
+    def _simulation(self, leaf_state: BaseGameState) -> [MonteCarloSimulationResult]:
+        """
+        Executes 3rd stage of MCTS.
+        Complete random playouts from node C, as many as set in playouts per leaf setting. The last playout is
+        performed directly on the given state.
 
-        moves_counter = 0
-        while tmp_phase == Enums.GamePhase.IN_PROGRESS:
-            tmp_state.perform_random_move()
-            tmp_phase = tmp_state.phase
-            moves_counter += 1
-            if self.settings.limit_moves and moves_counter >= self.settings.max_moves_per_iteration:
-                break
-        return MonteCarloSimulationResult(tmp_state)
+		Args:
+			leaf_state:  game state of the leaf from which to process random playouts
 
-    def _backpropagation(self, leaf, simulation_result: MonteCarloSimulationResult):
+		Returns:
+			list of MonteCarloSimulationResult objects        
+		"""
+        return perform_playouts(leaf_state, self.settings, self.settings.playouts_per_leaf, self.random_stream)
+
+    def _backpropagation(self, path, simulation_results: [MonteCarloSimulationResult], leaf_player):
         """
         Executes 4th stage of MCTS.
-        Uses the result of the playout to update information in the nodes on the path from C to R.
+        Uses the results of the playouts to update information in the nodes on the path from C to R. Rewards of all
+        playouts are summed up and each playout counts as a single visit.
 
 		Args:
-			leaf:  leaf from which to start backpropagating
-			simulation_result:  result of random simulation simulated from 
+			path:  list of nodes from the root to the leaf from which the playouts started
+			simulation_results:  results of random simulations simulated from the leaf
+			leaf_player:  current player of the leaf's game state
 
 		Returns:
 			None        
 		"""
-        leaf_state = self.tree.retrieve_node_game_state(leaf)
-        leaf_player = leaf_state.current_player
-        if simulation_result.phase == Enums.get_player_win(leaf_player):
-            reward = 1
-        elif simulation_result.phase == Enums.GamePhase.DRAW:
-            reward = 0.5
-        else:
-            reward = simulation_result.get_reward(leaf_player)
+        reward = sum(self._get_reward(simulation_result, leaf_player) for simulation_result in simulation_results)
+        visits_count = len(simulation_results)
+        if self.settings.use_rave:
+            self._update_amaf_statistics(path, simulation_results, leaf_player)
 
-        tmp_node = leaf
-        while tmp_node != self.tree.root:
-            tmp_node.details.mark_visit()
+        for tmp_node in reversed(path[1:]):
+            tmp_node.details.mark_visit(visits_count)
             tmp_current_player = tmp_node.move.player
             if leaf_player == tmp_current_player:
                 tmp_node.details.add_score(reward)
-            tmp_node = tmp_node.parent
-        self.tree.root.details.mark_visit()
+        path[0].details.mark_visit(visits_count)
+
+    def _update_amaf_statistics(self, path, simulation_results: [MonteCarloSimulationResult], leaf_player):
+        """
+        Updates AMAF statistics of children of the nodes on the path. For every playout, a child gets an AMAF visit if
+        the player of its move made the same move anywhere after the child's parent, either further on the path or in
+        the playout. Rewards are added to the same nodes as in backpropagation.
+
+		Args:
+			path:  list of nodes from the root to the leaf from which the playouts started
+			simulation_results:  results of random simulations simulated from the leaf, with performed moves
+			leaf_player:  current player of the leaf's game state
+
+		Returns:
+			None
+		"""
+        path_moves = [node.move for node in path[1:]]
+        for simulation_result in simulation_results:
+            reward = self._get_reward(simulation_result, leaf_player)
+            moves = path_moves + simulation_result.moves
+            for depth, node in enumerate(path):
+                following_moves = moves[depth:]
+                for child in node.children:
+                    child_move = child.move
+                    if any(move.player == child_move.player and child_move.move_equal(move)
+                           for move in following_moves):
+                        child.details.amaf_visits_count += 1
+                        if child_move.player == leaf_player:
+                            child.details.amaf_score += reward
+
+    @staticmethod
+    def _get_reward(simulation_result: MonteCarloSimulationResult, leaf_player):
+        """
+		Args:
+			simulation_result:  result of a random simulation
+			leaf_player:  current player of the leaf's game state
+
+		Returns:
+			reward of the leaf player: 1 for a win, 0.5 for a draw, otherwise the score of the game state
+		"""
+        if simulation_result.phase == Enums.get_player_win(leaf_player):
+            return 1
+        elif simulation_result.phase == Enums.GamePhase.DRAW:
+            return 0.5
+        else:
+            return simulation_result.get_reward(leaf_player)
+
+    def _blend_amaf_values(self, node, values, visits):
+        """
+        Blends average prizes of the node's children with their AMAF values. Weight of AMAF values is
+        beta = sqrt(k / (3 * visits + k)), where k is the RAVE equivalence parameter, so it fades out as the child
+        is visited more. Children without AMAF visits keep their average prizes.
+
+		Args:
+			node:  MonteCarloNode object
+			values:  numpy array of average prizes of the node's children
+			visits:  numpy array of visits counts of the node's children
+
+		Returns:
+			numpy array of blended values
+		"""
+        amaf_visits, amaf_scores = self.tree.get_children_amaf_statistics(node)
+        amaf_values = np.divide(amaf_scores, amaf_visits, out=values.copy(), where=amaf_visits > 0)
+        equivalence = self.settings.rave_equivalence
+        beta = np.sqrt(equivalence / (3 * visits + equivalence))
+        return (1 - beta) * values + beta * amaf_values
 
     def _find_best_child_with_uct(self, node):
         """
         Calculates UCT value for children of a given node, with the formula:
         uct_value = (win_score / visits) + 1.41 * sqrt(log(parent_visit) / visits)
         and returns the most profitable one.
+        Values are calculated for all children at once on arrays of their statistics, unless the node has at most
+        SCALAR_UCT_MAX_CHILDREN children, for which a loop over the children is faster. Unvisited children always take
+        precedence, the first of them is returned. With the solver, children proven lost are skipped.
 
 		Args:
 			node:  MonteCarloNode object
@@ -208,15 +538,48 @@ class MonteCarloTreeSearch:
 		Returns:
 			MonteCarloNode node with the best UCT calculated value        
 		"""
-        def uct_value(n, p_visit, exp_par):
-            visits = n.details.visits_count
-            win_score = n.details.win_score
-            if visits == 0:
-                return 10000000  # TODO: won't 2 be enough?
-            else:
-                uct_val = (win_score / visits) + exp_par * sqrt(log(p_visit) / visits)
-                return uct_val
+        if self.tree.get_children_count(node) <= self.SCALAR_UCT_MAX_CHILDREN and not self.settings.use_rave:
+            return self._find_best_child_with_scalar_uct(node)
+        visits, win_scores = self.tree.get_children_statistics(node)
+        least_visited_index = visits.argmin()
+        if visits[least_visited_index] == 0:
+            return self.tree.get_child_at(node, least_visited_index)
+
+        log_parent_visit = log(node.details.visits_count + node.details.virtual_loss)
+        exploration_values = np.sqrt(log_parent_visit / visits)
+        exploration_values *= self.settings.exploration_parameter
+        uct_values = win_scores / visits
+        if self.settings.use_rave:
+            uct_values = self._blend_amaf_values(node, uct_values, visits)
+        uct_values += exploration_values
+        if self.settings.use_solver:
+            uct_values[self.tree.get_children_proven_results(node) == MonteCarloNodeDetails.PROVEN_LOSS] = -np.inf
+        return self.tree.get_child_at(node, uct_values.argmax())
+
+    def _find_best_child_with_scalar_uct(self, node):
+        """
+        Calculates UCT value for each child in a loop. The child chosen is the same as on arrays of statistics.
 
-        parent_visit = node.details.visits_count
-        return max(node.children, key=lambda n: uct_value(n, parent_visit, self.settings.exploration_parameter))
+		Args:
+			node:  MonteCarloNode object
 
+		Returns:
+			MonteCarloNode node with the best UCT calculated value
+		"""
+        visits, win_scores = self.tree.get_children_statistics_lists(node)
+        if 0 in visits:
+            return self.tree.get_child_at(node, visits.index(0))
+
+        log_parent_visit = log(node.details.visits_count + node.details.virtual_loss)
+        exploration_parameter = self.settings.exploration_parameter
+        proven_results = self.tree.get_children_proven_results(node).tolist() if self.settings.use_solver else None
+        best_index = 0
+        best_value = -inf
+        for index, (child_visits, win_score) in enumerate(zip(visits, win_scores)):
+            if proven_results and proven_results[index] == MonteCarloNodeDetails.PROVEN_LOSS:
+                continue
+            uct_value = win_score / child_visits + sqrt(log_parent_visit / child_visits) * exploration_parameter
+            if uct_value > best_value:
+                best_index = index
+                best_value = uct_value
+        return self.tree.get_child_at(node, best_index)
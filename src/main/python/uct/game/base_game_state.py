@@ -1,7 +1,10 @@
 
 import abc
 
+import numpy as np
+
 from uct.algorithm.enums import GamePhase
+from utils.random_utils import RandomStream
 
 
 class BaseGameState(abc.ABC):
@@ -21,10 +24,16 @@ class BaseGameState(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def perform_random_move(self):
+    def perform_random_move(self, random_stream: RandomStream):
         """
         Performs move selected randomly.
-        """
+
+		Args:
+			random_stream:  RandomStream object of the search
+
+		Returns:
+			BaseGameMove object, the performed move
+		"""
         pass
 
     @abc.abstractmethod
@@ -49,6 +58,28 @@ class BaseGameState(abc.ABC):
 		"""
         pass
 
+    @classmethod
+    def evaluate_win_scores(cls, states):
+        """
+        Evaluates scores of both players for many states at once. Games may override it with a vectorized version of
+        get_win_score.
+
+		Args:
+			states:  list of states of the class
+
+		Returns:
+			numpy array of shape (states count, 2) with scores of players 1 and 2
+		"""
+        return np.array([(state.get_win_score(1), state.get_win_score(2)) for state in states], dtype=float)
+
+    @abc.abstractmethod
+    def get_position_hash(self):
+        """
+		Returns:
+			hash of the position, equal for states reached by different sequences of moves        
+		"""
+        pass
+
     @abc.abstractmethod
     def deep_copy(self):
         """
@@ -0,0 +1,744 @@
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from math import log, sqrt
+
+from main_application.gui_settings import MonteCarloSettings
+from mancala.algorithm_relay.mancala_state import MancalaState
+from mancala.mancala_board import MancalaBoard
+import uct.algorithm.mc_node_utils as NodeUtils
+from uct.algorithm.enums import ParallelisationMode, SimulationMode
+from uct.algorithm.mc_array_tree import MonteCarloArrayTree
+from uct.algorithm.mc_batched_evaluation_search import MonteCarloBatchedEvaluationSearch
+from uct.algorithm.mc_game_manager import MonteCarloGameManager
+from uct.algorithm.mc_leaf_parallel_search import MonteCarloLeafParallelSearch
+from uct.algorithm.mc_node_store import MonteCarloNodeStore
+from uct.algorithm.mc_node_details import MonteCarloNodeDetails
+from uct.algorithm.mc_playout import perform_playout
+from uct.algorithm.mc_root_parallel_search import MonteCarloRootParallelSearch, search_independent_tree
+from uct.algorithm.mc_time_manager import MonteCarloTimeManager
+from uct.algorithm.mc_transposition_tree import MonteCarloTranspositionTree
+from uct.algorithm.mc_tree_factory import create_tree
+from uct.algorithm.mc_tree_parallel_search import MonteCarloTreeParallelSearch
+from uct.algorithm.mc_tree import MonteCarloTree
+from uct.algorithm.mc_tree_search import MonteCarloTreeSearch
+from utils.random_utils import RandomStream
+from visualisation_algorithm.walkers_algorithm import ImprovedWalkersAlgorithm
+
+
+class TestMonteCarloTreeSearch(unittest.TestCase):
+    def setUp(self):
+        self.settings = MonteCarloSettings()
+        self.settings.random_seed = 0
+        self.settings.max_iterations = 40
+        self.tree = MonteCarloTree(MancalaState(MancalaBoard()))
+
+    def test_search_does_not_import_qt(self):
+        code = "import sys, uct.algorithm.mc_game_manager; print(any(m.startswith('PyQt5') for m in sys.modules))"
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual(output.strip(), b"False")
+
+    def test_search_without_yield_callback(self):
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.calculate_next_move()
+        self.assertEqual(mcts.iterations, 40)
+        self.assertEqual(self.tree.root.details.visits_count, 40)
+
+    def test_yield_callback_is_called_every_iteration_without_interval(self):
+        calls = []
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.set_yield_callback(lambda: calls.append(1), 0)
+        mcts.calculate_next_move()
+        self.assertEqual(len(calls), 40)
+
+    def test_yield_callback_is_throttled(self):
+        calls = []
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.set_yield_callback(lambda: calls.append(1), 60 * 1000)
+        mcts.calculate_next_move()
+        self.assertEqual(len(calls), 1)
+
+    def test_playouts_per_leaf_count_as_visits(self):
+        self.settings.playouts_per_leaf = 3
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.calculate_next_move()
+        self.assertEqual(self.tree.root.details.visits_count, 120)
+        self.assertEqual(sum(child.details.visits_count for child in self.tree.root.children), 120)
+
+    def test_vectorized_uct_selection_matches_scalar_formula(self):
+        self.settings.max_iterations = 300
+        for tree in (self.tree, MonteCarloArrayTree(MancalaState(MancalaBoard()))):
+            mcts = MonteCarloTreeSearch(tree, self.settings)
+            mcts.calculate_next_move()
+            nodes_to_check = [tree.root]
+            while nodes_to_check:
+                node = nodes_to_check.pop()
+                children = node.children
+                if not children or any(child.details.visits_count == 0 for child in children):
+                    continue
+                nodes_to_check.extend(children)
+                expected = max(range(len(children)), key=lambda i: children[i].details.win_score /
+                               children[i].details.visits_count + self.settings.exploration_parameter *
+                               sqrt(log(node.details.visits_count) / children[i].details.visits_count))
+                mcts.SCALAR_UCT_MAX_CHILDREN = 0
+                self.assertEqual(mcts._find_best_child_with_uct(node).move, children[expected].move)
+                mcts.SCALAR_UCT_MAX_CHILDREN = len(children)
+                self.assertEqual(mcts._find_best_child_with_uct(node).move, children[expected].move)
+
+    def test_request_stop_finishes_search_early(self):
+        progress = []
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+
+        def handle_iteration_performed(sender, earg):
+            progress.append(earg)
+            if mcts.iterations == 5:
+                mcts.request_stop()
+
+        mcts.iteration_performed += handle_iteration_performed
+        move, state, best_node = mcts.calculate_next_move()
+        self.assertEqual(mcts.iterations, 5)
+        self.assertEqual(progress[-1], 1)
+        self.assertIn(best_node, self.tree.root.children)
+
+    def test_snapshot_copies_statistics(self):
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        snapshot = self.tree.create_snapshot()
+        self.assertEqual(snapshot.root.details.visits_count, 40)
+        self.assertEqual([child.details.visits_count for child in snapshot.root.children],
+                         [child.details.visits_count for child in self.tree.root.children])
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        self.assertEqual(snapshot.root.details.visits_count, 40)
+
+    def test_visualisation_details_are_created_by_layout(self):
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        nodes = list(self.tree._iterate_nodes())
+        self.assertTrue(all(node._vis_details is None for node in nodes))
+        ImprovedWalkersAlgorithm(self.tree).buchheim_junger_leipert_algorithm()
+        for node in nodes:
+            expected_depth = node.parent.vis_details.y + 1 if node.parent else 0
+            self.assertEqual(node.vis_details.y, expected_depth)
+        xs = [child.vis_details.x for child in self.tree.root.children]
+        self.assertEqual(xs, sorted(xs))
+        self.tree.reset_vis_data()
+        self.assertTrue(all(node._vis_details is None for node in nodes))
+
+    def test_lazy_expansion_creates_one_child_per_iteration(self):
+        self.settings.lazy_expansion = True
+        self.settings.max_iterations = 3
+        moves_count = len(MancalaState(MancalaBoard()).get_all_possible_moves())
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        self.assertEqual(len(self.tree.root.children), 3)
+        self.assertEqual(len(self.tree.untried_moves[self.tree.root]), moves_count - 3)
+
+    def test_lazy_expansion_tries_every_move_before_going_deeper(self):
+        self.settings.lazy_expansion = True
+        self.settings.max_iterations = len(MancalaState(MancalaBoard()).get_all_possible_moves())
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        self.assertNotIn(self.tree.root, self.tree.untried_moves)
+        self.assertEqual(sorted(str(child.move) for child in self.tree.root.children),
+                         sorted(str(move) for move, state_desc in MancalaState(MancalaBoard()).get_all_possible_moves()))
+        self.assertFalse(any(child.has_children() for child in self.tree.root.children))
+
+    def test_lazy_expansion_with_array_tree(self):
+        self.settings.lazy_expansion = True
+        self.settings.max_iterations = 200
+        tree = MonteCarloArrayTree(MancalaState(MancalaBoard()))
+        MonteCarloTreeSearch(tree, self.settings).calculate_next_move()
+        nodes_to_check = [tree.root]
+        while nodes_to_check:
+            node = nodes_to_check.pop()
+            children = node.children
+            if children:
+                leaf_visits_count = 0 if node == tree.root else 1
+                self.assertEqual(node.details.visits_count,
+                                 sum(child.details.visits_count for child in children) + leaf_visits_count)
+            for child in children:
+                self.assertEqual(child.parent, node)
+                nodes_to_check.append(child)
+
+    def test_root_move_not_tried_yet_is_added(self):
+        self.settings.lazy_expansion = True
+        self.settings.max_iterations = 2
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        tried_moves = [str(child.move) for child in self.tree.root.children]
+        move = next(move for move, state_desc in MancalaState(MancalaBoard()).get_all_possible_moves()
+                    if str(move) not in tried_moves)
+        self.tree.perform_move_on_root(move)
+        self.assertEqual(str(self.tree.root.move), str(move))
+        self.assertFalse(self.tree.untried_moves)
+
+    def test_tree_keeps_own_game_state(self):
+        board = MancalaBoard()
+        tree = MonteCarloTree(MancalaState(board))
+        move, state_desc = MancalaState(board).get_all_possible_moves()[0]
+        board.perform_move(move)
+        self.assertNotEqual(tree.retrieve_node_game_state(tree.root).get_position_hash(),
+                            MancalaState(board).get_position_hash())
+        tree.perform_move_on_root(move)
+        self.assertEqual(tree.retrieve_node_game_state(tree.root).get_position_hash(),
+                         MancalaState(board).get_position_hash())
+
+    def test_pondering_explores_opponent_replies(self):
+        board = MancalaBoard()
+        manager = MonteCarloGameManager(MancalaState(board), self.settings)
+        board.perform_move(manager.calculate_next_move())
+        ponder_yields = []
+
+        def handle_yield():
+            ponder_yields.append(1)
+            if len(ponder_yields) == 30:
+                manager.request_stop()
+
+        visits_count = manager.chosen_node.details.visits_count
+        manager.set_yield_callback(handle_yield, 0)
+        manager.ponder()
+        self.assertIsNone(manager.previous_move_calculated)
+        self.assertIs(manager.tree.root, manager.chosen_node)
+        self.assertEqual(manager.tree.root.details.visits_count, visits_count + 30)
+        reply = NodeUtils.get_child_with_max_score(manager.tree.root)
+        board.perform_move(reply.move)
+        manager.notify_move_performed(reply.move)
+        self.assertIs(manager.tree.root, reply)
+        self.assertGreater(manager.tree.root.details.visits_count, 0)
+        self.assertEqual(manager.tree.retrieve_node_game_state(manager.tree.root).get_position_hash(),
+                         MancalaState(board).get_position_hash())
+
+    def test_smart_stop_finishes_search_when_move_is_decided(self):
+        self.settings.max_iterations = 2000
+        self.settings.exploration_parameter = 0.3
+        self.settings.smart_stop = True
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        move, state, best_node = mcts.calculate_next_move()
+        self.assertLess(mcts.iterations, 2000)
+        visits = sorted(child.details.visits_count for child in self.tree.root.children)
+        self.assertGreater(visits[-1] - visits[-2], 2000 - mcts.iterations)
+
+    def test_smart_stop_chooses_most_visited_child(self):
+        self.settings.smart_stop = True
+        for move, _ in MancalaState(MancalaBoard()).get_all_possible_moves():
+            self.tree.root.add_child_by_move(move)
+        most_visited_child, best_average_child = self.tree.root.children[:2]
+        most_visited_child.details.mark_visit(150)
+        most_visited_child.details.add_score(60)
+        best_average_child.details.mark_visit(20)
+        best_average_child.details.add_score(18)
+        for child in self.tree.root.children[2:]:
+            child.details.mark_visit(5)
+            child.details.add_score(1)
+        self.assertGreater(best_average_child.details.average_prize, most_visited_child.details.average_prize)
+
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.iterations = 200
+        self.assertFalse(mcts._is_move_decided(100))
+        mcts.iterations = 300
+        self.assertFalse(mcts._is_move_decided(130))
+        self.assertTrue(mcts._is_move_decided(100))
+        self.assertIs(mcts._select_result_node()[2], most_visited_child)
+
+        self.settings.smart_stop = False
+        self.assertIs(MonteCarloTreeSearch(self.tree, self.settings)._select_result_node()[2], best_average_child)
+
+    def test_smart_stop_with_single_move(self):
+        self.settings.smart_stop = True
+        self.tree.root.add_child_by_move(MancalaState(MancalaBoard()).get_all_possible_moves()[0][0])
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.calculate_next_move()
+        self.assertEqual(mcts.iterations, 1)
+
+    def test_time_manager_gives_more_time_to_positions_with_more_moves(self):
+        self.settings.max_time = 1000
+        time_manager = MonteCarloTimeManager(self.settings)
+        self.assertEqual(time_manager.get_move_time(10), 500)
+        self.assertAlmostEqual(time_manager.get_move_time(5), 500 * 5 / 7.5)
+        # the third move would get 500 * 20 / (35 / 3), but only the rest of the budget is left
+        self.assertAlmostEqual(time_manager.get_move_time(20), 3 * 500 - 500 - 500 * 5 / 7.5)
+        self.assertEqual(time_manager.get_move_time(None), 500)
+
+    def test_time_manager_keeps_game_budget(self):
+        self.settings.max_time = 1000
+        time_manager = MonteCarloTimeManager(self.settings)
+        allocated_times = [time_manager.get_move_time(moves_count)
+                           for moves_count in (10, 2, 2, 40, 40, 40, 1, 1, 30, None, 50)]
+        self.assertTrue(all(250 <= move_time <= 1000 for move_time in allocated_times))
+        for moves_played in range(1, len(allocated_times) + 1):
+            self.assertLessEqual(sum(allocated_times[:moves_played]), 500 * moves_played + 1e-9)
+        self.assertEqual(allocated_times[3], 1000)
+        self.assertLess(allocated_times[4], 1000)
+
+    def test_root_moves_count_is_taken_from_expanded_root(self):
+        self.assertIsNone(self.tree.get_root_moves_count())
+        self.settings.max_iterations = 1
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+        self.assertEqual(self.tree.get_root_moves_count(), len(MancalaState(MancalaBoard()).get_all_possible_moves()))
+        self.settings.lazy_expansion = True
+        tree = MonteCarloTree(MancalaState(MancalaBoard()))
+        MonteCarloTreeSearch(tree, self.settings).calculate_next_move()
+        self.assertEqual(len(tree.root.children), 1)
+        self.assertEqual(tree.get_root_moves_count(), len(MancalaState(MancalaBoard()).get_all_possible_moves()))
+
+    def test_playout_records_moves_for_rave(self):
+        self.settings.use_rave = True
+        state = MancalaState(MancalaBoard())
+        result = perform_playout(state, self.settings, RandomStream(0))
+        replayed_state = MancalaState(MancalaBoard())
+        replayed_state.apply_moves(result.moves)
+        self.assertEqual(replayed_state.get_position_hash(), state.get_position_hash())
+        self.assertEqual(perform_playout(MancalaState(MancalaBoard()), MonteCarloSettings(), RandomStream(0)).moves, [])
+
+    def test_rave_updates_amaf_statistics_of_siblings(self):
+        self.settings.use_rave = True
+        for tree in (self.tree, MonteCarloArrayTree(MancalaState(MancalaBoard()))):
+            MonteCarloTreeSearch(tree, self.settings).calculate_next_move()
+            amaf_visits, amaf_scores = tree.get_children_amaf_statistics(tree.root)
+            visits, win_scores = tree.get_children_statistics(tree.root)
+            self.assertTrue((amaf_visits >= visits).all())
+            self.assertGreater(amaf_visits.sum(), visits.sum())
+            self.assertTrue((amaf_scores <= amaf_visits).all())
+
+    def test_batched_evaluation_matches_win_scores(self):
+        random_stream = RandomStream(0)
+        states = [MancalaState(MancalaBoard())]
+        for _ in range(20):
+            states.append(states[-1].deep_copy())
+            states[-1].perform_random_move(random_stream)
+        win_scores = MancalaState.evaluate_win_scores(states)
+        for state, (player1_score, player2_score) in zip(states, win_scores):
+            self.assertAlmostEqual(player1_score, state.get_win_score(1))
+            self.assertAlmostEqual(player2_score, state.get_win_score(2))
+
+    def test_static_evaluation_search_counts_iterations(self):
+        self.settings.simulation_mode = SimulationMode.STATIC_EVALUATION
+        self.settings.evaluation_batch_size = 16
+        for tree in (self.tree, MonteCarloArrayTree(MancalaState(MancalaBoard()))):
+            manager = MonteCarloGameManager(MancalaState(MancalaBoard()), self.settings)
+            self.assertIsInstance(manager._create_search(self.settings), MonteCarloBatchedEvaluationSearch)
+            mcts = MonteCarloBatchedEvaluationSearch(tree, self.settings)
+            mcts.calculate_next_move()
+            self.assertEqual(mcts.iterations, 40)
+            self.assertEqual(tree.root.details.visits_count, 40)
+            self.assertEqual(tree.virtual_losses_count, 0)
+            self.assertEqual(len(tree.root.children), len(MancalaState(MancalaBoard()).get_all_possible_moves()))
+
+    def test_search_is_replayed_from_seed(self):
+        def search_statistics():
+            tree = MonteCarloTree(MancalaState(MancalaBoard()))
+            MonteCarloTreeSearch(tree, self.settings).calculate_next_move()
+            return [(child.details.visits_count, child.details.win_score) for child in tree.root.children]
+
+        statistics = search_statistics()
+        self.assertEqual(search_statistics(), statistics)
+        self.settings.random_seed = 1
+        self.assertNotEqual(search_statistics(), statistics)
+
+    def test_spawned_random_streams_are_independent_and_replayable(self):
+        draws_count = 2 * RandomStream.BUFFER_SIZE
+        streams = RandomStream(0).spawn(2)
+        draws = [[stream.get_random_int(0, 1000) for _ in range(draws_count)] for stream in streams]
+        self.assertNotEqual(draws[0], draws[1])
+        replayed_stream = RandomStream(0).spawn(2)[1]
+        self.assertEqual([replayed_stream.get_random_int(0, 1000) for _ in range(draws_count)], draws[1])
+        self.assertTrue(all(0 <= draw < 1000 for draw in draws[0]))
+
+    def test_profiler_reports_phases(self):
+        self.settings.profile_search = True
+        self.settings.playouts_per_leaf = 2
+        reports = []
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        mcts.search_profiled += lambda sender, report: reports.append(report)
+        mcts.calculate_next_move()
+        report, = reports
+        self.assertEqual(report['iterations'], 40)
+        for phase in ('selection', 'expansion', 'reconstruction', 'simulation', 'backpropagation'):
+            self.assertGreater(report['phases'][phase]['time'], 0)
+        self.assertEqual(report['phases']['selection']['calls'], 40)
+        self.assertEqual(report['phases']['reconstruction']['calls'], 41)
+        self.assertEqual(report['playouts']['count'], 80)
+        self.assertLessEqual(report['playouts']['max_length'], self.settings.max_moves_per_iteration)
+        self.assertGreater(report['playouts']['moves'], 0)
+        self.assertEqual(report['reconstruction']['max_depth'], 1)
+        self.assertEqual(report['nodes_created'], self.tree.nodes_count - 1)
+
+    def test_search_without_profiler_is_not_instrumented(self):
+        mcts = MonteCarloTreeSearch(self.tree, self.settings)
+        self.assertIsNone(mcts.profiler)
+        self.assertNotIn('_selection', vars(mcts))
+
+    def test_game_manager_writes_profile_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.settings.profile_search = True
+            self.settings.profile_log_path = os.path.join(directory, 'profile.jsonl')
+            manager = MonteCarloGameManager(MancalaState(MancalaBoard()), self.settings)
+            reports = []
+            manager.search_profiled += lambda sender, report: reports.append(report)
+            manager.calculate_next_move()
+            manager.calculate_next_move()
+            with open(self.settings.profile_log_path) as file:
+                logged_reports = [json.loads(line) for line in file]
+        self.assertEqual(len(reports), 2)
+        self.assertEqual([report['iterations'] for report in logged_reports], [40, 40])
+
+    def test_game_manager_passes_yield_callback(self):
+        calls = []
+        manager = MonteCarloGameManager(MancalaState(MancalaBoard()), self.settings)
+        manager.set_yield_callback(lambda: calls.append(1), 0)
+        manager.calculate_next_move()
+        manager.close()
+        self.assertEqual(len(calls), 40)
+
+
+class TestMonteCarloSolver(unittest.TestCase):
+    def setUp(self):
+        self.settings = MonteCarloSettings()
+        self.settings.random_seed = 0
+        self.settings.max_iterations = 5000
+        self.settings.use_solver = True
+
+    def search(self, tree_class, board_values):
+        board = MancalaBoard()
+        board.board_values = board_values
+        tree = tree_class(MancalaState(board))
+        mcts = MonteCarloTreeSearch(tree, self.settings)
+        move, state, best_node = mcts.calculate_next_move()
+        return tree, mcts, move
+
+    def test_solver_finds_winning_move(self):
+        for tree_class in (MonteCarloTree, MonteCarloArrayTree, MonteCarloTranspositionTree):
+            tree, mcts, move = self.search(tree_class, [0, 0, 1, 0, 2, 1, 18, 1, 0, 2, 0, 1, 0, 21])
+            self.assertEqual(tree.root.details.proven_result, MonteCarloNodeDetails.PROVEN_LOSS)
+            self.assertEqual(str(move), "[5, 4, 5, 2]1")
+            self.assertLess(mcts.iterations, 5000)
+
+    def test_solver_proves_lost_position(self):
+        for tree_class in (MonteCarloTree, MonteCarloArrayTree, MonteCarloTranspositionTree):
+            tree, mcts, move = self.search(tree_class, [1, 0, 2, 0, 2, 1, 16, 1, 2, 2, 0, 1, 0, 19])
+            self.assertEqual(tree.root.details.proven_result, MonteCarloNodeDetails.PROVEN_WIN)
+            self.assertTrue(all(proven_result == MonteCarloNodeDetails.PROVEN_LOSS
+                                for proven_result in tree.get_children_proven_results(tree.root)))
+            self.assertLess(mcts.iterations, 5000)
+
+    def test_solver_does_not_prove_draws(self):
+        tree, mcts, move = self.search(MonteCarloTree, [0, 0, 0, 0, 1, 1, 20, 1, 1, 0, 0, 0, 0, 22])
+        self.assertEqual(tree.root.details.proven_result, MonteCarloNodeDetails.NOT_PROVEN)
+        self.assertEqual(mcts.iterations, 5000)
+
+
+class TestMonteCarloTranspositionTree(unittest.TestCase):
+    def setUp(self):
+        self.settings = MonteCarloSettings()
+        self.settings.random_seed = 0
+        self.settings.max_iterations = 300
+        self.settings.exploration_parameter = 0
+        self.tree = MonteCarloTranspositionTree(MancalaState(MancalaBoard()))
+        MonteCarloTreeSearch(self.tree, self.settings).calculate_next_move()
+
+    def test_transpositions_refer_to_nodes_of_the_same_position(self):
+        self.assertTrue(self.tree.transpositions)
+        for node, canonical in self.tree.transpositions.items():
+            self.assertIsNot(node, canonical)
+            self.assertFalse(node.has_children())
+            self.assertEqual(self.tree.retrieve_node_game_state(node).get_position_hash(),
+                             self.tree.retrieve_node_game_state(canonical).get_position_hash())
+
+    def test_canonical_nodes_count_visits_of_transpositions(self):
+        for node, canonical in self.tree.transpositions.items():
+            self.assertGreaterEqual(canonical.details.visits_count, node.details.visits_count)
+        self.assertEqual(self.tree.root.details.visits_count, 300)
+
+    def test_win_rate_of_transposition_moved_by_other_player_is_reversed(self):
+        tree = MonteCarloTranspositionTree(MancalaState(MancalaBoard()))
+        (first_move, _), (second_move, _) = MancalaState(MancalaBoard()).get_all_possible_moves()[:2]
+        state = MancalaState(MancalaBoard())
+        state.apply_moves([second_move])
+        transposition = tree.root.add_child_by_move(first_move)
+        other_child = tree.root.add_child_by_move(second_move)
+        canonical = other_child.add_child_by_move(state.get_all_possible_moves()[0][0])
+        self.assertNotEqual(canonical.move.player, transposition.move.player)
+        tree.transpositions[transposition] = canonical
+        transposition.details.mark_visit(4)
+        other_child.details.mark_visit(10)
+        canonical.details.mark_visit(10)
+        canonical.details.add_score(8)
+
+        visits, win_scores = tree.get_children_statistics(tree.root)
+        self.assertAlmostEqual(win_scores[0], 4 * 0.2)
+        visits, win_scores = tree.get_children_statistics_lists(tree.root)
+        self.assertAlmostEqual(win_scores[0], 4 * 0.2)
+
+        canonical.move.player = transposition.move.player
+        visits, win_scores = tree.get_children_statistics(tree.root)
+        self.assertAlmostEqual(win_scores[0], 4 * 0.8)
+
+    def test_visualisation_tree_unfolds_transpositions(self):
+        visualisation_tree = self.tree.get_visualisation_tree()
+        self.assertEqual(visualisation_tree.root.details.visits_count, 300)
+        for node in self.tree.transpositions:
+            self.assertFalse(node.has_children())
+        nodes_to_check = [visualisation_tree.root]
+        while nodes_to_check:
+            node = nodes_to_check.pop()
+            for child in node.children:
+                self.assertIs(child.parent, node)
+                nodes_to_check.append(child)
+
+
+class TestMonteCarloTreeNodesLimit(unittest.TestCase):
+    def setUp(self):
+        self.settings = MonteCarloSettings()
+        self.settings.random_seed = 0
+        self.settings.max_iterations = 300
+        self.settings.max_tree_nodes = 200
+
+    def count_nodes(self, tree):
+        rc = 0
+        nodes_to_check = [tree.root]
+        while nodes_to_check:
+            node = nodes_to_check.pop()
+            rc += 1
+            for child in node.children:
+                self.assertEqual(child.parent, node)
+                nodes_to_check.append(child)
+        return rc
+
+    def search(self, tree):
+        tree.set_nodes_limit(self.settings.max_tree_nodes)
+        MonteCarloTreeSearch(tree, self.settings).calculate_next_move()
+
+    def test_nodes_limit_from_memory(self):
+        tree = MonteCarloTree(MancalaState(MancalaBoard()))
+        tree.set_nodes_limit(0, 3)
+        self.assertEqual(tree.nodes_limit, 3 * 1024 * 1024 // MonteCarloTree.NODE_SIZE_ESTIMATE)
+        tree.set_nodes_limit(100, 3)
+        self.assertEqual(tree.nodes_limit, 100)
+        tree.set_nodes_limit()
+        self.assertEqual(tree.nodes_limit, 0)
+
+    def test_root_move_detaches_ancestors(self):
+        tree = MonteCarloTree(MancalaState(MancalaBoard()))
+        self.settings.max_tree_nodes = 0
+        self.search(tree)
+        old_root = tree.root
+        tree.perform_move_on_root(tree.root.children[0].move)
+        self.assertIsNone(tree.root.parent)
+        self.assertFalse(old_root.has_children())
+        self.assertEqual(tree.nodes_count, self.count_nodes(tree))
+
+    def test_least_visited_subtrees_are_collapsed(self):
+        tree = MonteCarloTree(MancalaState(MancalaBoard()))
+        self.search(tree)
+        nodes_count = self.count_nodes(tree)
+        self.assertEqual(tree.nodes_count, nodes_count)
+        self.assertLessEqual(nodes_count, 200 + len(MancalaState(MancalaBoard()).get_all_possible_moves()))
+        self.assertEqual(tree.root.details.visits_count, 300)
+        self.assertEqual(sum(child.details.visits_count for child in tree.root.children), 300)
+
+    def test_paths_with_virtual_losses_are_not_collapsed(self):
+        for tree in (MonteCarloTree(MancalaState(MancalaBoard())), MonteCarloArrayTree(MancalaState(MancalaBoard()))):
+            self.settings.max_tree_nodes = 0
+            self.search(tree)
+            mcts = MonteCarloTreeSearch(tree, self.settings)
+            paths = []
+            for _ in range(4):
+                path, leaf_state = mcts._select_leaf_to_explore()
+                tree.add_virtual_loss(path)
+                paths.append(path)
+            nodes_count = tree.nodes_count
+            tree.set_nodes_limit(10)
+            tree.enforce_nodes_limit()
+            self.assertLess(tree.nodes_count, nodes_count)
+            self.assertEqual(tree.nodes_count, self.count_nodes(tree))
+            for path in paths:
+                for parent, child in zip(path, path[1:]):
+                    self.assertIn(child, parent.children)
+                tree.remove_virtual_loss(path)
+            self.assertEqual(tree.virtual_losses_count, 0)
+
+    def test_array_tree_is_compacted(self):
+        self.settings.lazy_expansion = True
+        tree = MonteCarloArrayTree(MancalaState(MancalaBoard()))
+        self.search(tree)
+        tree.enforce_nodes_limit()
+        self.assertEqual(tree.nodes_count, self.count_nodes(tree))
+        self.assertLessEqual(tree.nodes_count, 201)
+        self.assertTrue(all(node.store is tree.store for node in tree.untried_moves))
+        tree.perform_move_on_root(tree.root.children[0].move)
+        self.assertEqual(tree.root.index, 0)
+        self.assertEqual(tree.store.size, self.count_nodes(tree))
+
+    def test_transposition_tree_forgets_removed_nodes(self):
+        self.settings.exploration_parameter = 0
+        tree = MonteCarloTranspositionTree(MancalaState(MancalaBoard()))
+        self.search(tree)
+        tree.perform_move_on_root(tree.root.children[0].move)
+        tree.enforce_nodes_limit()
+        live_nodes = []
+        nodes_to_check = [tree.root]
+        while nodes_to_check:
+            node = nodes_to_check.pop()
+            live_nodes.append(node)
+            nodes_to_check.extend(node.children)
+        self.assertTrue(all(node in live_nodes for node in tree.table.values()))
+        for node, canonical in tree.transpositions.items():
+            self.assertIn(node, live_nodes)
+            self.assertIn(canonical, live_nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class TestMonteCarloParallelSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def setUp(self):
+        self.settings = MonteCarloSettings()
+        self.settings.random_seed = 0
+        self.settings.max_iterations = 100
+        self.settings.workers_count = 2
+        self.tree = MonteCarloTree(MancalaState(MancalaBoard()))
+
+    def test_independent_tree_reports_root_children(self):
+        iterations, root_children_statistics = search_independent_tree(MancalaState(MancalaBoard()), self.settings,
+                                                                       RandomStream(0))
+        self.assertEqual(iterations, 100)
+        self.assertEqual(sum(visits_count for _, _, visits_count, _ in root_children_statistics), 100)
+
+    def test_root_parallel_search_merges_root_children(self):
+        self.settings.parallelisation = ParallelisationMode.ROOT
+        mcts = MonteCarloRootParallelSearch(self.tree, self.settings, self.executor)
+        move, state, best_child = mcts.calculate_next_move()
+        self.assertEqual(mcts.iterations, 200)
+        self.assertEqual(self.tree.root.details.visits_count, 200)
+        self.assertEqual(sum(child.details.visits_count for child in self.tree.root.children), 200)
+        self.assertEqual(len({str(child.move) for child in self.tree.root.children}), len(self.tree.root.children))
+        self.assertEqual(best_child.details.visits_count,
+                         max(child.details.visits_count for child in self.tree.root.children))
+        self.assertIs(move, best_child.move)
+
+    def test_tree_parallel_search_removes_virtual_losses(self):
+        self.settings.parallelisation = ParallelisationMode.TREE
+        for use_array_tree in (False, True):
+            self.settings.use_array_tree = use_array_tree
+            tree = create_tree(MancalaState(MancalaBoard()), self.settings)
+            mcts = MonteCarloTreeParallelSearch(tree, self.settings, self.executor)
+            mcts.calculate_next_move()
+            self.assertFalse(mcts.pending_playouts)
+            self.assertEqual(tree.virtual_losses_count, 0)
+            self.assertEqual(mcts.iterations, 100)
+            self.assertEqual(tree.root.details.visits_count, 100)
+            nodes_to_check = [tree.root]
+            while nodes_to_check:
+                node = nodes_to_check.pop()
+                self.assertEqual(node.details.virtual_loss, 0)
+                nodes_to_check.extend(node.children)
+
+    def test_leaf_playouts_are_split_among_workers(self):
+        mcts = MonteCarloLeafParallelSearch(self.tree, self.settings, self.executor)
+        for playouts_per_leaf, workers_count in ((1, 2), (2, 2), (5, 2), (7, 3), (8, 4)):
+            self.settings.playouts_per_leaf = playouts_per_leaf
+            self.settings.workers_count = workers_count
+            chunks = mcts._split_playouts()
+            self.assertEqual(sum(chunks), playouts_per_leaf)
+            self.assertLessEqual(len(chunks), workers_count)
+            self.assertLessEqual(max(chunks) - min(chunks), 1)
+            self.assertGreater(min(chunks), 0)
+
+    def test_leaf_gains_visits_of_all_its_playouts(self):
+        self.settings.parallelisation = ParallelisationMode.LEAF
+        self.settings.playouts_per_leaf = 5
+        self.settings.max_iterations = 1
+        mcts = MonteCarloLeafParallelSearch(self.tree, self.settings, self.executor)
+        mcts.calculate_next_move()
+        self.assertEqual(self.tree.root.details.visits_count, 5)
+        self.assertEqual([child.details.visits_count for child in self.tree.root.children
+                          if child.details.visits_count > 0], [5])
+
+        self.settings.max_iterations = 20
+        mcts = MonteCarloLeafParallelSearch(self.tree, self.settings, self.executor)
+        mcts.calculate_next_move()
+        self.assertEqual(self.tree.root.details.visits_count, 105)
+        self.assertEqual(sum(child.details.visits_count for child in self.tree.root.children), 105)
+
+
+class TestMonteCarloNodeStore(unittest.TestCase):
+    def setUp(self):
+        self.store = MonteCarloNodeStore()
+        self.root = self.store.add_node(MonteCarloNodeStore.NO_NODE, None)
+        self.store.add_children(self.root, [("a", ""), ("b", "")])
+
+    def get_children_moves(self, index):
+        return [self.store.moves[self.store.move_index[child]] for child in self.store.children_range(index)]
+
+    def test_children_block_is_relocated_when_it_outgrows_capacity(self):
+        old_first = self.store.first_child[self.root]
+        self.assertEqual(self.store.child_capacity[self.root], 2)
+        self.store.visits[old_first] = 7
+        self.store.add_children(old_first, [("a1", "")])
+        self.store.vis_details[old_first] = "details"
+
+        self.store.add_children(self.root, [("c", "")])
+        new_first = self.store.first_child[self.root]
+        self.assertNotEqual(new_first, old_first)
+        self.assertEqual(self.store.child_capacity[self.root], 4)
+        self.assertEqual(self.get_children_moves(self.root), ["a", "b", "c"])
+        self.assertEqual(self.store.visits[new_first], 7)
+        self.assertTrue(all(self.store.parent[child] == self.root for child in self.store.children_range(self.root)))
+        grandchild = self.store.first_child[new_first]
+        self.assertEqual(self.store.parent[grandchild], new_first)
+        self.assertEqual(self.store.vis_details, {new_first: "details"})
+        self.assertEqual(list(self.store.parent[old_first:old_first + 2]), [MonteCarloNodeStore.NO_NODE] * 2)
+
+    def test_relocated_block_keeps_room_for_children(self):
+        self.store.add_children(self.root, [("c", "")])
+        first = self.store.first_child[self.root]
+        self.store.add_children(self.root, [("d", "")])
+        self.assertEqual(self.store.first_child[self.root], first)
+        self.assertEqual(self.get_children_moves(self.root), ["a", "b", "c", "d"])
+
+    def test_store_grows(self):
+        store = MonteCarloNodeStore(capacity=2)
+        root = store.add_node(MonteCarloNodeStore.NO_NODE, None)
+        store.add_children(root, [(str(i), "") for i in range(5)])
+        store.visits[store.children_range(root)] = range(5)
+        for child in store.children_range(root):
+            store.add_node(child, "leaf")
+        self.assertGreaterEqual(store.capacity, store.size)
+        self.assertEqual(store.size, 11)
+        self.assertEqual(list(store.visits[store.children_range(root)]), list(range(5)))
+        self.assertEqual([store.moves[store.move_index[child]] for child in store.children_range(root)],
+                         [str(i) for i in range(5)])
+
+    def test_compacted_copies_subtree_of_node(self):
+        first_child = self.store.first_child[self.root]
+        self.store.add_children(first_child, [("a1", ""), ("a2", "")])
+        self.store.add_children(self.root, [("c", "")])
+        self.store.visits[self.store.first_child[self.root]] = 5
+        subtree_root = self.store.first_child[self.root]
+        store, new_indices = self.store.compacted(subtree_root)
+        self.assertEqual(store.size, 3)
+        self.assertEqual(new_indices[subtree_root], 0)
+        self.assertEqual(store.visits[0], 5)
+        self.assertEqual([store.moves[store.move_index[child]] for child in store.children_range(0)], ["a1", "a2"])
+        self.assertTrue(all(store.parent[child] == 0 for child in store.children_range(0)))
+        self.assertEqual(new_indices[self.root], MonteCarloNodeStore.NO_NODE)
+
+    def test_array_tree_matches_object_tree(self):
+        settings = MonteCarloSettings()
+        settings.random_seed = 0
+        settings.max_iterations = 300
+        visits_counts = []
+        for tree_class in (MonteCarloTree, MonteCarloArrayTree):
+            tree = tree_class(MancalaState(MancalaBoard()))
+            MonteCarloTreeSearch(tree, settings).calculate_next_move()
+            visits_counts.append([child.details.visits_count for child in tree.root.children])
+        self.assertEqual(visits_counts[0], visits_counts[1])
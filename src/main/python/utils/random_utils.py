@@ -1,16 +1,54 @@
+import numpy as np
 
-import random
 
-
-def get_random_int(value_from, value_to):
+class RandomStream:
+    """
+    Class is a seeded stream of random numbers used by a single search. Uniform integers from [0, 2^31) are generated
+    by NumPy in blocks and handed out one by one, so that a single draw costs only popping a list and an integer
+    modulo. Bias of the modulo is negligible for ranges as small as numbers of moves. Streams created from the same
+    seed give the same numbers, which makes searches replayable. Independent streams, e.g. for worker processes, are
+    spawned from the stream's seed sequence.
     """
+    BUFFER_SIZE = 4096
+    VALUES_LIMIT = 2 ** 31
+
+    def __init__(self, seed=None):
+        """
+		Args:
+			seed:  int, numpy SeedSequence object or None for a seed taken from the operating system
+		"""
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self.seed_sequence.entropy
+        self._generator = np.random.default_rng(self.seed_sequence)
+        self._values = []
+
+    def get_random_int(self, value_from, value_to):
+        """
 		Args:
 			value_from:  int
 			value_to:  int
 
 		Returns:
-			random int from range [value_from, value_to]    
+			random int from range [value_from, value_to)
 		"""
-    span = value_to - value_from
-    return int(span * random.random() + value_from)
+        values = self._values
+        if not values:
+            values = self._values = self._generator.integers(0, RandomStream.VALUES_LIMIT,
+                                                             RandomStream.BUFFER_SIZE).tolist()
+        return value_from + values.pop() % (value_to - value_from)
 
+    def spawn(self, count):
+        """
+        Creates streams independent of this one and of each other. Spawning is deterministic, so the spawned streams
+        are replayable as well.
+
+		Args:
+			count:  number of streams
+
+		Returns:
+			list of RandomStream objects
+		"""
+        return [RandomStream(seed_sequence) for seed_sequence in self.seed_sequence.spawn(count)]
@@ -1,4 +1,6 @@
 class MonteCarloNodeVisualisationDetails:
+    __slots__ = ('x', 'y', 'thread', 'mod', 'ancestor', 'change', 'shift')
+
     def __init__(self, node, depth=0):
         self.x = -1.0
         self.y = depth